@@ -1 +1,23 @@
+import sys
 from .__version__ import __version__
+
+
+def lazyImport(name, requires=()):
+    # Module that only executes on first attribute access, so heavy or
+    # optional modules cost nothing until a check needs them. Returns None
+    # when the module, or a top level package it needs, isn't installed.
+    # importlib.util itself is imported here so importing the package stays
+    # cheap for code that never asks for a lazy module.
+    import importlib.util
+    for required in (name,) + tuple(requires):
+        if required not in sys.modules and importlib.util.find_spec(required) is None:
+            return None
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,95 @@
+import argparse
+import json
+import sys
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_results as mcrs
+
+# Command line validator for mayapy, e.g.
+#   mayapy -m modelChecker asset.ma --root geo_GRP --format junit
+# Exits with 0 when every check passes, 1 when a check fails and 2 when the
+# scene or root node can't be used.
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="modelChecker", description="Validate a Maya scene with modelChecker.")
+    parser.add_argument('scene', help="Maya scene to open")
+    parser.add_argument('checks', nargs='*', help="check names, defaults to every check")
+    parser.add_argument('--root', help="root node to check below, defaults to the whole scene")
+    parser.add_argument('--backend', choices=['api', 'numpy'], help="backend for checks that support both")
+    parser.add_argument('--cache', help="result cache database to reuse results across runs")
+    parser.add_argument('--gate', action='store_true', help="stop at the first failing check, cheapest first")
+    parser.add_argument('--stream', action='store_true',
+                        help="walk component checks in chunks, spilling results to disk, for very large meshes")
+    parser.add_argument('--memory-limit', type=int, default=256,
+                        help="megabytes a streamed walk may buffer before spilling, defaults to 256")
+    parser.add_argument('--spill', help="keep the streamed results in this file instead of a temporary one")
+    parser.add_argument('--error-limit', type=int,
+                        help="list at most this many errors per check, defaults to 10000 when streaming")
+    parser.add_argument('--workers', type=int, help="threads for the numpy mesh checks, defaults to the CPU count")
+    parser.add_argument('--parameter', action='append', default=[],
+                        help="check parameter as check.name=value, e.g. poles.maxValence=6; runs the check on numpy")
+    parser.add_argument('--format', choices=['json', 'junit'], default='json', help="output format")
+    parser.add_argument('--output', help="write the results to this file instead of stdout")
+    parser.add_argument('--archive', help="also write the results to this diagnostics archive, needs numpy")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.checks if name not in mcl.mcCommandsList]
+    if unknown:
+        parser.error("unknown checks: " + ", ".join(unknown))
+    try:
+        parameters = mcl.parseParameters(args.parameter)
+    except ValueError as error:
+        parser.error(str(error))
+
+    try:
+        import maya.standalone
+    except ImportError:
+        parser.error("the command line validator runs in mayapy")
+    maya.standalone.initialize()
+    import modelChecker.modelChecker_validate as mcv
+
+    commands = args.checks or list(mcv.availableCommands())
+    missing = [name for name in commands if name not in mcv.availableCommands()]
+    if parameters and not mcv.mcn:
+        missing += [name for name in parameters if name in commands]
+    if missing:
+        parser.error("checks need numpy: " + ", ".join(missing))
+    backends = {}
+    if args.backend:
+        backends = {name: args.backend for name in commands if args.backend in mcv.supportedBackends(name)}
+    cache = None
+    if args.cache:
+        import modelChecker.modelChecker_cache as mcca
+        cache = mcca.ResultCache(args.cache)
+
+    spill = None
+    errorLimit = args.error_limit
+    if args.stream:
+        spill = mcrs.Spill(args.spill, args.memory_limit * 1048576)
+        errorLimit = 10000 if errorLimit is None else errorLimit
+
+    try:
+        diagnostics = mcv.validate(args.scene, commands, args.root, backends, cache, gate=args.gate, spill=spill,
+                                   workers=args.workers, parameters=parameters)
+    except (RuntimeError, ValueError) as error:
+        sys.stderr.write(f"modelChecker: {error}\n")
+        return 2
+    skipped = [name for name in commands if name not in diagnostics]
+    if args.archive:
+        mcv.archive(args.archive, diagnostics, root=args.root)
+    if args.format == 'junit':
+        output = mcrs.junitReport(diagnostics, skipped=skipped, errorLimit=errorLimit)
+    else:
+        output = json.dumps(mcrs.jsonReport(diagnostics, errorLimit, scene=args.scene, root=args.root,
+                                            skipped=skipped), indent=2)
+    if spill:
+        spill.close()
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+    return 1 if any(diagnostics.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,24 +1,39 @@
-from PySide2 import QtWidgets
-from shiboken2 import wrapInstance
+from PySide2 import QtCore, QtWidgets
 from functools import partial
-import getpass, datetime, json
+import json, time
 import maya.cmds as cmds
-import maya.OpenMayaUI as omui
 import maya.api.OpenMaya as om
-import modelChecker.modelChecker_commands as mcc
-import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_hierarchy as mchy
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_report as mcr
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_validate as mcv
+from modelChecker import lazyImport
+
+omui = lazyImport('maya.OpenMayaUI')
+shiboken2 = lazyImport('shiboken2')
+mci = lazyImport('modelChecker.modelChecker_incremental', ['numpy'])
+mcca = lazyImport('modelChecker.modelChecker_cache', ['numpy'])
+mcar = lazyImport('modelChecker.modelChecker_archive', ['numpy'])
+mcme = lazyImport('modelChecker.modelChecker_metrics', ['numpy'])
+
+componentTypes = {
+    "f": om.MFn.kMeshPolygonComponent,
+    "e": om.MFn.kMeshEdgeComponent,
+    "vtx": om.MFn.kMeshVertComponent,
+    "map": om.MFn.kMeshMapComponent,
+}
 
 def getMainWindow():
     main_window_ptr = omui.MQtUtil.mainWindow()
-    mainWindow = wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
+    mainWindow = shiboken2.wrapInstance(int(main_window_ptr), QtWidgets.QWidget)
     return mainWindow
 
 
 class UI(QtWidgets.QMainWindow):
     qmwInstance = None
     version = '0.1.3'
-    commandsList = mcl.mcCommandsList
-    reportOutputUI = QtWidgets.QTextEdit()
+    commandsList = mcv.availableCommands()
     categoryLayout = {}
     categoryWidget = {}
     categoryButton = {}
@@ -31,6 +46,7 @@ class UI(QtWidgets.QMainWindow):
     commandCheckBox = {}
     errorNodesButton = {}
     commandRunButton = {}
+    commandBackend = {}
 
     @classmethod
     def show_UI(cls):
@@ -42,12 +58,23 @@ class UI(QtWidgets.QMainWindow):
             cls.qmwInstance.raise_()
             cls.qmwInstance.activateWindow()
 
-    def __init__(self, parent=getMainWindow()):
-        super(UI, self).__init__(parent)
+    def __init__(self, parent=None):
+        super(UI, self).__init__(parent or getMainWindow())
 
         self.setObjectName("ModelCheckerUI")
         self.setWindowTitle('Model Checker' + ' ' + self.version)
         self.diagnostics = {}
+        self.incremental = mci.IncrementalCache() if mci else None
+        self.resultCache = None
+        self.profiler = None
+        self.runner = None
+        self.runStatus = None
+        self.instancing = None
+        self.hierarchy = None
+        # Values of the threshold checks from numpy runs, and the thresholds
+        # changed from their defaults, saved with the settings.
+        self.metrics = mcme.MetricStore() if mcme else None
+        self.parameters = {}
         mainLayout = QtWidgets.QWidget(self)
         self.setCentralWidget(mainLayout)
         columns = QtWidgets.QHBoxLayout(mainLayout)
@@ -78,16 +105,40 @@ class UI(QtWidgets.QMainWindow):
         selectedModelVLayout.addWidget(self.selectedTopNode_UI)
         selectedModelVLayout.addWidget(clearSelectedNodeButton)
         selectedModelVLayout.addWidget(selectedModelNodeButton)
-        self.reportOutputUI.setReadOnly(True)
+        self.reportModel = mcr.ReportModel(self)
+        self.reportOutputUI = QtWidgets.QTreeView()
+        self.reportOutputUI.setModel(self.reportModel)
+        self.reportOutputUI.setHeaderHidden(True)
+        self.reportOutputUI.setUniformRowHeights(True)
         self.reportOutputUI.setMinimumWidth(600)
+        self.reportOutputUI.doubleClicked.connect(self.selectReportItem)
 
         self.checkRunButton = QtWidgets.QPushButton("Run All Checked")
         self.checkRunButton.clicked.connect(self.sanityCheck)
 
+        self.cancelButton = QtWidgets.QPushButton("Cancel")
+        self.cancelButton.setMaximumWidth(150)
+        self.cancelButton.setEnabled(False)
+        self.cancelButton.clicked.connect(self.cancelChecks)
+
+        self.progressBar = QtWidgets.QProgressBar()
+        self.progressBar.setVisible(False)
+        self.progressLabel = QtWidgets.QLabel("")
+
         clearButton = QtWidgets.QPushButton("Clear")
         clearButton.setMaximumWidth(150)
         clearButton.clicked.connect(self.clearReport)
 
+        self.exportProfileButton = QtWidgets.QPushButton("Export Profile")
+        self.exportProfileButton.setMaximumWidth(150)
+        self.exportProfileButton.setEnabled(False)
+        self.exportProfileButton.clicked.connect(self.exportProfile)
+
+        self.exportDiagnosticsButton = QtWidgets.QPushButton("Export Diagnostics")
+        self.exportDiagnosticsButton.setMaximumWidth(150)
+        self.exportDiagnosticsButton.setEnabled(False)
+        self.exportDiagnosticsButton.clicked.connect(self.exportDiagnostics)
+
         runLayout = QtWidgets.QHBoxLayout()
 
         settingsLayout = QtWidgets.QHBoxLayout()
@@ -98,11 +149,54 @@ class UI(QtWidgets.QMainWindow):
         settingsLayout.addWidget(self.metadataCheck)
         settingsLayout.addWidget(QtWidgets.QLabel("Consolidated display: "))
         settingsLayout.addWidget(self.consolidatedCheck)
+        self.incrementalCheck = QtWidgets.QCheckBox()
+        if self.incremental:
+            settingsLayout.addWidget(QtWidgets.QLabel("Incremental: "))
+            settingsLayout.addWidget(self.incrementalCheck)
+        self.incrementalCheck.stateChanged.connect(self.clearIncremental)
+        self.cacheCheck = QtWidgets.QCheckBox()
+        if mcca:
+            settingsLayout.addWidget(QtWidgets.QLabel("Result cache: "))
+            settingsLayout.addWidget(self.cacheCheck)
+        self.profileCheck = QtWidgets.QCheckBox()
+        settingsLayout.addWidget(QtWidgets.QLabel("Profile: "))
+        settingsLayout.addWidget(self.profileCheck)
         runLayout.addWidget(QtWidgets.QLabel("Report: "))
         runLayout.addWidget(clearButton)
+        runLayout.addWidget(self.exportProfileButton)
+        if mcar:
+            runLayout.addWidget(self.exportDiagnosticsButton)
+        runLayout.addWidget(self.cancelButton)
         runLayout.addWidget(self.checkRunButton)
+        progressLayout = QtWidgets.QHBoxLayout()
+        progressLayout.addWidget(self.progressLabel)
+        progressLayout.addWidget(self.progressBar)
+
+        thresholdLayout = QtWidgets.QHBoxLayout()
+        self.metricCombo = QtWidgets.QComboBox()
+        self.parameterLabel = QtWidgets.QLabel("")
+        self.parameterSpin = QtWidgets.QDoubleSpinBox()
+        self.parameterSpin.setDecimals(8)
+        self.parameterSpin.setRange(-1000000.0, 1000000.0)
+        self.parameterSpin.setMinimumWidth(120)
+        self.histogramLabel = QtWidgets.QLabel("")
+        self.histogram = mcr.Histogram()
+        if self.metrics:
+            for command in mcme.metricChecks:
+                self.metricCombo.addItem(self.commandsList[command]['label'], command)
+            thresholdLayout.addWidget(QtWidgets.QLabel("Threshold: "))
+            thresholdLayout.addWidget(self.metricCombo)
+            thresholdLayout.addWidget(self.parameterLabel)
+            thresholdLayout.addWidget(self.parameterSpin)
+            thresholdLayout.addWidget(self.histogramLabel)
+            thresholdLayout.addStretch()
+        else:
+            self.histogram.setVisible(False)
         report.addLayout(settingsLayout)
+        report.addLayout(thresholdLayout)
+        report.addWidget(self.histogram)
         report.addWidget(self.reportOutputUI)
+        report.addLayout(progressLayout)
         report.addLayout(runLayout)
 
         self.resize(1000, 900)
@@ -162,9 +256,16 @@ class UI(QtWidgets.QMainWindow):
                 "Select Error Nodes")
             self.errorNodesButton[name].setEnabled(False)
             self.errorNodesButton[name].setMaximumWidth(150)
+            self.errorNodesButton[name].clicked.connect(partial(self.selectCommandErrors, name))
 
             self.commandLayout[name].addWidget(self.commandLabel[name])
             self.commandLayout[name].addWidget(self.commandCheckBox[name])
+            if len(mcv.supportedBackends(name)) > 1:
+                self.commandBackend[name] = QtWidgets.QComboBox()
+                self.commandBackend[name].addItems(["api", "numpy"])
+                self.commandBackend[name].setCurrentText(mcv.defaultBackend(name))
+                self.commandBackend[name].setMaximumWidth(70)
+                self.commandLayout[name].addWidget(self.commandBackend[name])
             self.commandLayout[name].addWidget(self.commandRunButton[name])
             self.commandLayout[name].addWidget(self.errorNodesButton[name])
 
@@ -187,9 +288,14 @@ class UI(QtWidgets.QMainWindow):
         self.loadSettings()
         self.consolidatedCheck.stateChanged.connect(self.createReport)
         self.metadataCheck.stateChanged.connect(self.createReport)
+        self.metricCombo.currentIndexChanged.connect(self.selectMetric)
+        self.parameterSpin.valueChanged.connect(self.setParameter)
+        self.selectMetric()
 
     def closeEvent(self, event):
+        self.cancelChecks()
         self.saveSettings()
+        self.clearIncremental()
         super(UI, self).closeEvent(event)
 
     def getCategories(self, commands):
@@ -231,11 +337,25 @@ class UI(QtWidgets.QMainWindow):
                 not self.commandCheckBox[name].isChecked())
             
     def clearReport(self):
+        self.cancelChecks()
+        self.runStatus = None
+        self.instancing = None
         self.diagnostics = {}
         for command in self.commandsList.keys():
             self.errorNodesButton[command].setEnabled(False)
             self.commandLabel[command].setStyleSheet('background-color: none;')
-        self.reportOutputUI.clear()
+        self.reportModel.clear()
+        self.clearIncremental()
+        self.profiler = None
+        self.exportProfileButton.setEnabled(False)
+        self.exportDiagnosticsButton.setEnabled(False)
+        if self.metrics:
+            self.metrics.clear()
+            self.updateHistogram()
+
+    def clearIncremental(self):
+        if self.incremental:
+            self.incremental.clear()
 
 
     def checkCategory(self, category):
@@ -253,78 +373,206 @@ class UI(QtWidgets.QMainWindow):
             self.commandCheckBox[category].setChecked(checked)
 
     def filterNodes(self):
-        selection = cmds.ls(selection=True, typ="transform")
-        if len(selection) > 0:
-            nodes = []
-            for node in selection:
-                relatives = cmds.listRelatives(node, allDescendents=True, typ="transform")
-                if relatives:
-                    nodes.extend(relatives)
-                nodes.append(node)
-        elif self.selectedTopNode_UI.text() == "":
-            nodes = self.filterGetAllNodes()
-        else:
-            nodes = self.filterGetTopNode(self.selectedTopNode_UI.text())
-            if not nodes:
-                self.reportOutputUI.clear()
-                self.reportOutputUI.insertPlainText("Object in Root Node doesn't exists\n")
-        return nodes
-
-    def filterGetTopNode(self, topNode):
-        nodes = []
-        if cmds.objExists(topNode):
-            nodes.append(topNode)
-            children = cmds.listRelatives(
-                topNode, allDescendents=True, typ="transform")
-            if children:
-                nodes.extend(children)
-        else:
+        # One DAG pass per run; the checks reuse the index for mesh lookups.
+        self.hierarchy = mchy.build()
+        nodes = mcv.getSelectedNodes(self.hierarchy)
+        if nodes:
+            return nodes
+        if self.selectedTopNode_UI.text() == "":
+            return mcv.getAllNodes(self.hierarchy)
+        nodes = mcv.getTopNode(self.selectedTopNode_UI.text(), self.hierarchy)
+        if not nodes:
             self.selectedTopNode_UI.clear()
-            nodes = self.filterGetAllNodes()
+            nodes = mcv.getAllNodes(self.hierarchy)
         return nodes
 
-    def filterGetAllNodes(self):
-        allNodes = cmds.ls(transforms=True)
-        allUsuableNodes = []
-        for node in allNodes:
-            if node not in {'front', 'persp', 'top', 'side'}:
-                allUsuableNodes.append(node)
-        return allUsuableNodes
-    
     def oneOfs(self, command):
-        diagnostics = self.commandToRun([command], self.filterNodes())
-        self.diagnostics[command] = diagnostics[command]
+        self.runChecks([command], self.filterNodes(), replace=False)
+
+    def runChecks(self, commands, nodes, replace=True):
+        # Starts a run that steps through mcv.iterChecks from the event loop,
+        # so Maya stays responsive and results stream into the report.
+        if self.runner:
+            return
+        self.profiler = mcp.Profiler(memory=True) if self.profileCheck.isChecked() else None
+        if self.profiler:
+            self.profiler.start()
+        if replace:
+            self.diagnostics = {}
+        if self.metrics and not (self.incremental and self.incrementalCheck.isChecked()):
+            # Incremental runs keep the values of the nodes they skip.
+            self.metrics.clear(commands)
+        self.runCommands = commands
+        self.runCached = commands
+        self.runNodes = nodes
+        self.runStale = nodes
+        self.runDiagnostics = {}
+        crossNodes = None
+        if self.incremental and self.incrementalCheck.isChecked():
+            # Cached nodes are reported right away, only stale ones are run.
+            # Checks between meshes aren't cached and see every node.
+            self.runCached = mci.cachedCommands(commands)
+            self.runStale = self.incremental.staleNodes(self.runCached, nodes)
+            stale = set(self.runStale)
+            fresh = [node for node in nodes if node not in stale]
+            self.runDiagnostics = self.incremental.diagnostics(self.runCached, fresh)
+            crossNodes = nodes
+        backends = {command: self.backend(command) for command in commands}
+        self.runner = mcv.iterChecks(
+            commands, self.runStale, self.runDiagnostics, backends, self.getResultCache(), self.profiler,
+            self.hierarchy, self.parameters, self.metrics, crossNodes)
+        self.runStatus = None
+        self.lastReport = time.perf_counter()
+        self.setRunning(True)
+        self.stepChecks()
+
+    def stepChecks(self):
+        # Runs units for a short time slice, then hands control back to Qt.
+        if self.runner is None:
+            return
+        deadline = time.perf_counter() + 0.05
+        try:
+            while time.perf_counter() < deadline:
+                label, done, total = next(self.runner)
+                self.progressBar.setMaximum(total)
+                self.progressBar.setValue(done)
+                self.progressLabel.setText(label)
+        except StopIteration:
+            self.finishChecks()
+            return
+        except Exception:
+            self.finishChecks(cancelled=True)
+            raise
+        self.diagnostics.update(self.runDiagnostics)
+        if time.perf_counter() - self.lastReport > 0.5:
+            self.lastReport = time.perf_counter()
+            self.createReport()
+        QtCore.QTimer.singleShot(0, self.stepChecks)
+
+    def cancelChecks(self):
+        if self.runner is None:
+            return
+        self.runner.close()
+        self.finishChecks(cancelled=True)
+
+    def finishChecks(self, cancelled=False):
+        if cancelled:
+            self.runStatus = f"cancelled after {self.progressBar.value()} of {self.progressBar.maximum()} units"
+        elif self.incremental and self.incrementalCheck.isChecked():
+            if self.runStale and self.runCached:
+                self.incremental.store(self.runCached, self.runStale, self.runDiagnostics)
+            self.runDiagnostics.update(self.incremental.diagnostics(self.runCached, self.runNodes))
+        self.diagnostics.update(self.runDiagnostics)
+        self.runner = None
+        if not cancelled and 'instancingCandidates' in self.runCommands:
+            # Groups and savings for the report, only when there are copies.
+            self.instancing = None
+            if self.diagnostics.get('instancingCandidates'):
+                self.instancing = mcv.instancingSection(self.runNodes, self.hierarchy)
+        if self.profiler:
+            self.profiler.stop()
+        self.exportProfileButton.setEnabled(self.profiler is not None)
+        self.exportDiagnosticsButton.setEnabled(bool(self.diagnostics))
+        self.setRunning(False)
+        self.updateHistogram()
         self.createReport()
 
-    def commandToRun(self, commands, nodes):
-        diagnostics = {}
-        SLMesh = om.MSelectionList()       
-        for node in nodes:
-            shapes = cmds.listRelatives(node, shapes=True, typ="mesh")
-            if shapes:
-                SLMesh.add(node)
-        for command in commands:
-            errors = getattr(
-                mcc, command)(nodes, SLMesh)
-            diagnostics[command] = errors
-        SLMesh.clear()
-        return diagnostics
+    def setRunning(self, running):
+        self.checkRunButton.setEnabled(not running)
+        for button in self.commandRunButton.values():
+            button.setEnabled(not running)
+        self.cancelButton.setEnabled(running)
+        self.progressBar.setVisible(running)
+        self.progressBar.setValue(0)
+        self.progressLabel.setText("")
+
+    def exportProfile(self):
+        if not self.profiler:
+            return
+        path, fileFilter = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Profile", "", "Profile JSON (*.json);;Chrome trace (*.json)")
+        if path:
+            self.profiler.export(path, chrome=fileFilter.startswith("Chrome"))
+
+    def metricParameter(self):
+        # (command, parameter name, current value) of the selected metric.
+        command = self.metricCombo.currentData()
+        name, default = next(iter(self.commandsList[command]['parameters'].items()))
+        return command, name, self.parameters.get(command, {}).get(name, default)
+
+    def selectMetric(self):
+        if not self.metrics:
+            return
+        command, name, value = self.metricParameter()
+        self.parameterLabel.setText(name)
+        self.parameterSpin.blockSignals(True)
+        self.parameterSpin.setValue(value)
+        self.parameterSpin.blockSignals(False)
+        self.updateHistogram()
+
+    def setParameter(self, value):
+        # Refilters the kept values right away; checks that ran on the API
+        # pick the threshold up on their next run, on numpy.
+        command, name, _ = self.metricParameter()
+        if value == self.commandsList[command]['parameters'][name]:
+            self.parameters.pop(command, None)
+        else:
+            self.parameters[command] = {name: value}
+        if self.metrics.covers(command) and command in self.diagnostics:
+            self.diagnostics[command] = self.metrics.select(command, self.parameters.get(command))
+            self.createReport()
+        self.updateHistogram()
+
+    def updateHistogram(self):
+        if not self.metrics:
+            return
+        command, _, value = self.metricParameter()
+        if not self.metrics.covers(command):
+            self.histogram.setData([], [])
+            self.histogramLabel.setText("run on numpy to see values")
+            return
+        counts, edges = self.metrics.histogram(command)
+        self.histogram.setData(counts.tolist(), edges.tolist(), value)
+        failing = mcrs.count(self.metrics.select(command, self.parameters.get(command)))
+        self.histogramLabel.setText(f"{failing} of {int(counts.sum())} failing, "
+                                    f"values {edges[0]:.6g} to {edges[-1]:.6g}")
+
+    def exportDiagnostics(self):
+        if not self.diagnostics:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Diagnostics", "", "Diagnostics archive (*.mcdiag)")
+        if path:
+            mcv.archive(path, self.diagnostics)
+
+    def getResultCache(self):
+        if not mcca or not self.cacheCheck.isChecked():
+            return None
+        if self.resultCache is None:
+            self.resultCache = mcca.ResultCache()
+        return self.resultCache
+
+    def backend(self, command):
+        if command in self.commandBackend:
+            return self.commandBackend[command].currentText()
+        return mcv.defaultBackend(command)
 
     def createReport(self):
-        self.reportOutputUI.clear()
-        lastFailed = None
         consolidated = self.consolidatedCheck.isChecked()
-
-        html = ""
-
+        sections = []
         if self.metadataCheck.isChecked():
-            metadata = self.getMetadata()
-            html += "----------------- Scene Metadata -----------------<br>"
-            for key in metadata:
-                html += f"{key}: {metadata[key]}<br>"
-            html += "-----------------------------------------------------<br>"
-
-
+            sections.append(("Scene Metadata", self.getMetadata()))
+        cache = self.getResultCache()
+        if cache:
+            sections.append(("Result Cache", cache.stats()))
+        if self.profiler:
+            sections.append(("Timing", self.profiler.section()))
+        if self.runStatus:
+            sections.append(("Run", {"status": self.runStatus}))
+        if self.instancing:
+            sections.append(("Instancing", self.instancing))
+
+        checks = []
         for error in sorted(self.commandsList.keys()):
             if error not in self.diagnostics:
                 self.errorNodesButton[error].setEnabled(False)
@@ -333,67 +581,82 @@ class UI(QtWidgets.QMainWindow):
             failed = len(self.diagnostics[error]) != 0
             if failed:
                 self.errorNodesButton[error].setEnabled(True)
-                self.errorNodesButton[error].clicked.connect(partial(self.selectErrorNodes, self.diagnostics[error]))
                 self.commandLabel[error].setStyleSheet('background-color: #664444;')
             else:
                 self.errorNodesButton[error].setEnabled(False)
                 self.commandLabel[error].setStyleSheet('background-color: #446644;')
-            label = self.commandsList[error]['label']
-            failed = len(self.diagnostics[error]) != 0
-            if lastFailed != failed and lastFailed is not None or (failed is True and lastFailed is True):
-                html += "<br>"
-            lastFailed = failed
-            if failed:
-                html += f"&#10752; {label}<font color=#9c4f4f> [ FAILED ]</font><br>"
-            else:
-                html += f"{label}<font color=#64a65a> [ SUCCESS ]</font><br>" 
-            
-            if failed:
-                if consolidated and "." in self.diagnostics[error][0]:
-                    store = {}
-                    for node in self.diagnostics[error]:
-                        name = node.split(".")[0]
-                        store[name] = store.get(name, 0) + 1
-                    for node in store:
-                        word = "issues" if store[node] > 1 else "issue"
-                        html += f"&#9492;&#9472; {node} - <font color=#9c4f4f>{store[node]} {word}</font><br>"
-                else:
-                    for node in self.diagnostics[error]:
-                        html += f"&#9492;&#9472; {node}<br>"
-        self.reportOutputUI.insertHtml(html)
+            checks.append((self.commandsList[error]['label'], self.diagnostics[error]))
+        self.reportModel.setReport(sections, checks, consolidated)
 
     def getMetadata(self):
-        return {
-            "user": getpass.getuser(),
-            "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "mayaVersion": cmds.about(iv=True),
-            "mayaScene": cmds.file(q=True, sn=True) or "Untitled",
-        }
+        return mcv.sceneMetadata()
 
     def sanityCheck(self):
         checkedCommands = []
         nodes = self.filterNodes()
         if not nodes:
-            self.reportOutputUI.clear()
-            self.reportOutputUI.insertHtml("No nodes to check.")
+            self.reportModel.setMessage("No nodes to check.")
             return
         for name in self.commandsList:
             if self.commandCheckBox[name].isChecked():
                 checkedCommands.append(name)
-        diagnostics = self.commandToRun(checkedCommands, nodes)
-        self.diagnostics = diagnostics
-        self.createReport()
+        self.runChecks(checkedCommands, nodes)
 
     def selectErrorNodes(self, nodes):
-        cmds.select(nodes)
+        # Component results go straight into the selection list as index
+        # arrays, without building a name per component. UVs are only
+        # selectable in the current set, so one set is selected per mesh: the
+        # current set when it has results, otherwise the first other set,
+        # which is made current. Results in other sets are left out rather
+        # than selected in the wrong set.
+        uvSets = {}
+        for node in nodes:
+            if isinstance(node, mcrs.ComponentResult) and node.component == "map":
+                if node.objectName not in uvSets or node.uvSet is None:
+                    uvSets[node.objectName] = node.uvSet
+        skipped = set()
+        for objectName, uvSet in uvSets.items():
+            if uvSet is not None:
+                cmds.polyUVSet(objectName, currentUVSet=True, uvSet=uvSet)
+        SL = om.MSelectionList()
+        for node in nodes:
+            if isinstance(node, mcrs.ComponentResult):
+                if node.component == "map" and node.uvSet != uvSets[node.objectName]:
+                    skipped.add(f"{node.objectName} ({node.uvSet})")
+                    continue
+                dagPath = om.MSelectionList().add(node.objectName).getDagPath(0)
+                fnComponent = om.MFnSingleIndexedComponent()
+                components = fnComponent.create(componentTypes[node.component])
+                fnComponent.addElements([int(index) for index in node.indices])
+                SL.add((dagPath, components))
+            else:
+                SL.add(node)
+        om.MGlobal.setActiveSelectionList(SL)
+        if skipped:
+            cmds.warning(f"UVs of other UV sets weren't selected: {', '.join(sorted(skipped))}")
+
+    def selectCommandErrors(self, command):
+        self.selectErrorNodes(self.diagnostics.get(command, []))
+
+    def selectReportItem(self, index):
+        selection = self.reportModel.selection(index)
+        if selection:
+            self.selectErrorNodes(selection)
 
     def saveSettings(self):
         settings = {}
         settings['consolidated'] = self.consolidatedCheck.isChecked()
         settings['metadata'] = self.metadataCheck.isChecked()
+        settings['incremental'] = self.incrementalCheck.isChecked()
+        settings['cache'] = self.cacheCheck.isChecked()
+        settings['profile'] = self.profileCheck.isChecked()
         settings['commands'] = {}
         for name in self.commandsList:
             settings['commands'][name] = self.commandCheckBox[name].isChecked()
+        settings['backends'] = {}
+        for name in self.commandBackend:
+            settings['backends'][name] = self.backend(name)
+        settings['parameters'] = self.parameters
         cmds.optionVar(sv=("modelCheckerSettings", json.dumps(settings)))
     
     def loadSettings(self):
@@ -402,8 +665,17 @@ class UI(QtWidgets.QMainWindow):
             settings = json.loads(settings)
             self.consolidatedCheck.setChecked(settings['consolidated'])
             self.metadataCheck.setChecked(settings['metadata'])
-            for name in settings['commands']:
-                self.commandCheckBox[name].setChecked(settings['commands'][name])
+            self.incrementalCheck.setChecked(settings.get('incremental', False))
+            self.cacheCheck.setChecked(settings.get('cache', False))
+            self.profileCheck.setChecked(settings.get('profile', False))
+            for name, checked in settings['commands'].items():
+                # Settings can name checks that are gone or hidden here.
+                if name in self.commandCheckBox:
+                    self.commandCheckBox[name].setChecked(checked)
+            for name, backend in settings.get('backends', {}).items():
+                if name in self.commandBackend:
+                    self.commandBackend[name].setCurrentText(backend)
+            self.parameters = settings.get('parameters', {})
                 
 if __name__ == '__main__':
     try:
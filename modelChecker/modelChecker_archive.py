@@ -0,0 +1,189 @@
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import numpy as np
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_results as mcrs
+from modelChecker.__version__ import __version__
+
+# Binary diagnostics archive, for keeping the results of every publish and
+# comparing them between versions. A file is the magic bytes, the length of a
+# JSON header, the header, and one block of little endian int32 component
+# indices starting on an 8 byte boundary. The header holds the scene metadata,
+# the checks that ran, node level errors by check, and per mesh the entries
+# of its failing components: (command, component, uvSet, offset, count,
+# digest), where offset and count locate its indices in the block. Loading
+# memory maps the block, so results read from disk only when something looks
+# at their indices. Every mesh also gets a digest over its entries, and a
+# diff only reads the indices of meshes whose digest changed.
+
+magic = b'MCDIAG\x00\x01'
+_alignment = 8
+
+
+def _entryDigest(indices):
+    return hashlib.sha1(np.sort(np.asarray(indices, dtype='<i4')).tobytes()).hexdigest()
+
+
+def _entryKey(entry):
+    return entry[0], entry[1], entry[2] or ""
+
+
+def _meshDigest(entries):
+    digest = hashlib.sha1()
+    for command, component, uvSet, _, _, entryDigest in sorted(entries, key=_entryKey):
+        digest.update(f"{command}:{component}:{uvSet}:{entryDigest};".encode())
+    return digest.hexdigest()
+
+
+def write(path, diagnostics, metadata=None):
+    # diagnostics as returned by a run, mixing node names and ComponentResults.
+    nodes = {}
+    meshes = {}
+    blocks = []
+    offset = 0
+    for command, errors in diagnostics.items():
+        nodes[command] = []
+        for error in errors:
+            if not isinstance(error, mcrs.ComponentResult):
+                nodes[command].append(error)
+                continue
+            indices = np.asarray(error.indices, dtype='<i4')
+            meshes.setdefault(error.objectName, {'entries': []})['entries'].append(
+                [command, error.component, error.uvSet, offset, len(indices), _entryDigest(indices)])
+            blocks.append(indices)
+            offset += len(indices)
+    for mesh in meshes.values():
+        mesh['digest'] = _meshDigest(mesh['entries'])
+    header = json.dumps({
+        'version': __version__,
+        'metadata': metadata or {},
+        'commands': list(diagnostics),
+        'nodes': nodes,
+        'meshes': meshes,
+    }).encode()
+    start = len(magic) + 8 + len(header)
+    padding = -start % _alignment
+    with open(path, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        f.write(b'\x00' * padding)
+        for indices in blocks:
+            f.write(indices.tobytes())
+
+
+class Archive(object):
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(magic)) != magic:
+                raise ValueError(f"{path} is not a modelChecker diagnostics archive")
+            size, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(size).decode())
+        self.version = header['version']
+        self.metadata = header['metadata']
+        self.commands = header['commands']
+        self.nodes = header['nodes']
+        self.meshes = header['meshes']
+        start = len(magic) + 8 + size
+        self.dataOffset = start + (-start % _alignment)
+        self.total = sum(entry[4] for mesh in self.meshes.values() for entry in mesh['entries'])
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if self.total:
+                self._data = np.memmap(self.path, dtype='<i4', mode='r', offset=self.dataOffset, shape=(self.total,))
+            else:
+                self._data = np.zeros(0, dtype='<i4')
+        return self._data
+
+    def indices(self, entry):
+        offset, count = entry[3], entry[4]
+        return self.data[offset:offset + count]
+
+    def result(self, objectName, entry):
+        return mcrs.ComponentResult(objectName, entry[1], self.indices(entry), entry[2])
+
+    def diagnostics(self):
+        # Results per check in the order the run returned them, reading
+        # indices on demand. Entries were written in that order, so sorting
+        # on their offsets restores it.
+        diagnostics = {command: list(self.nodes.get(command, [])) for command in self.commands}
+        entries = sorted((entry[3], objectName, entry) for objectName, mesh in self.meshes.items()
+                         for entry in mesh['entries'])
+        for _, objectName, entry in entries:
+            diagnostics[entry[0]].append(self.result(objectName, entry))
+        return diagnostics
+
+
+def load(path):
+    return Archive(path)
+
+
+def diff(old, new):
+    # {command: {'introduced': errors, 'fixed': errors}} for the checks both
+    # archives ran, errors in the same mixed form as diagnostics. Meshes
+    # with the same digest on both sides are skipped without reading them.
+    commands = [command for command in new.commands if command in old.commands]
+    changes = {command: {'introduced': [], 'fixed': []} for command in commands}
+    for command in commands:
+        oldNodes, newNodes = set(old.nodes.get(command, [])), set(new.nodes.get(command, []))
+        changes[command]['introduced'].extend(node for node in new.nodes.get(command, []) if node not in oldNodes)
+        changes[command]['fixed'].extend(node for node in old.nodes.get(command, []) if node not in newNodes)
+    for objectName in list(new.meshes) + [name for name in old.meshes if name not in new.meshes]:
+        oldMesh, newMesh = old.meshes.get(objectName), new.meshes.get(objectName)
+        if oldMesh and newMesh and oldMesh['digest'] == newMesh['digest']:
+            continue
+        oldEntries = {tuple(entry[:3]): entry for entry in (oldMesh or {'entries': []})['entries']}
+        newEntries = {tuple(entry[:3]): entry for entry in (newMesh or {'entries': []})['entries']}
+        for key in list(newEntries) + [key for key in oldEntries if key not in newEntries]:
+            command, component, uvSet = key
+            if command not in changes:
+                continue
+            oldEntry, newEntry = oldEntries.get(key), newEntries.get(key)
+            if oldEntry and newEntry and oldEntry[5] == newEntry[5]:
+                continue
+            oldIndices = old.indices(oldEntry) if oldEntry else np.zeros(0, dtype='<i4')
+            newIndices = new.indices(newEntry) if newEntry else np.zeros(0, dtype='<i4')
+            changes[command]['introduced'].extend(mcrs.componentResults(
+                objectName, component, np.setdiff1d(newIndices, oldIndices), uvSet))
+            changes[command]['fixed'].extend(mcrs.componentResults(
+                objectName, component, np.setdiff1d(oldIndices, newIndices), uvSet))
+    return changes
+
+
+def diffReport(changes):
+    # JSON friendly summary of a diff, component runs written as ranges.
+    report = {}
+    for command, change in changes.items():
+        if not change['introduced'] and not change['fixed']:
+            continue
+        report[command] = {
+            'label': mcl.mcCommandsList[command]['label'],
+            'introduced': mcrs.count(change['introduced']),
+            'fixed': mcrs.count(change['fixed']),
+            'introducedErrors': mcrs.names(change['introduced'], compressed=True),
+            'fixedErrors': mcrs.names(change['fixed'], compressed=True),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two modelChecker diagnostics archives.")
+    parser.add_argument('old', help="archive of the earlier run")
+    parser.add_argument('new', help="archive of the later run")
+    args = parser.parse_args(argv)
+    changes = diff(load(args.old), load(args.new))
+    json.dump(diffReport(changes), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if any(change['introduced'] for change in changes.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import argparse
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import traceback
+import modelChecker.modelChecker_cache as mcca
+import modelChecker.modelChecker_headless as mch
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_scene as mcsc
+
+# Validate many scene files across a pool of worker processes. Each worker
+# runs the headless checks, so no Maya license is needed. Results stream back
+# as soon as a file finishes; a worker that crashes or runs past the timeout
+# is replaced and a crashed file is retried. Every worker sends its results
+# down its own pipe, which is closed with it, so killing a worker mid-write
+# can't corrupt what the others send.
+
+
+def collectFiles(source):
+    # A directory is searched for supported files, any other file is read as a
+    # manifest with one path per line (or a JSON list) relative to itself.
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in mcsc.loaders:
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+    with open(source, 'r') as f:
+        content = f.read()
+    if source.lower().endswith('.json'):
+        entries = json.loads(content)
+    else:
+        entries = [line.strip() for line in content.splitlines()]
+    base = os.path.dirname(os.path.abspath(source))
+    return [os.path.join(base, entry) for entry in entries if entry and not entry.startswith('#')]
+
+
+def _work(tasks, results, commands, cachePath):
+    cache = mcca.ResultCache(cachePath) if cachePath else None
+    while True:
+        path = tasks.get()
+        if path is None:
+            return
+        start = time.perf_counter()
+        hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+        try:
+            # One thread each, the pool already keeps every core busy.
+            payload = {'diagnostics': mch.exportDiagnostics(mch.run(path, commands, cache=cache, workers=1))}
+            if cache:
+                payload['cache'] = {'hits': cache.hits - hits, 'misses': cache.misses - misses}
+            results.send((path, 'done', payload, time.perf_counter() - start))
+        except Exception:
+            results.send((path, 'error', traceback.format_exc(), time.perf_counter() - start))
+
+
+class _Worker(object):
+
+    def __init__(self, commands, cachePath):
+        self.tasks = multiprocessing.Queue()
+        self.results, sender = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=_work, args=(self.tasks, sender, commands, cachePath), daemon=True)
+        self.process.start()
+        # Only the worker writes, so a crash reads as the end of the pipe.
+        sender.close()
+        self.path = None
+        self.attempt = 0
+        self.started = None
+
+    def assign(self, path, attempt):
+        self.path = path
+        self.attempt = attempt
+        self.started = time.perf_counter()
+        self.tasks.put(path)
+
+    def release(self):
+        self.path = None
+        self.started = None
+
+    def receive(self):
+        # (path, status, payload, wallTime), or None once the worker is gone.
+        try:
+            return self.results.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            return None
+
+    def stop(self, force=False):
+        if force:
+            self.process.terminate()
+        else:
+            self.tasks.put(None)
+        self.process.join(1)
+        self.results.close()
+
+
+def _result(path, status, attempts, wallTime, diagnostics=None, error=None, cache=None):
+    result = {
+        'file': path,
+        'status': status,
+        'attempts': attempts,
+        'wallTime': wallTime,
+        'diagnostics': diagnostics or {},
+        'error': error,
+    }
+    if cache:
+        result['cache'] = cache
+    return result
+
+
+def validateBatch(paths, commands=None, workers=None, timeout=None, retries=1, cachePath=None):
+    # Generator of one result dict per file, in completion order.
+    commands = commands or list(mcl.mcCommandsList)
+    workers = workers or os.cpu_count() or 1
+    pending = [(path, 1) for path in reversed(paths)]
+    pool = {}
+    nextId = 0
+
+    def spawn():
+        nonlocal nextId
+        pool[nextId] = _Worker(commands, cachePath)
+        nextId += 1
+
+    for _ in range(min(workers, len(paths))):
+        spawn()
+    try:
+        while pending or any(worker.path for worker in pool.values()):
+            for worker in pool.values():
+                if worker.path is None and pending:
+                    worker.assign(*pending.pop())
+            ready = multiprocessing.connection.wait([worker.results for worker in pool.values()], 0.05)
+            for workerId, worker in [item for item in pool.items() if item[1].results in ready]:
+                received = worker.receive()
+                if received is None:
+                    if worker.path is None:
+                        # Died idle; a busy worker is replaced below.
+                        worker.stop()
+                        del pool[workerId]
+                        spawn()
+                    continue
+                path, status, payload, wallTime = received
+                attempts = worker.attempt
+                worker.release()
+                if status == 'done':
+                    diagnostics = payload['diagnostics']
+                    failed = any(diagnostics.values())
+                    yield _result(path, 'failed' if failed else 'passed', attempts, wallTime,
+                                  diagnostics=diagnostics, cache=payload.get('cache'))
+                else:
+                    yield _result(path, 'error', attempts, wallTime, error=payload)
+            now = time.perf_counter()
+            for workerId, worker in list(pool.items()):
+                if worker.path is None:
+                    continue
+                wallTime = now - worker.started
+                if not worker.process.is_alive():
+                    path, attempt = worker.path, worker.attempt
+                    worker.stop()
+                    del pool[workerId]
+                    spawn()
+                    if attempt <= retries:
+                        pending.append((path, attempt + 1))
+                    else:
+                        error = f"worker exited with code {worker.process.exitcode}"
+                        yield _result(path, 'crashed', attempt, wallTime, error=error)
+                elif timeout and wallTime > timeout:
+                    path, attempt = worker.path, worker.attempt
+                    worker.stop(force=True)
+                    del pool[workerId]
+                    spawn()
+                    yield _result(path, 'timeout', attempt, wallTime, error=f"exceeded {timeout}s")
+    finally:
+        for worker in pool.values():
+            worker.stop(force=worker.path is not None)
+
+
+def summarize(results, elapsed):
+    statuses = {}
+    for result in results:
+        statuses[result['status']] = statuses.get(result['status'], 0) + 1
+    summary = {
+        'files': len(results),
+        'elapsed': elapsed,
+        'assetsPerMinute': len(results) / elapsed * 60.0 if elapsed else 0.0,
+        'statuses': statuses,
+        'wallTimes': {result['file']: result['wallTime'] for result in results},
+    }
+    caches = [result['cache'] for result in results if 'cache' in result]
+    if caches:
+        summary['cache'] = {
+            'hits': sum(cache['hits'] for cache in caches),
+            'misses': sum(cache['misses'] for cache in caches),
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate many scene files in parallel without Maya.")
+    parser.add_argument('source', help="directory of scene files or a manifest listing them")
+    parser.add_argument('--checks', nargs='*', help="check names, defaults to every check")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes, defaults to the CPU count")
+    parser.add_argument('--timeout', type=float, default=None, help="seconds allowed per file")
+    parser.add_argument('--retries', type=int, default=1, help="retries for a file whose worker crashed")
+    parser.add_argument('--cache', help="result cache database shared by all workers")
+    parser.add_argument('--output', help="write one JSON result per line to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    paths = collectFiles(args.source)
+    stream = open(args.output, 'w') if args.output else sys.stdout
+    results = []
+    start = time.perf_counter()
+    try:
+        for result in validateBatch(paths, args.checks, args.workers, args.timeout, args.retries, args.cache):
+            results.append(result)
+            stream.write(json.dumps(result) + "\n")
+            stream.flush()
+    finally:
+        if args.output:
+            stream.close()
+    summary = summarize(results, time.perf_counter() - start)
+    sys.stderr.write(json.dumps(summary, indent=2) + "\n")
+    return 0 if summary['statuses'].keys() <= {'passed'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,389 @@
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import modelChecker.modelChecker_headless as mch
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_scene as mcsc
+import modelChecker.modelChecker_snapshot as mcs
+import modelChecker.modelChecker_spatial as mcsp
+from modelChecker.__version__ import __version__
+try:
+    import maya.cmds as cmds
+    import maya.api.OpenMaya as om
+    import modelChecker.modelChecker_commands as mcc
+except ImportError:
+    cmds = None
+    om = None
+    mcc = None
+
+# Benchmarks every check against procedurally generated meshes. Each
+# generator builds a quad grid of roughly the requested face count and plants
+# one kind of problem on every tenth face, so every check has work to report.
+# Checks run through modelChecker_headless, or through modelChecker_commands
+# inside Maya with --maya. Wall time, peak memory and components per second
+# are appended to a JSON history and compared against a stored baseline.
+
+defaultSizes = [1000, 10000, 100000]
+defaultHistory = 'benchmarkHistory.json'
+every = 10
+
+# Modules that make up the check registry and API, timed by --imports.
+coreModules = [
+    'modelChecker.modelChecker_list',
+    'modelChecker.modelChecker_results',
+    'modelChecker.modelChecker_profile',
+]
+mayaModules = [
+    'modelChecker.modelChecker_commands',
+    'modelChecker.modelChecker_validate',
+]
+defaultImportBudget = 50.0
+
+
+def _pack(padded):
+    # Rows of vertex ids padded with -1 to face counts and face vertices.
+    valid = padded >= 0
+    return valid.sum(axis=1).astype(np.int64), padded[valid].astype(np.int64)
+
+
+def _vertexUVs(arrays, us, vs):
+    # One UV per vertex, shared by every face corner on it.
+    arrays['us'] = us
+    arrays['vs'] = vs
+    arrays['uvCounts'] = arrays['faceCounts'].copy()
+    arrays['uvIds'] = arrays['faceVertices'].copy()
+    return arrays
+
+
+def _gridQuads(faces):
+    n = max(1, int(round(math.sqrt(faces))))
+    rows, cols = np.divmod(np.arange(n * n), n)
+    first = rows * (n + 1) + cols
+    quads = np.stack([first, first + 1, first + n + 2, first + n + 1], axis=1)
+    rows, cols = np.divmod(np.arange((n + 1) * (n + 1)), n + 1)
+    points = np.stack([cols, np.zeros(len(cols)), rows], axis=1).astype(np.float64)
+    return n, quads, points
+
+
+def _extended(faces, padded, extraPoints):
+    # A grid with extra faces and points appended after it.
+    n, quads, points = _gridQuads(faces)
+    padded = np.concatenate([np.pad(quads, ((0, 0), (0, padded.shape[1] - 4)), constant_values=-1), padded])
+    points = np.concatenate([points, extraPoints]) if len(extraPoints) else points
+    faceCounts, faceVertices = _pack(padded)
+    arrays = {'faceCounts': faceCounts, 'faceVertices': faceVertices, 'points': points}
+    return _vertexUVs(arrays, points[:, 0] / n, points[:, 2] / n)
+
+
+def grid(faces):
+    n, quads, points = _gridQuads(faces)
+    faceCounts, faceVertices = _pack(quads)
+    arrays = {'faceCounts': faceCounts, 'faceVertices': faceVertices, 'points': points}
+    return _vertexUVs(arrays, points[:, 0] / n, points[:, 2] / n)
+
+
+def sphere(faces):
+    # Latitude/longitude sphere; both poles are triangle fans with a valence
+    # of one per segment.
+    segments = max(8, int(math.sqrt(faces)))
+    rings = max(3, faces // segments)
+    ring = lambda k, j: 1 + (k - 1) * segments + j % segments
+    j = np.arange(segments)
+    bottom = 1 + (rings - 1) * segments
+    rows = [np.stack([np.zeros(segments, dtype=np.int64), ring(1, j + 1), ring(1, j), -np.ones(segments, dtype=np.int64)], axis=1)]
+    for k in range(1, rings - 1):
+        rows.append(np.stack([ring(k, j), ring(k, j + 1), ring(k + 1, j + 1), ring(k + 1, j)], axis=1))
+    rows.append(np.stack([ring(rings - 1, j), ring(rings - 1, j + 1), np.full(segments, bottom), -np.ones(segments, dtype=np.int64)], axis=1))
+    faceCounts, faceVertices = _pack(np.concatenate(rows))
+    theta = np.repeat(np.arange(1, rings) * math.pi / rings, segments)
+    phi = np.tile(j * 2.0 * math.pi / segments, rings - 1)
+    points = np.concatenate([
+        [[0.0, 1.0, 0.0]],
+        np.stack([np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi)], axis=1),
+        [[0.0, -1.0, 0.0]],
+    ])
+    us = np.concatenate([[0.5], phi / (2.0 * math.pi), [0.5]])
+    vs = np.concatenate([[1.0], 1.0 - theta / math.pi, [0.0]])
+    arrays = {'faceCounts': faceCounts, 'faceVertices': faceVertices, 'points': points}
+    return _vertexUVs(arrays, us, vs)
+
+
+def ngons(faces):
+    # Every tenth quad gets a vertex on its first edge and turns into a pentagon.
+    n, quads, points = _gridQuads(faces)
+    selected = np.arange(0, len(quads), every)
+    middle = len(points) + np.arange(len(selected))
+    padded = np.pad(quads, ((0, 0), (0, 1)), constant_values=-1)
+    a, b, c, d = quads[selected].T
+    padded[selected] = np.stack([a, middle, b, c, d], axis=1)
+    points = np.concatenate([points, (points[a] + points[b]) / 2.0])
+    faceCounts, faceVertices = _pack(padded)
+    arrays = {'faceCounts': faceCounts, 'faceVertices': faceVertices, 'points': points}
+    return _vertexUVs(arrays, points[:, 0] / n, points[:, 2] / n)
+
+
+def lamina(faces):
+    # Every tenth quad is duplicated with reversed winding.
+    _, quads, _ = _gridQuads(faces)
+    return _extended(faces, quads[::every, ::-1], np.zeros((0, 3)))
+
+
+def zeroAreaFaces(faces):
+    # Disconnected quads collapsed onto a single point above every tenth face.
+    _, quads, points = _gridQuads(faces)
+    centers = points[quads[::every]].mean(axis=1) + [0.0, 1.0, 0.0]
+    first = len(points) + 4 * np.arange(len(centers))
+    padded = np.stack([first, first + 1, first + 2, first + 3], axis=1)
+    return _extended(faces, padded, np.repeat(centers, 4, axis=0))
+
+
+def nonManifoldFans(faces):
+    # A third triangle on the first edge of every tenth quad.
+    _, quads, points = _gridQuads(faces)
+    selected = quads[::every]
+    apex = len(points) + np.arange(len(selected))
+    padded = np.stack([selected[:, 0], selected[:, 1], apex, -np.ones(len(selected), dtype=np.int64)], axis=1)
+    apexPoints = points[selected].mean(axis=1) + [0.0, 1.0, 0.0]
+    return _extended(faces, padded, apexPoints)
+
+
+def badUVs(faces):
+    # Per corner UVs laid out like the grid; every tenth face is shifted half
+    # a cell onto its neighbour and the next one is moved below zero.
+    n, quads, points = _gridQuads(faces)
+    arrays = grid(faces)
+    corners = quads.ravel()
+    us = points[corners, 0].reshape(-1, 4) / n
+    vs = points[corners, 2].reshape(-1, 4) / n
+    us[::every] += 0.5 / n
+    us[1::every] -= 0.5
+    vs[1::every] -= 0.5
+    arrays['us'] = us.ravel()
+    arrays['vs'] = vs.ravel()
+    arrays['uvIds'] = np.arange(len(corners), dtype=np.int64)
+    return arrays
+
+
+generators = {
+    'grid': grid,
+    'sphere': sphere,
+    'ngons': ngons,
+    'lamina': lamina,
+    'zeroAreaFaces': zeroAreaFaces,
+    'nonManifoldFans': nonManifoldFans,
+    'badUVs': badUVs,
+}
+
+
+def benchmarkScene(arrays):
+    scene = mcsc.Scene()
+    scene.addTransform('|benchMesh')
+    scene.addShape('|benchMesh|benchMeshShape', mesh=mcs.MeshSnapshot('benchMesh', **arrays))
+    return scene
+
+
+def componentCount(arrays, command):
+    # Components a check visits, used for the throughput figure.
+    if command not in mcs.kernels:
+        return len(arrays['faceCounts']) if command in mcsp.crossMeshChecks else 1
+    snapshot = mcs.MeshSnapshot('benchMesh', **arrays)
+    return mcs.componentCount(snapshot, mcs.kernels[command][1])
+
+
+def _headlessRunner(arrays):
+    def run(commands):
+        return mch.runScene(benchmarkScene(arrays), commands)
+    return run
+
+
+def _mayaRunner(arrays):
+    def run(commands):
+        fnMesh = om.MFnMesh()
+        points = [om.MPoint(*point) for point in arrays['points'].tolist()]
+        mObject = fnMesh.create(points, arrays['faceCounts'].tolist(), arrays['faceVertices'].tolist(),
+                                arrays['us'].tolist(), arrays['vs'].tolist())
+        fnMesh.assignUVs(arrays['uvCounts'].tolist(), arrays['uvIds'].tolist())
+        node = om.MFnDagNode(mObject).partialPathName()
+        SLMesh = om.MSelectionList()
+        SLMesh.add(node)
+        try:
+            return {command: getattr(mcc, command)([node], SLMesh) for command in commands}
+        finally:
+            cmds.delete(node)
+    return run
+
+
+def measure(run, commands, memory=True):
+    start = time.perf_counter()
+    diagnostics = run(commands)
+    wallTime = time.perf_counter() - start
+    peakMemory = None
+    if memory:
+        tracemalloc.start()
+        run(commands)
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return wallTime, peakMemory, diagnostics
+
+
+def benchmark(meshes=None, sizes=None, commands=None, memory=True, maya=False):
+    meshes = meshes or list(generators)
+    sizes = sizes or defaultSizes
+    commands = commands or list(mcl.mcCommandsList)
+    if maya:
+        commands = [command for command in commands if hasattr(mcc, command)]
+    backend = 'maya' if maya else 'headless'
+    results = []
+    for mesh in meshes:
+        for size in sizes:
+            arrays = generators[mesh](size)
+            run = _mayaRunner(arrays) if maya else _headlessRunner(arrays)
+            faces = len(arrays['faceCounts'])
+            for command in commands + ['runAll']:
+                checks = commands if command == 'runAll' else [command]
+                wallTime, peakMemory, diagnostics = measure(run, checks, memory)
+                if command == 'runAll':
+                    components = faces
+                else:
+                    components = componentCount(arrays, command)
+                results.append({
+                    'backend': backend,
+                    'mesh': mesh,
+                    'size': size,
+                    'faces': faces,
+                    'check': command,
+                    'wallTime': wallTime,
+                    'peakMemory': peakMemory,
+                    'componentsPerSecond': components / wallTime if wallTime else None,
+                    'failures': sum(mcrs.count(errors) for errors in diagnostics.values()),
+                })
+    return {
+        'date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def importTime(module, repeat=3):
+    # Cold import in a fresh interpreter, best of a few runs, in milliseconds.
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                                stdout=subprocess.PIPE, universal_newlines=True).stdout
+        times.append(float(output) * 1000.0)
+    return min(times)
+
+
+def importTimes(maya=False):
+    modules = coreModules + (mayaModules if maya else [])
+    return {module: importTime(module) for module in modules}
+
+
+def _key(result):
+    return (result['backend'], result['mesh'], result['size'], result['check'])
+
+
+def regressions(run, baseline, tolerance=0.25, minimumDelta=0.005):
+    # Results slower than the baseline by more than the tolerance. The
+    # minimum delta keeps timer noise on sub-millisecond checks out.
+    previous = {_key(result): result for result in baseline['results']}
+    slower = []
+    for result in run['results']:
+        base = previous.get(_key(result))
+        if base is None:
+            continue
+        delta = result['wallTime'] - base['wallTime']
+        if delta > minimumDelta and result['wallTime'] > base['wallTime'] * (1.0 + tolerance):
+            slower.append(dict(result, baselineWallTime=base['wallTime']))
+    return slower
+
+
+def appendHistory(run, path):
+    history = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            history = json.load(f)
+    history.append(run)
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+
+def _table(run):
+    lines = [f"{'mesh':<16}{'faces':>10}  {'check':<20}{'seconds':>10}{'peak MB':>10}{'comp/s':>14}{'fails':>9}"]
+    for result in run['results']:
+        peak = f"{result['peakMemory'] / 1048576.0:.1f}" if result['peakMemory'] is not None else "-"
+        rate = f"{result['componentsPerSecond']:.0f}" if result['componentsPerSecond'] else "-"
+        lines.append(f"{result['mesh']:<16}{result['faces']:>10}  {result['check']:<20}"
+                     f"{result['wallTime']:>10.4f}{peak:>10}{rate:>14}{result['failures']:>9}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the checks on generated meshes.")
+    parser.add_argument('--meshes', nargs='*', choices=sorted(generators), help="generators, defaults to all")
+    parser.add_argument('--sizes', nargs='*', type=int, help="approximate face counts, defaults to 1k 10k 100k")
+    parser.add_argument('--checks', nargs='*', help="check names, defaults to every check")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass for peak memory")
+    parser.add_argument('--maya', action='store_true', help="run modelChecker_commands inside Maya instead")
+    parser.add_argument('--history', default=defaultHistory, help="JSON file the run is appended to")
+    parser.add_argument('--baseline', help="run to compare against; regressions exit with code 1")
+    parser.add_argument('--save-baseline', help="write this run to a baseline file")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument('--imports', action='store_true', help="only time cold imports against --import-budget")
+    parser.add_argument('--import-budget', type=float, default=defaultImportBudget,
+                        help="milliseconds a cold import of each core module may take")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.checks or [] if name not in mcl.mcCommandsList]
+    if unknown:
+        parser.error("unknown checks: " + ", ".join(unknown))
+    if args.maya:
+        if om is None:
+            parser.error("--maya needs to run inside Maya or mayapy")
+        try:
+            import maya.standalone
+            maya.standalone.initialize()
+        except RuntimeError:
+            pass
+
+    if args.imports:
+        times = importTimes(args.maya)
+        over = {module: time for module, time in times.items() if time > args.import_budget}
+        for module, time in times.items():
+            sys.stdout.write(f"{module:<45}{time:>8.1f} ms{'  OVER BUDGET' if module in over else ''}\n")
+        appendHistory({'date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'version': __version__,
+                       'imports': times, 'importBudget': args.import_budget, 'results': []}, args.history)
+        return 1 if over else 0
+
+    run = benchmark(args.meshes, args.sizes, args.checks, not args.no_memory, args.maya)
+    sys.stdout.write(_table(run) + "\n")
+    appendHistory(run, args.history)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            slower = regressions(run, json.load(f), args.tolerance)
+        for result in slower:
+            sys.stderr.write(f"REGRESSION {result['mesh']} {result['faces']} {result['check']}: "
+                             f"{result['baselineWallTime']:.4f}s -> {result['wallTime']:.4f}s\n")
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
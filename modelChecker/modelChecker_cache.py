@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+import numpy as np
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_snapshot as mcs
+from modelChecker.__version__ import __version__
+
+# Content-addressed result cache shared across sessions and processes. Entries
+# are keyed by a hash of the mesh arrays a check reads plus the check name and
+# its parameters, and hold the failing component indices, so the same prop
+# under a different name or in another shot is a hit. SQLite handles locking
+# between processes; the least recently used entries are evicted once the
+# cache grows past maxBytes. Each connection keeps a running total of the
+# bytes stored, so a write only sums the table when the total says it's full,
+# which catches up on what other processes wrote, and eviction then deletes
+# oldest first in batches down to evictTarget of maxBytes.
+
+evictBatch = 256
+evictTarget = 0.9
+
+defaultPath = os.path.join(os.path.expanduser('~'), '.modelChecker', 'resultCache.sqlite')
+
+
+class ResultCache(object):
+
+    def __init__(self, path=None, maxBytes=256 * 1024 * 1024):
+        self.path = path or os.environ.get('MODELCHECKER_CACHE', defaultPath)
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS accessedIndex ON results (accessed)")
+        self.total = self._size()
+
+    def _size(self):
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def key(self, command, snapshot, parameters=None, fields=None):
+        # fields: the arrays hashed, by default the bulk arrays standing for
+        # every array the check reads.
+        fields = mcs.keyFields[command] if fields is None else fields
+        digest = hashlib.sha1()
+        digest.update(json.dumps(
+            [__version__, command, parameters or {}, snapshot.hash(fields)],
+            sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        return np.frombuffer(zlib.decompress(row[0]), dtype=np.int64)
+
+    def put(self, key, indices):
+        value = zlib.compress(np.ascontiguousarray(indices, dtype=np.int64).tobytes())
+        row = self.connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time()))
+        self.total += len(value) - (row[0] if row else 0)
+        if self.total > self.maxBytes:
+            self.evict()
+
+    def evict(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.total = self._size()
+            target = self.maxBytes * evictTarget if self.total > self.maxBytes else self.total
+            while self.total > target:
+                rows = self.connection.execute(
+                    "SELECT key, size FROM results ORDER BY accessed LIMIT ?", (evictBatch,)).fetchall()
+                if not rows:
+                    break
+                keys = []
+                for key, size in rows:
+                    keys.append((key,))
+                    self.total -= size
+                    if self.total <= target:
+                        break
+                self.connection.executemany("DELETE FROM results WHERE key = ?", keys)
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            self.total = self._size()
+            raise
+
+    def stats(self):
+        entries, size = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def close(self):
+        self.connection.close()
+
+
+def runKernel(command, snapshot, cache=None, parameters=None):
+    # parameters override the registry defaults of the check.
+    kernel, _ = mcs.kernels[command]
+    parameters = mcl.parameters(command, parameters)
+    if cache is None:
+        return kernel(snapshot, **parameters)
+    key = cache.key(command, snapshot, parameters)
+    indices = cache.get(key)
+    if indices is None:
+        indices = kernel(snapshot, **parameters)
+        cache.put(key, indices)
+    return indices
@@ -1,5 +1,12 @@
 import maya.cmds as cmds
 import maya.api.OpenMaya as om
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_results as mcrs
+from modelChecker import lazyImport
+
+np = lazyImport('numpy')
+mcs = lazyImport('modelChecker.modelChecker_snapshot', ['numpy'])
+mcn = lazyImport('modelChecker.modelChecker_numpy', ['numpy'])
 
 def trailingNumbers(nodes, _):
     trailingNumbers = []
@@ -63,7 +70,7 @@ def ngons(_, SLMesh):
         while not faceIt.isDone():
             numOfEdges = faceIt.getEdges()
             if len(numOfEdges) > 4:
-                componentName = f"{str(objectName)}.f[{str(faceIt.index())}"
+                componentName = f"{str(objectName)}.f[{str(faceIt.index())}]"
                 ngons.append(componentName)
             faceIt.next()
         selIt.next()
@@ -101,13 +108,14 @@ def lamina(_, SLMesh):
 
 def zeroAreaFaces(_, SLMesh):
     zeroAreaFaces = []
+    maxArea = mcl.parameters('zeroAreaFaces')['maxArea']
     selIt = om.MItSelectionList(SLMesh)
     while not selIt.isDone():
         faceIt = om.MItMeshPolygon(selIt.getDagPath())
         objectName = selIt.getDagPath().getPath()
         while not faceIt.isDone():
             faceArea = faceIt.getArea()
-            if faceArea <= 0.00000001:
+            if faceArea <= maxArea:
                 componentName = f"{str(objectName)}.f[{str(faceIt.index())}]"
                 zeroAreaFaces.append(componentName)
             faceIt.next()
@@ -117,13 +125,14 @@ def zeroAreaFaces(_, SLMesh):
 
 def zeroLengthEdges(_, SLMesh):
     zeroLengthEdges = []
+    maxLength = mcl.parameters('zeroLengthEdges')['maxLength']
     selIt = om.MItSelectionList(SLMesh)
     while not selIt.isDone():
         edgeIt = om.MItMeshEdge(selIt.getDagPath())
         objectName = selIt.getDagPath().getPath()
         while not edgeIt.isDone():
-            if edgeIt.length() <= 0.00000001:
-                componentName = f"{str(objectName)}.f[{str(edgeIt.index())}]"
+            if edgeIt.length() <= maxLength:
+                componentName = f"{str(objectName)}.e[{str(edgeIt.index())}]"
                 zeroLengthEdges.append(componentName)
             edgeIt.next()
         selIt.next()
@@ -175,12 +184,13 @@ def openEdges(_, SLMesh):
 
 def poles(_, SLMesh):
     poles = []
+    maxValence = mcl.parameters('poles')['maxValence']
     selIt = om.MItSelectionList(SLMesh)
     while not selIt.isDone():
         vertexIt = om.MItMeshVertex(selIt.getDagPath())
         objectName = selIt.getDagPath().getPath()
         while not vertexIt.isDone():
-            if vertexIt.numConnectedEdges() > 5:
+            if vertexIt.numConnectedEdges() > maxValence:
                 componentName = f"{str(objectName)}.vtx[{str(vertexIt.index())}]"
                 poles.append(componentName)
             vertexIt.next()
@@ -218,60 +228,30 @@ def missingUVs(_, SLMesh):
         selIt.next()
     return missingUVs
 
+def _kernelCheck(command, SLMesh):
+    # The snapshot kernel of command over the UV arrays of every mesh, and of
+    # every UV set when the registry marks the check 'uvSets', instead of a
+    # Python test per UV. Sets other than the current one carry their name.
+    kernel, component = mcs.kernels[command]
+    parameters = mcl.parameters(command)
+    result = []
+    for snapshot in mcn.snapshots(SLMesh):
+        for uvSet, checked in mcs.checkedSnapshots(command, snapshot):
+            result.extend(mcrs.componentResults(snapshot.name, component, kernel(checked, **parameters), uvSet))
+    return result
+
 def uvRange(_, SLMesh):
-    if SLMesh.isEmpty():
-        return []
-    uvRange = []
-    selIt = om.MItSelectionList(SLMesh)
-    mesh = om.MFnMesh(selIt.getDagPath())
-    objectName = selIt.getDagPath().getPath()
-    Us, Vs = mesh.getUVs()
-    for i in range(len(Us)):
-        if Us[i] < 0 or Us[i] > 10 or Vs[i] < 0:
-            componentName = f"{str(objectName)}.map[{str(i)}]"
-            uvRange.append(componentName)
-    return uvRange
+    return _kernelCheck('uvRange', SLMesh)
 
 def onBorder(_, SLMesh):
-    if SLMesh.isEmpty():
-        return []
-    onBorder = []
-    selIt = om.MItSelectionList(SLMesh)
-    mesh = om.MFnMesh(selIt.getDagPath())
-    objectName = selIt.getDagPath().getPath()
-    Us, Vs = mesh.getUVs()
-    for i in range(len(Us)):
-        if abs(int(Us[i]) - Us[i]) < 0.00001 or abs(int(Vs[i]) - Vs[i]) < 0.00001:
-            componentName = f"{str(objectName)}.map[{str(i)}]"
-            onBorder.append(componentName)
-    return onBorder
+    return _kernelCheck('onBorder', SLMesh)
 
 def crossBorder(_, SLMesh):
     crossBorder = []
-    if SLMesh.isEmpty():
-        return crossBorder
-    selIt = om.MItSelectionList(SLMesh)
-    while not selIt.isDone():
-        faceIt = om.MItMeshPolygon(selIt.getDagPath())
-        objectName = selIt.getDagPath().getPath()
-        while not faceIt.isDone():
-            U, V = set(), set()
-            try:
-                UVs = faceIt.getUVs()
-                Us, Vs, = UVs[0], UVs[1]
-                for i in range(len(Us)):
-                    uAdd = int(Us[i]) if Us[i] > 0 else int(Us[i]) - 1
-                    vAdd = int(Vs[i]) if Vs[i] > 0 else int(Vs[i]) - 1
-                    U.add(uAdd)
-                    V.add(vAdd)
-                if len(U) > 1 or len(V) > 1:
-                    componentName = f"{str(objectName)}.f[{str(faceIt.index())}]"
-                    crossBorder.append(componentName)
-                faceIt.next()
-            except:
-                cmds.warning("Face " + str(faceIt.index()) + " has no UVs")
-                faceIt.next()
-        selIt.next()
+    for snapshot in mcn.snapshots(SLMesh):
+        for face in np.flatnonzero(snapshot.uvCounts == 0):
+            cmds.warning("Face " + str(face) + " has no UVs")
+        crossBorder.extend(mcrs.componentResults(snapshot.name, "f", mcs.crossBorder(snapshot)))
     return crossBorder
 
 def unfrozenTransforms(nodes, _):
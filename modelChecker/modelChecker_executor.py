@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import modelChecker.modelChecker_cache as mcca
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_snapshot as mcs
+
+# Runs the numpy kernels of many meshes on a thread pool. Everything that can
+# reach Maya happens on the calling thread first: each mesh's UV set views
+# are made, the arrays its checks read are extracted, and cache entries are
+# looked up. Workers then get one mesh each and only run kernels over arrays
+# already in memory, where numpy releases the GIL for the heavy work. A mesh
+# is never shared between workers, so arrays derived on first use (offsets,
+# adjacency) need no locking. Results and cache writes are merged back on the
+# calling thread in mesh order, so the output is the same for any number of
+# workers. Given a MetricStore, threshold checks skip the cache and keep the
+# values they compared.
+
+
+def defaultWorkers():
+    return os.cpu_count() or 1
+
+
+class _Run(object):
+    # One kernel call: a check on one mesh and UV set. indices is filled in
+    # from the cache on a hit, otherwise by a worker, which also fills in
+    # values when the check's values are kept.
+    __slots__ = ('command', 'uvSet', 'snapshot', 'key', 'indices', 'hit', 'keepValues', 'values')
+
+    def __init__(self, command, uvSet, snapshot, key, indices, keepValues):
+        self.command = command
+        self.uvSet = uvSet
+        self.snapshot = snapshot
+        self.key = key
+        self.indices = indices
+        self.hit = indices is not None
+        self.keepValues = keepValues
+        self.values = None
+
+
+def _extract(commands, objectName, snapshot, cache, profiler, parameters, metrics):
+    runs = []
+    for command in commands:
+        keepValues = metrics is not None and command in mcs.metricKernels
+        for uvSet, checked in mcs.checkedSnapshots(command, snapshot):
+            key = indices = None
+            if cache is not None and not keepValues:
+                key = cache.key(command, checked, mcl.parameters(command, parameters.get(command)))
+                indices = cache.get(key)
+            if indices is not None:
+                with mcp.measure(profiler, command, objectName) as event:
+                    event['components'] = mcs.componentCount(checked, mcs.kernels[command][1])
+                    event['results'] = len(indices)
+            else:
+                for field in mcs.kernelFields[command]:
+                    checked.get(field)
+            runs.append(_Run(command, uvSet, checked, key, indices, keepValues))
+    return runs
+
+
+def _compute(objectName, runs, profiler, parameters):
+    for run in runs:
+        if run.hit:
+            continue
+        command = run.command
+        with mcp.measure(profiler, command, objectName) as event:
+            if run.keepValues:
+                run.values = mcs.metricKernels[command][0](run.snapshot)
+                run.indices = mcs.selectMetric(command, run.values, parameters.get(command))
+            else:
+                run.indices = mcca.runKernel(command, run.snapshot, parameters=parameters.get(command))
+            event['components'] = mcs.componentCount(run.snapshot, mcs.kernels[command][1])
+            event['results'] = len(run.indices)
+
+
+def runKernels(commands, meshes, cache=None, profiler=None, workers=None, parameters=None, metrics=None):
+    # commands with a numpy kernel over meshes, a list of (objectName,
+    # MeshSnapshot). workers defaults to the CPU count, 1 runs inline.
+    # parameters maps a check to overrides of its registry parameters.
+    parameters = parameters or {}
+    commands = [command for command in commands if command in mcs.kernels]
+    diagnostics = {command: [] for command in commands}
+    jobs = [(objectName, _extract(commands, objectName, snapshot, cache, profiler, parameters, metrics))
+            for objectName, snapshot in meshes]
+    workers = workers or defaultWorkers()
+    if workers == 1 or len(jobs) < 2:
+        for objectName, runs in jobs:
+            _compute(objectName, runs, profiler, parameters)
+    else:
+        with ThreadPoolExecutor(min(workers, len(jobs))) as pool:
+            for _ in pool.map(lambda job: _compute(job[0], job[1], profiler, parameters), jobs):
+                pass
+    for objectName, runs in jobs:
+        for run in runs:
+            if run.key is not None and not run.hit:
+                cache.put(run.key, run.indices)
+            if run.keepValues:
+                metrics.record(run.command, objectName, run.uvSet, run.values)
+            diagnostics[run.command].extend(
+                mcrs.componentResults(objectName, mcs.kernels[run.command][1], run.indices, run.uvSet))
+    return diagnostics
@@ -0,0 +1,188 @@
+from array import array
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_results as mcrs
+
+# Component checks that can share a single walk over a mesh. Every predicate
+# receives the iterator positioned on the current component and returns True
+# when that component fails the check. Thresholds are the registry defaults.
+
+_maxArea = mcl.parameters('zeroAreaFaces')['maxArea']
+_maxLength = mcl.parameters('zeroLengthEdges')['maxLength']
+_maxValence = mcl.parameters('poles')['maxValence']
+
+
+def _crossBorder(faceIt):
+    U, V = set(), set()
+    try:
+        Us, Vs = faceIt.getUVs()
+    except RuntimeError:
+        # A face without UVs, same as the standalone check.
+        cmds.warning("Face " + str(faceIt.index()) + " has no UVs")
+        return False
+    for i in range(len(Us)):
+        uAdd = int(Us[i]) if Us[i] > 0 else int(Us[i]) - 1
+        vAdd = int(Vs[i]) if Vs[i] > 0 else int(Vs[i]) - 1
+        U.add(uAdd)
+        V.add(vAdd)
+    return len(U) > 1 or len(V) > 1
+
+
+faceChecks = {
+    "triangles": lambda faceIt: faceIt.polygonVertexCount() == 3,
+    "ngons": lambda faceIt: faceIt.polygonVertexCount() > 4,
+    "lamina": lambda faceIt: faceIt.isLamina() is True,
+    "zeroAreaFaces": lambda faceIt: faceIt.getArea() <= _maxArea,
+    "starlike": lambda faceIt: faceIt.isStarlike() is False,
+    "missingUVs": lambda faceIt: faceIt.hasUVs() is False,
+    "crossBorder": _crossBorder,
+}
+
+edgeChecks = {
+    "hardEdges": lambda edgeIt: edgeIt.isSmooth is False and edgeIt.onBoundary() is False,
+    "openEdges": lambda edgeIt: edgeIt.numConnectedFaces() < 2,
+    "noneManifoldEdges": lambda edgeIt: edgeIt.numConnectedFaces() > 2,
+    "zeroLengthEdges": lambda edgeIt: edgeIt.length() <= _maxLength,
+}
+
+vertexChecks = {
+    "poles": lambda vertexIt: vertexIt.numConnectedEdges() > _maxValence,
+}
+
+fusedChecks = set(faceChecks) | set(edgeChecks) | set(vertexChecks)
+
+
+def _walk(iterator, tests, failures, limit=None):
+    # Walks to the end, or for limit components when given.
+    walked = 0
+    while not iterator.isDone() and walked != limit:
+        walked += 1
+        index = iterator.index()
+        for command, predicate in tests:
+            if predicate(iterator):
+                failures[command].append(index)
+        iterator.next()
+
+
+def fuseMesh(dagPath, commands):
+    # Failing component indices per command for a single mesh.
+    failures = {command: [] for command in commands if command in fusedChecks}
+    faceTests = [(name, faceChecks[name]) for name in commands if name in faceChecks]
+    edgeTests = [(name, edgeChecks[name]) for name in commands if name in edgeChecks]
+    vertexTests = [(name, vertexChecks[name]) for name in commands if name in vertexChecks]
+    if faceTests:
+        _walk(om.MItMeshPolygon(dagPath), faceTests, failures)
+    if edgeTests:
+        _walk(om.MItMeshEdge(dagPath), edgeTests, failures)
+    if vertexTests:
+        _walk(om.MItMeshVertex(dagPath), vertexTests, failures)
+    return failures
+
+
+def streamChunkSize(commands, memoryLimit):
+    # Components per chunk so the buffered failures fit memoryLimit even if
+    # every component fails every check of the walk, at about 36 bytes for
+    # each int in a list.
+    checks = max(1, len([command for command in commands if command in fusedChecks]))
+    return max(1, memoryLimit // (36 * checks))
+
+
+def streamMesh(dagPath, commands, spill):
+    # Spill blocks per command for a single mesh. Components are walked a
+    # chunk at a time and each chunk's failures are written to the spill
+    # before the next one starts, so memory doesn't grow with the mesh.
+    blocks = {command: [] for command in commands if command in fusedChecks}
+    chunkSize = streamChunkSize(commands, spill.memoryLimit)
+    for checks, iteratorType in ((faceChecks, om.MItMeshPolygon), (edgeChecks, om.MItMeshEdge),
+                                 (vertexChecks, om.MItMeshVertex)):
+        tests = [(name, checks[name]) for name in commands if name in checks]
+        if not tests:
+            continue
+        iterator = iteratorType(dagPath)
+        while not iterator.isDone():
+            failures = {name: [] for name, _ in tests}
+            _walk(iterator, tests, failures, chunkSize)
+            for name, indices in failures.items():
+                if indices:
+                    blocks[name].append(spill.write(array('i', indices)))
+    return blocks
+
+
+def componentType(command):
+    if command in faceChecks:
+        return "f"
+    if command in edgeChecks:
+        return "e"
+    return "vtx"
+
+
+def walkName(commands):
+    # Profiler event name for a fused walk, which one check can't own alone.
+    return "fused: " + ", ".join(command for command in commands if command in fusedChecks)
+
+
+def meshComponentCount(fnMesh, component):
+    if component == "f":
+        return fnMesh.numPolygons
+    if component == "e":
+        return fnMesh.numEdges
+    if component == "vtx":
+        return fnMesh.numVertices
+    return fnMesh.numUVs()
+
+
+def selectionComponentCount(SLMesh, component):
+    count = 0
+    if SLMesh.isEmpty():
+        return count
+    selIt = om.MItSelectionList(SLMesh)
+    while not selIt.isDone():
+        count += meshComponentCount(om.MFnMesh(selIt.getDagPath()), component)
+        selIt.next()
+    return count
+
+
+def walkCounts(fnMesh, commands, failures):
+    walked = {componentType(command) for command in commands if command in fusedChecks}
+    components = sum(meshComponentCount(fnMesh, component) for component in walked)
+    return {'components': components, 'results': sum(len(indices) for indices in failures.values())}
+
+
+def runFused(commands, SLMesh, profiler=None):
+    diagnostics = {command: [] for command in commands if command in fusedChecks}
+    if SLMesh.isEmpty():
+        return diagnostics
+    selIt = om.MItSelectionList(SLMesh)
+    while not selIt.isDone():
+        dagPath = selIt.getDagPath()
+        objectName = dagPath.partialPathName()
+        with mcp.measure(profiler, walkName(commands), objectName) as event:
+            failures = fuseMesh(dagPath, commands)
+            event.update(walkCounts(om.MFnMesh(dagPath), commands, failures))
+        for command, indices in failures.items():
+            diagnostics[command].extend(mcrs.componentResults(objectName, componentType(command), indices))
+        selIt.next()
+    return diagnostics
+
+
+def runStreaming(commands, SLMesh, spill, profiler=None):
+    # runFused in bounded memory: results are SpilledResults reading their
+    # indices back from spill.
+    diagnostics = {command: [] for command in commands if command in fusedChecks}
+    if SLMesh.isEmpty():
+        return diagnostics
+    selIt = om.MItSelectionList(SLMesh)
+    while not selIt.isDone():
+        dagPath = selIt.getDagPath()
+        objectName = dagPath.partialPathName()
+        with mcp.measure(profiler, walkName(commands), objectName) as event:
+            blocks = streamMesh(dagPath, commands, spill)
+            event.update(walkCounts(om.MFnMesh(dagPath), commands, {}))
+            event['results'] = sum(count for meshBlocks in blocks.values() for _, _, count in meshBlocks)
+        for command, meshBlocks in blocks.items():
+            if meshBlocks:
+                diagnostics[command].append(mcrs.SpilledResult(objectName, componentType(command), spill, meshBlocks))
+        selIt.next()
+    return diagnostics
@@ -0,0 +1,282 @@
+import argparse
+import json
+import sys
+import modelChecker.modelChecker_archive as mcar
+import modelChecker.modelChecker_cache as mcca
+import modelChecker.modelChecker_executor as mcex
+import modelChecker.modelChecker_instancing as mcin
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_scene as mcsc
+import modelChecker.modelChecker_scheduler as mcsch
+import modelChecker.modelChecker_snapshot as mcs
+import modelChecker.modelChecker_spatial as mcsp
+
+# Maya-free implementation of every check in mcCommandsList. Checks take the
+# same (nodes, ...) arguments as modelChecker_commands, with a Scene from
+# modelChecker_scene in place of the mesh selection list, and return the same
+# node and component names.
+
+
+def trailingNumbers(nodes, _):
+    trailingNumbers = []
+    for node in nodes:
+        if node[-1].isdigit():
+            trailingNumbers.append(node)
+    return trailingNumbers
+
+
+def duplicatedNames(nodes, _):
+    duplicatedNames = []
+    for node in nodes:
+        if '|' in node:
+            duplicatedNames.append(node)
+    return duplicatedNames
+
+
+def namespaces(nodes, _):
+    namespaces = []
+    for node in nodes:
+        if ':' in node:
+            namespaces.append(node)
+    return namespaces
+
+
+def shapeNames(nodes, scene):
+    shapeNames = []
+    for node in nodes:
+        shapes = scene.transform(node).shapes
+        if shapes:
+            shapename = node.split('|')[-1] + "Shape"
+            if scene.name(shapes[0].path) != shapename:
+                shapeNames.append(node)
+    return shapeNames
+
+
+def layers(nodes, scene):
+    layers = []
+    for node in nodes:
+        if scene.transform(node).layers:
+            layers.append(node)
+    return layers
+
+
+def history(nodes, scene):
+    history = []
+    for node in nodes:
+        shapes = scene.transform(node).shapes
+        if shapes and shapes[0].nodeType == 'mesh' and shapes[0].historySize > 1:
+            history.append(node)
+    return history
+
+
+def shaders(nodes, scene):
+    shaders = []
+    for node in nodes:
+        shapes = scene.transform(node).shapes
+        if shapes and shapes[0].nodeType == 'mesh' and shapes[0].shadingEngines:
+            if shapes[0].shadingEngines[0] != 'initialShadingGroup':
+                shaders.append(node)
+    return shaders
+
+
+def unfrozenTransforms(nodes, scene):
+    unfrozenTransforms = []
+    for node in nodes:
+        transform = scene.transform(node)
+        if transform.translation != [0.0, 0.0, 0.0] or transform.rotation != [0.0, 0.0, 0.0] \
+                or transform.scale != [1.0, 1.0, 1.0]:
+            unfrozenTransforms.append(node)
+    return unfrozenTransforms
+
+
+def uncenteredPivots(nodes, scene):
+    uncenteredPivots = []
+    for node in nodes:
+        if scene.transform(node).rotatePivot != [0, 0, 0]:
+            uncenteredPivots.append(node)
+    return uncenteredPivots
+
+
+def parentGeometry(nodes, scene):
+    parentGeometry = []
+    for node in nodes:
+        parent = scene.transform(node).parent
+        if parent is not None:
+            for shape in parent.shapes:
+                if shape.nodeType == 'mesh':
+                    parentGeometry.append(node)
+    return parentGeometry
+
+
+def emptyGroups(nodes, scene):
+    emptyGroups = []
+    for node in nodes:
+        transform = scene.transform(node)
+        if not transform.children and not transform.shapes:
+            emptyGroups.append(node)
+    return emptyGroups
+
+
+def _componentCheck(command):
+    def check(nodes, scene, cache=None, profiler=None, workers=None, parameters=None, metrics=None):
+        results = mcex.runKernels([command], scene.meshes(nodes), cache, profiler, workers, parameters, metrics)
+        return results[command]
+
+    check.__name__ = command
+    return check
+
+
+triangles = _componentCheck('triangles')
+ngons = _componentCheck('ngons')
+openEdges = _componentCheck('openEdges')
+poles = _componentCheck('poles')
+hardEdges = _componentCheck('hardEdges')
+lamina = _componentCheck('lamina')
+zeroAreaFaces = _componentCheck('zeroAreaFaces')
+zeroLengthEdges = _componentCheck('zeroLengthEdges')
+noneManifoldEdges = _componentCheck('noneManifoldEdges')
+nonManifoldVertices = _componentCheck('nonManifoldVertices')
+inconsistentWinding = _componentCheck('inconsistentWinding')
+starlike = _componentCheck('starlike')
+selfPenetratingUVs = _componentCheck('selfPenetratingUVs')
+missingUVs = _componentCheck('missingUVs')
+uvRange = _componentCheck('uvRange')
+crossBorder = _componentCheck('crossBorder')
+onBorder = _componentCheck('onBorder')
+
+
+def udimOverlaps(nodes, scene):
+    meshes = scene.meshes(nodes)
+    udimOverlaps = []
+    overlaps = mcs.udimOverlaps([mesh for _, mesh in meshes])
+    for (objectName, _), indices in zip(meshes, overlaps):
+        udimOverlaps.extend(mcrs.componentResults(objectName, 'f', indices))
+    return udimOverlaps
+
+
+def _worldMeshes(nodes, scene):
+    meshes = scene.meshes(nodes)
+    return meshes, [scene.transform(objectName).matrix() for objectName, _ in meshes]
+
+
+def duplicatedMeshes(nodes, scene, tolerance=0.0001):
+    meshes, matrices = _worldMeshes(nodes, scene)
+    duplicates = mcsp.duplicatedMeshes([mesh for _, mesh in meshes], matrices, tolerance)
+    return [meshes[meshId][0] for meshId in duplicates]
+
+
+def coincidentFaces(nodes, scene, tolerance=0.0001):
+    meshes, matrices = _worldMeshes(nodes, scene)
+    coincidentFaces = []
+    overlaps = mcsp.coincidentFaces([mesh for _, mesh in meshes], matrices, tolerance)
+    for (objectName, _), indices in zip(meshes, overlaps):
+        coincidentFaces.extend(mcrs.componentResults(objectName, 'f', indices))
+    return coincidentFaces
+
+
+def intersectingFaces(nodes, scene):
+    meshes, matrices = _worldMeshes(nodes, scene)
+    intersectingFaces = []
+    intersections = mcsp.intersectingFaces([mesh for _, mesh in meshes], matrices)
+    for (objectName, _), indices in zip(meshes, intersections):
+        intersectingFaces.extend(mcrs.componentResults(objectName, 'f', indices))
+    return intersectingFaces
+
+
+def instancingCandidates(nodes, scene):
+    meshes = scene.meshes(nodes)
+    groups = mcin.instancingGroups([mesh for _, mesh in meshes])
+    return [meshes[meshId][0] for meshId in mcin.copies(groups)]
+
+
+def instancingSection(nodes, scene):
+    meshes = scene.meshes(nodes)
+    groups = mcin.instancingGroups([mesh for _, mesh in meshes])
+    return mcin.section(groups, [objectName for objectName, _ in meshes])
+
+
+def run(path, commands=None, nodes=None, cache=None, profiler=None, gate=False, workers=None, parameters=None,
+        metrics=None):
+    return runScene(mcsc.load(path), commands, nodes, cache, profiler, gate, workers, parameters, metrics)
+
+
+def runScene(scene, commands=None, nodes=None, cache=None, profiler=None, gate=False, workers=None,
+             parameters=None, metrics=None):
+    # Checks run cheapest first. A gate run stops at the first failing check
+    # and leaves the checks it skipped out of the diagnostics. parameters
+    # maps a check to overrides of its registry parameters; a MetricStore in
+    # metrics keeps the values of the threshold checks.
+    if nodes is None:
+        nodes = scene.allNodes()
+    commands = commands or list(mcl.mcCommandsList)
+    diagnostics, _ = mcsch.schedule(
+        commands, lambda batch: _runChecks(batch, nodes, scene, cache, profiler, workers, parameters, metrics),
+        gate)
+    return diagnostics
+
+
+def _runChecks(commands, nodes, scene, cache, profiler, workers=None, parameters=None, metrics=None):
+    # The component checks of a batch share one pass over the meshes.
+    parameters = parameters or {}
+    kernelResults = mcex.runKernels(commands, scene.meshes(nodes), cache, profiler, workers, parameters, metrics)
+    diagnostics = {}
+    for command in commands:
+        if command in kernelResults:
+            diagnostics[command] = kernelResults[command]
+            continue
+        with mcp.measure(profiler, command) as event:
+            diagnostics[command] = globals()[command](nodes, scene, **parameters.get(command, {}))
+            event['meshes'] = len(scene.meshes(nodes)) if command in mcsp.crossMeshChecks else 0
+            event['components'] = len(nodes)
+            event['results'] = mcrs.count(diagnostics[command])
+    return diagnostics
+
+
+def exportDiagnostics(diagnostics):
+    # JSON friendly diagnostics with component runs written as ranges.
+    return {command: mcrs.names(errors, compressed=True) for command, errors in diagnostics.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run modelChecker checks without Maya.")
+    parser.add_argument('file', help="scene file (.json or .obj)")
+    parser.add_argument('checks', nargs='*', help="check names, defaults to every check")
+    parser.add_argument('--cache', help="result cache database to reuse results across runs")
+    parser.add_argument('--profile', help="write per check and per mesh timings to this JSON file")
+    parser.add_argument('--trace', action='store_true', help="write the profile in Chrome trace format")
+    parser.add_argument('--memory', action='store_true', help="track allocated memory in the profile")
+    parser.add_argument('--gate', action='store_true', help="stop at the first failing check")
+    parser.add_argument('--workers', type=int, default=None, help="threads for the mesh checks, defaults to the CPU count")
+    parser.add_argument('--archive', help="also write the results to this diagnostics archive")
+    parser.add_argument('--parameter', action='append', default=[],
+                        help="check parameter as check.name=value, e.g. poles.maxValence=6")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.checks if name not in mcl.mcCommandsList]
+    if unknown:
+        parser.error("unknown checks: " + ", ".join(unknown))
+    try:
+        parameters = mcl.parseParameters(args.parameter)
+    except ValueError as error:
+        parser.error(str(error))
+    cache = mcca.ResultCache(args.cache) if args.cache else None
+    profiler = mcp.Profiler(args.memory) if args.profile else None
+    if profiler:
+        profiler.start()
+    diagnostics = run(args.file, args.checks, cache=cache, profiler=profiler, gate=args.gate, workers=args.workers,
+                      parameters=parameters)
+    if profiler:
+        profiler.stop()
+        profiler.export(args.profile, chrome=args.trace)
+    if cache:
+        sys.stderr.write(json.dumps(cache.stats()) + "\n")
+    if args.archive:
+        mcar.write(args.archive, diagnostics, {'file': args.file})
+    json.dump(exportDiagnostics(diagnostics), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if any(diagnostics.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import maya.api.OpenMaya as om
+
+# Transform hierarchy of the open scene, read in one MItDag pass. Node
+# collection then works from dicts: parent to children and transform to
+# shapes are single lookups, mesh membership is known up front and node sets
+# are deduplicated on full paths, so nested selections don't repeat nodes.
+# Nodes go in and come out under the names cmds.ls reports (the shortest
+# unique path), and full paths are accepted wherever a name is.
+
+defaultCameras = {'front', 'persp', 'top', 'side'}
+
+
+class HierarchyIndex(object):
+
+    def __init__(self):
+        self.paths = []
+        self.names = {}
+        self.fullPaths = {}
+        self.children = {}
+        self.shapes = {}
+        self.meshPaths = {}
+
+    def addTransform(self, dagPath):
+        path = dagPath.fullPathName()
+        name = dagPath.partialPathName()
+        self.paths.append(path)
+        self.names[path] = name
+        self.fullPaths[name] = path
+        self.children[path] = []
+        self.shapes[path] = []
+        parent = path.rsplit('|', 1)[0]
+        if parent in self.children:
+            self.children[parent].append(path)
+
+    def addShape(self, dagPath):
+        parent = dagPath.fullPathName().rsplit('|', 1)[0]
+        if parent not in self.shapes:
+            return
+        self.shapes[parent].append(dagPath.partialPathName())
+        if dagPath.hasFn(om.MFn.kMesh) and parent not in self.meshPaths:
+            # The transform's path, the way SLMesh has always held meshes.
+            dagPath.pop()
+            self.meshPaths[parent] = dagPath
+
+    def path(self, node):
+        if node in self.names:
+            return node
+        return self.fullPaths.get(node)
+
+    def exists(self, node):
+        return self.path(node) is not None
+
+    def hasMesh(self, node):
+        return self.path(node) in self.meshPaths
+
+    def allNodes(self):
+        return [self.names[path] for path in self.paths if self.names[path] not in defaultCameras]
+
+    def descendants(self, node):
+        # Transforms below node, depth first.
+        result = []
+        stack = list(reversed(self.children[self.path(node)]))
+        while stack:
+            path = stack.pop()
+            result.append(path)
+            stack.extend(reversed(self.children[path]))
+        return [self.names[path] for path in result]
+
+    def expand(self, nodes):
+        # The nodes and every transform below them, each once, skipping
+        # names that don't exist.
+        seen = set()
+        result = []
+        for node in nodes:
+            if not self.exists(node):
+                continue
+            for name in [self.names[self.path(node)]] + self.descendants(node):
+                path = self.fullPaths[name]
+                if path not in seen:
+                    seen.add(path)
+                    result.append(name)
+        return result
+
+    def meshNodes(self, nodes):
+        return [node for node in nodes if self.hasMesh(node)]
+
+    def meshSelection(self, nodes):
+        SLMesh = om.MSelectionList()
+        for node in nodes:
+            dagPath = self.meshPaths.get(self.path(node))
+            if dagPath is not None:
+                SLMesh.add(dagPath)
+        return SLMesh
+
+
+def build():
+    index = HierarchyIndex()
+    dagIt = om.MItDag(om.MItDag.kDepthFirst, om.MFn.kDagNode)
+    while not dagIt.isDone():
+        dagPath = dagIt.getPath()
+        if dagPath.hasFn(om.MFn.kTransform):
+            index.addTransform(dagPath)
+        elif dagPath.length() > 1:
+            index.addShape(dagPath)
+        dagIt.next()
+    return index
@@ -0,0 +1,154 @@
+import hashlib
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import modelChecker.modelChecker_snapshot as mcs
+import modelChecker.modelChecker_numpy as mcn
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_spatial as mcsp
+
+# Incremental re-validation. Results are kept per node and check; Maya
+# callbacks mark nodes dirty when they or their shapes change, and a dirty
+# node is only re-checked when its signature (mesh content, world matrix and
+# pivot) actually differs from the last run. Renames and hierarchy changes
+# can affect other nodes' results (duplicated names, parent geometry, empty
+# groups), so they invalidate everything. Checks comparing meshes with each
+# other depend on every node checked, so they are not kept per node and
+# always run on the whole node set.
+
+
+def nodeName(mObject):
+    # Partial name of the transform owning a DAG node, None for DG nodes.
+    if not mObject.hasFn(om.MFn.kDagNode):
+        return None
+    dagPath = om.MDagPath.getAPathTo(mObject)
+    if not mObject.hasFn(om.MFn.kTransform):
+        dagPath.pop()
+    return dagPath.partialPathName()
+
+
+def nodeSignature(node):
+    digest = hashlib.sha1()
+    digest.update(str(cmds.xform(node, q=True, worldSpace=True, matrix=True)).encode())
+    digest.update(str(cmds.xform(node, q=True, worldSpace=True, rotatePivot=True)).encode())
+    SLNode = om.MSelectionList()
+    SLNode.add(node)
+    dagPath = SLNode.getDagPath(0)
+    if dagPath.numberOfShapesDirectlyBelow():
+        dagPath.extendToShape()
+        if dagPath.hasFn(om.MFn.kMesh):
+            snapshot = mcs.MeshSnapshot(node, mcn.MayaMeshLoader(dagPath))
+            digest.update(mcs.contentHash(snapshot).encode())
+            for _, uvSetSnapshot in snapshot.uvSetSnapshots()[1:]:
+                digest.update(mcs.contentHash(uvSetSnapshot, mcs.uvFields[:4]).encode())
+    return digest.hexdigest()
+
+
+def cachedCommands(commands):
+    return [command for command in commands if command not in mcsp.crossMeshChecks]
+
+
+class IncrementalCache(object):
+
+    def __init__(self):
+        self.results = {}
+        self.signatures = {}
+        self.dirty = set()
+        self.tracked = {}
+        self.globalCallbacks = []
+        self.invalidated = False
+
+    def _dirtyCallback(self, mObject, *args):
+        name = nodeName(mObject)
+        if name:
+            self.dirty.add(name)
+
+    def _connectionCallback(self, srcPlug, destPlug, made, *args):
+        # Layer, shading and history connections do not change the signature.
+        for plug in (srcPlug, destPlug):
+            name = nodeName(plug.node())
+            if name in self.results:
+                self.results.pop(name)
+
+    def _invalidateCallback(self, *args):
+        self.invalidated = True
+
+    def start(self):
+        if self.globalCallbacks:
+            return
+        self.globalCallbacks = [
+            om.MDagMessage.addAllDagChangesCallback(self._invalidateCallback),
+            om.MNodeMessage.addNameChangedCallback(om.MObject(), self._invalidateCallback),
+            om.MDGMessage.addConnectionCallback(self._connectionCallback),
+        ]
+
+    def track(self, node):
+        if node in self.tracked:
+            return
+        SLNode = om.MSelectionList()
+        SLNode.add(node)
+        dagPath = SLNode.getDagPath(0)
+        callbacks = [om.MNodeMessage.addNodeDirtyCallback(dagPath.node(), self._dirtyCallback)]
+        for index in range(dagPath.numberOfShapesDirectlyBelow()):
+            shapePath = om.MDagPath(dagPath)
+            shapePath.extendToShape(index)
+            callbacks.append(om.MNodeMessage.addNodeDirtyCallback(shapePath.node(), self._dirtyCallback))
+        self.tracked[node] = callbacks
+
+    def clear(self):
+        for callbacks in self.tracked.values():
+            om.MMessage.removeCallbacks(callbacks)
+        if self.globalCallbacks:
+            om.MMessage.removeCallbacks(self.globalCallbacks)
+        self.results = {}
+        self.signatures = {}
+        self.dirty = set()
+        self.tracked = {}
+        self.globalCallbacks = []
+        self.invalidated = False
+
+    def staleNodes(self, commands, nodes):
+        if self.invalidated:
+            self.clear()
+        stale = []
+        for node in nodes:
+            cached = self.results.get(node)
+            if cached is None or any(command not in cached for command in commands):
+                stale.append(node)
+            elif node in self.dirty:
+                if nodeSignature(node) != self.signatures.get(node):
+                    stale.append(node)
+                else:
+                    self.dirty.discard(node)
+        return stale
+
+    def store(self, commands, nodes, diagnostics):
+        perNode = {node: {command: [] for command in commands} for node in nodes}
+        for command in commands:
+            for error in diagnostics[command]:
+                name = mcrs.objectName(error)
+                if name in perNode:
+                    perNode[name][command].append(error)
+        for node in nodes:
+            self.results.setdefault(node, {}).update(perNode[node])
+            self.signatures[node] = nodeSignature(node)
+            self.dirty.discard(node)
+            self.track(node)
+        self.start()
+
+    def diagnostics(self, commands, nodes):
+        diagnostics = {command: [] for command in commands}
+        for node in nodes:
+            for command in commands:
+                diagnostics[command].extend(self.results[node][command])
+        return diagnostics
+
+    def run(self, commands, nodes, commandToRun):
+        cached = cachedCommands(commands)
+        stale = self.staleNodes(cached, nodes)
+        if stale and cached:
+            self.store(cached, stale, commandToRun(cached, stale))
+        diagnostics = self.diagnostics(cached, nodes)
+        crossCommands = [command for command in commands if command not in diagnostics]
+        if crossCommands:
+            diagnostics.update(commandToRun(crossCommands, nodes))
+        return {command: diagnostics[command] for command in commands}
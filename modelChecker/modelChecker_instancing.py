@@ -0,0 +1,92 @@
+import hashlib
+import numpy as np
+import modelChecker.modelChecker_snapshot as mcs
+
+# Meshes that could be instances of one another. Every mesh gets a
+# fingerprint that doesn't change when the mesh is moved, rotated, uniformly
+# scaled or has its vertices renumbered: its vertex, face and UV counts, a
+# coarse profile of its sorted edge lengths relative to the mean edge, and
+# a hash of its rounded UV layout. Meshes are grouped by putting the
+# fingerprints in a dict, so no pair of meshes is ever compared directly,
+# and the rounding lets meshes that differ by a small deformation land in
+# the same group.
+
+quantiles = np.linspace(0.0, 1.0, 17)
+
+
+def edgeLengthProfile(snapshot, precision=0.01):
+    # Sorted side lengths over the mean length, sampled at fixed quantiles
+    # and rounded. Face sides are used instead of edges so no edge data has
+    # to be extracted; inner edges are simply counted twice.
+    _, start, end = mcs.faceCorners(snapshot.faceCounts, snapshot.faceOffsets)
+    if len(start) == 0:
+        return ()
+    faceVertices = snapshot.faceVertices
+    points = snapshot.points
+    delta = points[faceVertices[start]] - points[faceVertices[end]]
+    lengths = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    mean = lengths.mean()
+    if mean <= 0:
+        return ()
+    profile = np.quantile(lengths / mean, quantiles)
+    return tuple(np.round(profile / precision).astype(np.int64).tolist())
+
+
+def uvLayoutHash(snapshot, precision=0.001):
+    # Digest of the UV coordinates rounded and sorted, so it doesn't depend
+    # on the order UVs are stored in.
+    us, vs = snapshot.us, snapshot.vs
+    rounded = np.stack([np.round(us / precision), np.round(vs / precision)], axis=1).astype(np.int64)
+    rounded = rounded[np.lexsort((rounded[:, 1], rounded[:, 0]))]
+    return hashlib.sha1(rounded.tobytes()).hexdigest()
+
+
+def fingerprint(snapshot):
+    return (
+        len(snapshot.points),
+        len(snapshot.faceCounts),
+        len(snapshot.faceVertices),
+        len(snapshot.us),
+        edgeLengthProfile(snapshot),
+        uvLayoutHash(snapshot),
+    )
+
+
+def meshBytes(snapshot):
+    # Rough size of a mesh shape in Maya: float points, face vertex ids and
+    # normals, UV coordinates and ids, face counts.
+    faceVertexCount = len(snapshot.faceVertices)
+    return (12 * len(snapshot.points) + 4 * len(snapshot.faceCounts) + 20 * faceVertexCount +
+            8 * len(snapshot.us) + 4 * len(snapshot.uvIds))
+
+
+def instancingGroups(snapshots):
+    # [(meshIds, savings)] for every fingerprint shared by several meshes,
+    # largest estimated savings first. The first mesh of a group is the one
+    # the others would become instances of.
+    index = {}
+    for meshId, snapshot in enumerate(snapshots):
+        if len(snapshot.faceCounts):
+            index.setdefault(fingerprint(snapshot), []).append(meshId)
+    groups = []
+    for meshIds in index.values():
+        if len(meshIds) > 1:
+            groups.append((meshIds, (len(meshIds) - 1) * meshBytes(snapshots[meshIds[0]])))
+    return sorted(groups, key=lambda group: -group[1])
+
+
+def copies(groups):
+    # Every mesh but the first of each group, in mesh order.
+    return sorted(meshId for meshIds, _ in groups for meshId in meshIds[1:])
+
+
+def section(groups, names):
+    # Report lines: one per group with its copies and savings, then the total.
+    values = {}
+    for meshIds, savings in groups:
+        values[names[meshIds[0]]] = (f"{len(meshIds) - 1} copies, "
+                                     f"{savings / 1048576.0:.1f} MB estimated savings")
+    if groups:
+        total = sum(savings for _, savings in groups)
+        values["total"] = f"{len(copies(groups))} copies, {total / 1048576.0:.1f} MB estimated savings"
+    return values
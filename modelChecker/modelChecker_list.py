@@ -1,106 +1,256 @@
+# Every check with its report label and category. 'requires' lists the data
+# a check reads beyond the node names: snapshot arrays (faceCounts,
+# faceVertices, points, edgeVertices, smoothEdges, uvCounts, uvIds, us, vs)
+# or scene data (hierarchy, transforms, connections), and a run extracts the
+# union of what its checks require. 'cost' is 'node', 'mesh' or 'expensive'
+# and orders a scheduled run, 'parameters' holds the default thresholds a
+# kernel takes and 'backends' the engines that can run a check, preferred
+# first, when it isn't only the API. UV checks with 'uvSets' run on every UV
+# set of a mesh instead of the current one only.
+
+costs = ['node', 'mesh', 'expensive']
+
 mcCommandsList = {
     "trailingNumbers": {
         'label': 'Trailing Numbers',
         'category': 'naming',
+        'requires': [],
+        'cost': 'node',
     },
     "duplicatedNames": {
         'label': 'Duplicated Names',
         'category': 'naming',
+        'requires': [],
+        'cost': 'node',
     },
     "shapeNames":{
         'label': 'Shape Names',
         'category': 'naming',
+        'requires': ['hierarchy'],
+        'cost': 'node',
     },
     "namespaces": {
         'label': 'Namespaces',
         'category': 'naming',
+        'requires': [],
+        'cost': 'node',
     },
     "layers": {
         'label': 'Layers',
-        'category': 'general',  
+        'category': 'general',
+        'requires': ['connections'],
+        'cost': 'node',
     },
     "history": {
         'label': 'History',
         'category': 'general',
+        'requires': ['hierarchy', 'connections'],
+        'cost': 'node',
     },
     "shaders": {
         'label': 'Shaders',
         'category': 'general',
+        'requires': ['hierarchy', 'connections'],
+        'cost': 'node',
     },
     "unfrozenTransforms": {
         'label': 'Unfrozen Transforms',
         'category': 'general',
+        'requires': ['transforms'],
+        'cost': 'node',
     },
     "uncenteredPivots": {
         'label': 'Uncentered Pivots',
         'category': 'general',
+        'requires': ['transforms'],
+        'cost': 'node',
     },
     "parentGeometry": {
         'label': 'Parent Geometry',
         'category': 'general',
+        'requires': ['hierarchy'],
+        'cost': 'node',
     },
     "emptyGroups": {
         'label': 'Empty Groups',
         'category': 'general',
+        'requires': ['hierarchy'],
+        'cost': 'node',
     },
     "triangles": {
         'label': 'Triangles',
         'category': 'topology',
+        'requires': ['faceCounts'],
+        'cost': 'mesh',
     },
     "ngons": {
         'label': 'Ngons',
         'category': 'topology',
+        'requires': ['faceCounts'],
+        'cost': 'mesh',
     },
     "openEdges": {
         'label': 'Open Edges',
         'category': 'topology',
+        'backends': ['numpy', 'api'],
+        'requires': ['faceCounts', 'faceVertices', 'edgeVertices'],
+        'cost': 'mesh',
     },
     "poles":{
         'label': 'Poles',
         'category': 'topology',
+        'backends': ['numpy', 'api'],
+        'requires': ['edgeVertices', 'points'],
+        'cost': 'mesh',
+        'parameters': {'maxValence': 5},
     },
     "hardEdges": {
         'label': 'Hard Edges',
         'category': 'topology',
+        'backends': ['numpy', 'api'],
+        'requires': ['faceCounts', 'faceVertices', 'edgeVertices', 'smoothEdges'],
+        'cost': 'mesh',
     },
     "lamina": {
         'label': 'Lamina',
-        'category': 'topology',  
+        'category': 'topology',
+        'requires': ['faceCounts', 'faceVertices'],
+        'cost': 'mesh',
     },
     "zeroAreaFaces":{
         'label': 'Zero Area Faces',
         'category': 'topology',
+        'requires': ['faceCounts', 'faceVertices', 'points'],
+        'cost': 'mesh',
+        'parameters': {'maxArea': 0.00000001},
     },
     "zeroLengthEdges":{
         'label': 'Zero Length Edges',
         'category': 'topology',
+        'requires': ['edgeVertices', 'points'],
+        'cost': 'mesh',
+        'parameters': {'maxLength': 0.00000001},
     },
     "noneManifoldEdges":{
         'label': 'None Manifold Edges',
         'category': 'topology',
+        'backends': ['numpy', 'api'],
+        'requires': ['faceCounts', 'faceVertices', 'edgeVertices'],
+        'cost': 'mesh',
+    },
+    "nonManifoldVertices":{
+        'label': 'Non Manifold Vertices',
+        'category': 'topology',
+        'backends': ['numpy'],
+        'requires': ['faceCounts', 'faceVertices', 'edgeVertices'],
+        'cost': 'mesh',
+    },
+    "inconsistentWinding":{
+        'label': 'Inconsistent Winding',
+        'category': 'topology',
+        'backends': ['numpy'],
+        'requires': ['faceCounts', 'faceVertices', 'edgeVertices'],
+        'cost': 'mesh',
     },
     "starlike": {
         'label': 'Starlike',
         'category': 'topology',
+        'requires': ['faceCounts', 'faceVertices', 'points'],
+        'cost': 'mesh',
     },
     "selfPenetratingUVs":{
         'label': 'Self Penetrating UVs',
         'category': 'UVs',
+        'backends': ['numpy', 'api'],
+        'requires': ['uvCounts', 'uvIds', 'us', 'vs'],
+        'cost': 'expensive',
+    },
+    "udimOverlaps":{
+        'label': 'UDIM Overlaps',
+        'category': 'UVs',
+        'backends': ['numpy'],
+        'requires': ['uvCounts', 'uvIds', 'us', 'vs'],
+        'cost': 'expensive',
     },
     "missingUVs":{
         'label': 'Missing UVs',
         'category': 'UVs',
+        'requires': ['uvCounts'],
+        'cost': 'mesh',
     },
     "uvRange":{
         'label': 'UV Range',
         'category': 'UVs',
+        'backends': ['numpy', 'api'],
+        'requires': ['us', 'vs'],
+        'cost': 'mesh',
+        'parameters': {'maxU': 10},
+        'uvSets': True,
     },
     "crossBorder":{
         'label': 'Cross Border',
         'category': 'UVs',
+        'requires': ['uvCounts', 'uvIds', 'us', 'vs'],
+        'cost': 'mesh',
     },
     "onBorder": {
         'label': 'On Border',
-        'category': 'UVs',   
+        'category': 'UVs',
+        'backends': ['numpy', 'api'],
+        'requires': ['us', 'vs'],
+        'cost': 'mesh',
+        'parameters': {'tolerance': 0.00001},
+        'uvSets': True,
+    },
+    "duplicatedMeshes":{
+        'label': 'Duplicated Meshes',
+        'category': 'scene',
+        'backends': ['numpy'],
+        'requires': ['faceCounts', 'faceVertices', 'points', 'transforms'],
+        'cost': 'expensive',
+        'parameters': {'tolerance': 0.0001},
+    },
+    "coincidentFaces":{
+        'label': 'Coincident Faces',
+        'category': 'scene',
+        'backends': ['numpy'],
+        'requires': ['faceCounts', 'faceVertices', 'points', 'transforms'],
+        'cost': 'expensive',
+        'parameters': {'tolerance': 0.0001},
+    },
+    "intersectingFaces":{
+        'label': 'Intersecting Faces',
+        'category': 'scene',
+        'backends': ['numpy'],
+        'requires': ['faceCounts', 'faceVertices', 'points', 'transforms'],
+        'cost': 'expensive',
+    },
+    "instancingCandidates":{
+        'label': 'Instancing Candidates',
+        'category': 'scene',
+        'backends': ['numpy'],
+        'requires': ['faceCounts', 'faceVertices', 'points', 'uvIds', 'us', 'vs'],
+        'cost': 'expensive',
     }
 }
+
+
+def parameters(command, overrides=None):
+    # The check's parameters, overrides replacing the registry defaults.
+    return dict(mcCommandsList[command].get('parameters', {}), **(overrides or {}))
+
+
+def parseParameters(values):
+    # {command: {name: value}} from "command.name=value" strings, as given on
+    # a command line.
+    result = {}
+    for value in values:
+        key, _, number = value.partition('=')
+        command, _, name = key.partition('.')
+        if name not in mcCommandsList.get(command, {}).get('parameters', {}):
+            raise ValueError(f"unknown parameter '{key}'")
+        try:
+            result.setdefault(command, {})[name] = float(number)
+        except ValueError:
+            raise ValueError(f"parameter '{key}' needs a number, got '{number}'")
+    return result
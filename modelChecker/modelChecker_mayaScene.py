@@ -0,0 +1,93 @@
+import math
+import maya.api.OpenMaya as om
+import modelChecker.modelChecker_scene as mcsc
+import modelChecker.modelChecker_scheduler as mcsch
+
+# Builds a modelChecker_scene.Scene of the checked nodes from the open Maya
+# scene, reading only the data the run's scene checks require: 'hierarchy'
+# adds the nodes' shapes, parents and children, 'transforms' their world
+# transform values and pivots, 'connections' display layers, shadingEngines
+# and history. The transform level checks then run from
+# modelChecker_headless against these tables instead of issuing per-node
+# cmds queries.
+
+sceneChecks = {
+    'shapeNames',
+    'layers',
+    'history',
+    'shaders',
+    'unfrozenTransforms',
+    'uncenteredPivots',
+    'parentGeometry',
+    'emptyGroups',
+}
+
+
+def _sources(node, attribute, mfnType):
+    plug = om.MFnDependencyNode(node).findPlug(attribute, False)
+    names = []
+    for source in plug.connectedTo(True, False):
+        sourceNode = source.node()
+        if sourceNode.hasFn(mfnType):
+            names.append(om.MFnDependencyNode(sourceNode).name())
+    return names
+
+
+def _transformValues(dagPath):
+    matrix = om.MTransformationMatrix(dagPath.inclusiveMatrix())
+    translation = matrix.translation(om.MSpace.kWorld)
+    rotation = matrix.rotation()
+    pivot = om.MFnTransform(dagPath).rotatePivot(om.MSpace.kWorld)
+    return {
+        'translation': [translation.x, translation.y, translation.z],
+        'rotation': [math.degrees(rotation.x), math.degrees(rotation.y), math.degrees(rotation.z)],
+        'scale': matrix.scale(om.MSpace.kWorld),
+        'rotatePivot': [pivot.x, pivot.y, pivot.z],
+    }
+
+
+def _shapeValues(dagPath, connections):
+    fnNode = om.MFnDagNode(dagPath)
+    values = {'nodeType': fnNode.typeName}
+    if connections and dagPath.hasFn(om.MFn.kMesh):
+        fnMesh = om.MFnMesh(dagPath)
+        shaders, _ = fnMesh.getConnectedShaders(dagPath.instanceNumber())
+        values['shadingEngines'] = [om.MFnDependencyNode(shader).name() for shader in shaders]
+        # Construction history or deformers feed the inMesh plug.
+        inMesh = fnNode.findPlug('inMesh', False)
+        values['historySize'] = 2 if inMesh.isDestination else 1
+    return values
+
+
+def sceneFromMaya(nodes, index, data=mcsch.sceneData):
+    # index is the run's HierarchyIndex. Values are only read for the nodes
+    # themselves; the parents and children 'hierarchy' adds only link them.
+    scene = mcsc.Scene()
+    names = {}
+    checked = {index.path(node) for node in nodes if index.exists(node)}
+    paths = set(checked)
+    if 'hierarchy' in data:
+        for path in checked:
+            parent = path.rsplit('|', 1)[0]
+            if parent in index.children:
+                paths.add(parent)
+            paths.update(index.children[path])
+    for path in sorted(paths, key=lambda path: path.count('|')):
+        dagPath = om.MSelectionList().add(path).getDagPath(0)
+        values = {}
+        if path in checked and 'transforms' in data:
+            values.update(_transformValues(dagPath))
+        if path in checked and 'connections' in data:
+            values['layers'] = _sources(dagPath.node(), 'drawOverride', om.MFn.kDisplayLayer)
+        scene.addTransform(path, **values)
+        names[path] = index.names[path]
+        if 'hierarchy' not in data:
+            continue
+        for shapeIndex in range(dagPath.numberOfShapesDirectlyBelow()):
+            shapePath = om.MDagPath(dagPath)
+            shapePath.extendToShape(shapeIndex)
+            shape = shapePath.fullPathName()
+            scene.addShape(shape, **_shapeValues(shapePath, path in checked and 'connections' in data))
+            names[shape] = shapePath.partialPathName()
+    scene.setNames(names)
+    return scene
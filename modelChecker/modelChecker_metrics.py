@@ -0,0 +1,61 @@
+import numpy as np
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_snapshot as mcs
+
+# Per component values of the threshold checks (face areas, edge lengths,
+# vertex valences, UV coordinates), kept from a run so a changed threshold
+# re-filters them instead of reading the scene again. Values are stored per
+# check and (mesh, UV set); a later run of a mesh replaces its values, so an
+# incremental run keeps the ones of meshes it skipped.
+
+metricChecks = list(mcs.metricKernels)
+
+
+class MetricStore(object):
+
+    def __init__(self):
+        self.values = {}
+
+    def clear(self, commands=None):
+        for command in list(self.values) if commands is None else commands:
+            self.values.pop(command, None)
+
+    def record(self, command, objectName, uvSet, values):
+        self.values.setdefault(command, {})[(objectName, uvSet)] = values
+
+    def covers(self, command):
+        return command in self.values
+
+    def select(self, command, parameters=None):
+        # Results of command for parameters, in the same form a run returns.
+        _, component = mcs.kernels[command]
+        parameters = mcl.parameters(command, parameters)
+        result = []
+        for (objectName, uvSet), values in self.values.get(command, {}).items():
+            result.extend(mcrs.componentResults(
+                objectName, component, mcs.selectMetric(command, values, parameters), uvSet))
+        return result
+
+    def allValues(self, command):
+        meshValues = list(self.values.get(command, {}).values())
+        if not meshValues:
+            return np.zeros(0)
+        return np.concatenate(meshValues).astype(np.float64)
+
+    def histogram(self, command, bins=40):
+        # (counts, edges) over every value of command. Values spanning many
+        # orders of magnitude, like areas and lengths, get log spaced bins
+        # above the smallest positive value, with zero in the first bin.
+        values = self.allValues(command)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0.0, 1.0, bins + 1)
+        low, high = values.min(), values.max()
+        positive = values[values > 0]
+        if low >= 0 and len(positive) and high / positive.min() > 1000:
+            edges = np.concatenate([[0.0], np.geomspace(positive.min(), high, bins)])
+        else:
+            edges = np.linspace(low, high if high > low else low + 1.0, bins + 1)
+        counts, edges = np.histogram(values, edges)
+        return counts, edges
@@ -0,0 +1,185 @@
+import numpy as np
+import maya.api.OpenMaya as om
+import modelChecker.modelChecker_snapshot as mcs
+import modelChecker.modelChecker_executor as mcex
+import modelChecker.modelChecker_fused as mcf
+import modelChecker.modelChecker_instancing as mcin
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_spatial as mcsp
+
+
+class MayaMeshLoader(object):
+    # UV fields come from uvSet, the current UV set when empty.
+
+    def __init__(self, dagPath, uvSet=''):
+        self.dagPath = dagPath
+        self.mesh = om.MFnMesh(dagPath)
+        self.uvSet = uvSet
+
+    def __call__(self, field):
+        return getattr(self, field)()
+
+    def forUVSet(self, uvSet):
+        return MayaMeshLoader(self.dagPath, uvSet)
+
+    def faceCounts(self):
+        counts, indices = self.mesh.getVertices()
+        return {
+            'faceCounts': np.array(counts, dtype=np.int64),
+            'faceVertices': np.array(indices, dtype=np.int64),
+        }
+
+    faceVertices = faceCounts
+
+    def points(self):
+        return {'points': np.array(self.mesh.getPoints(), dtype=np.float64)[:, :3]}
+
+    def edgeKey(self):
+        return {'edgeKey': np.array([self.mesh.numEdges], dtype=np.int64)}
+
+    def smoothingKey(self):
+        _, normalIds = self.mesh.getNormalIds()
+        return {'smoothingKey': np.array(normalIds, dtype=np.int64)}
+
+    def edgeVertices(self):
+        # The API has no bulk query for edges, so one MItMeshEdge pass fills
+        # both edge fields into arrays sized up front, and only when an edge
+        # check misses the cache.
+        numEdges = self.mesh.numEdges
+        edgeVertices = np.empty((numEdges, 2), dtype=np.int64)
+        smoothEdges = np.empty(numEdges, dtype=bool)
+        edgeIt = om.MItMeshEdge(self.dagPath)
+        while not edgeIt.isDone():
+            index = edgeIt.index()
+            edgeVertices[index] = edgeIt.vertexId(0), edgeIt.vertexId(1)
+            smoothEdges[index] = edgeIt.isSmooth
+            edgeIt.next()
+        return {'edgeVertices': edgeVertices, 'smoothEdges': smoothEdges}
+
+    smoothEdges = edgeVertices
+
+    def worldMatrix(self):
+        return {'worldMatrix': np.array(list(self.dagPath.inclusiveMatrix()), dtype=np.float64).reshape(4, 4)}
+
+    def uvSets(self):
+        current = self.mesh.currentUVSetName()
+        names = [name for name in self.mesh.getUVSetNames() if name != current]
+        return {'uvSets': [current] + names}
+
+    def uvCounts(self):
+        counts, ids = self.mesh.getAssignedUVs(self.uvSet)
+        return {
+            'uvCounts': np.array(counts, dtype=np.int64),
+            'uvIds': np.array(ids, dtype=np.int64),
+        }
+
+    uvIds = uvCounts
+
+    def us(self):
+        # One getUVs call per set; fromiter with a known count fills the
+        # arrays without an intermediate list, which matters at millions of
+        # UVs.
+        us, vs = self.mesh.getUVs(self.uvSet)
+        return {
+            'us': np.fromiter(us, dtype=np.float64, count=len(us)),
+            'vs': np.fromiter(vs, dtype=np.float64, count=len(vs)),
+        }
+
+    vs = us
+
+
+def snapshots(SLMesh):
+    result = []
+    if SLMesh.isEmpty():
+        return result
+    selIt = om.MItSelectionList(SLMesh)
+    while not selIt.isDone():
+        dagPath = selIt.getDagPath()
+        result.append(mcs.MeshSnapshot(dagPath.partialPathName(), MayaMeshLoader(dagPath)))
+        selIt.next()
+    return result
+
+
+def runNumpy(commands, SLMesh, cache=None, profiler=None, meshes=None, workers=None, parameters=None,
+             metrics=None):
+    # meshes: snapshots of SLMesh already built by the caller, to share their
+    # extracted arrays between calls. Kernels run on workers threads once the
+    # arrays are extracted here.
+    meshes = snapshots(SLMesh) if meshes is None else meshes
+    return mcex.runKernels(commands, [(snapshot.name, snapshot) for snapshot in meshes], cache, profiler,
+                           workers, parameters, metrics)
+
+
+def fusedKeyFields(command):
+    # Arrays keying a fused check's results, None when it isn't cached. Keys
+    # only hash arrays the API returns in bulk, with stand-ins for the edge
+    # table, so a hit never reads edges one at a time.
+    return mcs.keyFields.get(command)
+
+
+def runCachedFused(commands, SLMesh, cache, profiler=None, meshes=None):
+    # Cache lookups for API backed checks; only the misses of each mesh share
+    # one fused walk.
+    diagnostics = {command: [] for command in commands if command in mcf.fusedChecks}
+    for snapshot in snapshots(SLMesh) if meshes is None else meshes:
+        keys = {command: cache.key(command, snapshot, fields=fusedKeyFields(command))
+                for command in diagnostics if fusedKeyFields(command) is not None}
+        found = {command: cache.get(keys[command]) if command in keys else None for command in diagnostics}
+        missing = [command for command, indices in found.items() if indices is None]
+        if missing:
+            with mcp.measure(profiler, mcf.walkName(missing), snapshot.name) as event:
+                fused = mcf.fuseMesh(snapshot.loader.dagPath, missing)
+                event.update(mcf.walkCounts(snapshot.loader.mesh, missing, fused))
+            for command, indices in fused.items():
+                found[command] = np.array(indices, dtype=np.int64)
+                if command in keys:
+                    cache.put(keys[command], found[command])
+        for command in diagnostics:
+            diagnostics[command].extend(
+                mcrs.componentResults(snapshot.name, mcf.componentType(command), found[command]))
+    return diagnostics
+
+
+def udimOverlaps(_, SLMesh):
+    meshes = snapshots(SLMesh)
+    udimOverlaps = []
+    for snapshot, indices in zip(meshes, mcs.udimOverlaps(meshes)):
+        udimOverlaps.extend(mcrs.componentResults(snapshot.name, "f", indices))
+    return udimOverlaps
+
+
+def _worldMeshes(SLMesh):
+    meshes = snapshots(SLMesh)
+    return meshes, [snapshot.get('worldMatrix') for snapshot in meshes]
+
+
+def duplicatedMeshes(_, SLMesh, tolerance=0.0001):
+    meshes, matrices = _worldMeshes(SLMesh)
+    return [meshes[meshId].name for meshId in mcsp.duplicatedMeshes(meshes, matrices, tolerance)]
+
+
+def coincidentFaces(_, SLMesh, tolerance=0.0001):
+    meshes, matrices = _worldMeshes(SLMesh)
+    coincidentFaces = []
+    for snapshot, indices in zip(meshes, mcsp.coincidentFaces(meshes, matrices, tolerance)):
+        coincidentFaces.extend(mcrs.componentResults(snapshot.name, "f", indices))
+    return coincidentFaces
+
+
+def intersectingFaces(_, SLMesh):
+    meshes, matrices = _worldMeshes(SLMesh)
+    intersectingFaces = []
+    for snapshot, indices in zip(meshes, mcsp.intersectingFaces(meshes, matrices)):
+        intersectingFaces.extend(mcrs.componentResults(snapshot.name, "f", indices))
+    return intersectingFaces
+
+
+def instancingCandidates(_, SLMesh):
+    meshes = snapshots(SLMesh)
+    return [meshes[meshId].name for meshId in mcin.copies(mcin.instancingGroups(meshes))]
+
+
+def instancingSection(SLMesh):
+    meshes = snapshots(SLMesh)
+    return mcin.section(mcin.instancingGroups(meshes), [snapshot.name for snapshot in meshes])
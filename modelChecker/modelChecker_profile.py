@@ -0,0 +1,120 @@
+import time
+from contextlib import contextmanager
+from modelChecker import lazyImport
+
+json = lazyImport('json')
+tracemalloc = lazyImport('tracemalloc')
+
+# Instrumentation for a check run. The engines record one event per check and
+# mesh, and checks without a per-mesh engine are recorded once as a whole.
+# Every event carries its wall time, the meshes and components visited, the
+# number of failing components and, when memory tracking is on, the bytes
+# still allocated when it finished. Events export as JSON or in the Chrome
+# trace format read by chrome://tracing and Perfetto.
+
+
+class Profiler(object):
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.events = []
+        self.origin = time.perf_counter()
+        self.tracing = False
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+
+    def stop(self):
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    @contextmanager
+    def measure(self, check, mesh=None):
+        # The caller fills in components and results on the yielded event.
+        # mesh is a node name, which events are grouped and exported by.
+        event = {
+            'check': check,
+            'mesh': mesh,
+            'meshes': 1 if mesh else 0,
+            'components': 0,
+            'results': 0,
+            'memory': None,
+        }
+        before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            event['start'] = start - self.origin
+            event['wallTime'] = time.perf_counter() - start
+            if before is not None:
+                event['memory'] = tracemalloc.get_traced_memory()[0] - before
+            self.events.append(event)
+
+    def checks(self):
+        # Totals per check, slowest first.
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(event['check'], {
+                'wallTime': 0.0, 'meshes': 0, 'components': 0, 'results': 0, 'memory': None})
+            for key in ('wallTime', 'meshes', 'components', 'results'):
+                total[key] += event[key]
+            if event['memory'] is not None:
+                total['memory'] = (total['memory'] or 0) + event['memory']
+        return dict(sorted(totals.items(), key=lambda item: -item[1]['wallTime']))
+
+    def meshes(self, count=10):
+        # Total time per mesh over every check, slowest first.
+        totals = {}
+        for event in self.events:
+            if event['mesh']:
+                totals[event['mesh']] = totals.get(event['mesh'], 0.0) + event['wallTime']
+        return sorted(totals.items(), key=lambda item: -item[1])[:count]
+
+    def section(self):
+        # Report lines: one per check, then the slowest meshes.
+        values = {}
+        for check, total in self.checks().items():
+            line = (f"{total['wallTime']:.3f}s, {total['meshes']} meshes, "
+                    f"{total['components']} components, {total['results']} results")
+            if total['memory'] is not None:
+                line += f", {total['memory'] / 1048576.0:.1f} MB"
+            values[check] = line
+        for mesh, wallTime in self.meshes():
+            values[f"mesh {mesh}"] = f"{wallTime:.3f}s"
+        return values
+
+    def toDict(self):
+        return {'checks': self.checks(), 'events': self.events}
+
+    def chromeTrace(self):
+        traceEvents = []
+        for event in self.events:
+            traceEvents.append({
+                'name': event['check'],
+                'cat': 'mesh' if event['mesh'] else 'check',
+                'ph': 'X',
+                'ts': event['start'] * 1e6,
+                'dur': event['wallTime'] * 1e6,
+                'pid': 1,
+                'tid': 1,
+                'args': {key: event[key] for key in ('mesh', 'components', 'results', 'memory')},
+            })
+        return {'traceEvents': traceEvents, 'displayTimeUnit': 'ms'}
+
+    def export(self, path, chrome=False):
+        with open(path, 'w') as f:
+            json.dump(self.chromeTrace() if chrome else self.toDict(), f, indent=2)
+
+
+@contextmanager
+def measure(profiler, check, mesh=None):
+    # Profiler.measure that does nothing when profiling is off.
+    if profiler is None:
+        yield {}
+    else:
+        with profiler.measure(check, mesh) as event:
+            yield event
@@ -0,0 +1,202 @@
+import bisect
+import math
+from functools import partial
+from PySide2 import QtCore, QtGui, QtWidgets
+import modelChecker.modelChecker_results as mcrs
+
+# Lazy tree model for the report: sections and checks at the top, failing
+# nodes and components below. Children are only materialized in pages as the
+# view scrolls to them, and consolidated per-node counts are built when a
+# check is first expanded, so a check with a million components costs the
+# same to display as one with ten. Histogram draws the values of a
+# threshold check with the current threshold marked.
+
+pageSize = 1000
+failedColor = QtGui.QColor("#9c4f4f")
+successColor = QtGui.QColor("#64a65a")
+
+
+class ReportItem(object):
+
+    def __init__(self, parent, text, color=None, selection=None):
+        self.parent = parent
+        self.row = len(parent.children) if parent else 0
+        self.text = text
+        self.color = color
+        self.selection = selection
+        self.children = []
+        self.source = None
+        self.rows = None
+
+    def childRows(self):
+        # Child rows as (text, color, selection, rows), resolved on first use.
+        if self.rows is None:
+            self.rows = self.source() if self.source else []
+        return self.rows
+
+
+class ErrorRows(object):
+
+    def __init__(self, errors):
+        self.errors = mcrs.FlatView(errors)
+
+    def __len__(self):
+        return len(self.errors)
+
+    def __getitem__(self, window):
+        return [(error, None, [error], None) for error in self.errors[window]]
+
+
+def consolidatedRows(errors):
+    # One pass groups the components per node; each node row pages its own.
+    grouped = {}
+    for error in errors:
+        grouped.setdefault(mcrs.objectName(error), []).append(error)
+    rows = []
+    for name, nodeErrors in grouped.items():
+        count = mcrs.count(nodeErrors)
+        word = "issues" if count > 1 else "issue"
+        rows.append((f"{name} - {count} {word}", failedColor, [name], ErrorRows(nodeErrors)))
+    return rows
+
+
+class ReportModel(QtCore.QAbstractItemModel):
+
+    def __init__(self, parent=None):
+        super(ReportModel, self).__init__(parent)
+        self.root = ReportItem(None, "")
+
+    def clear(self):
+        self.beginResetModel()
+        self.root = ReportItem(None, "")
+        self.endResetModel()
+
+    def setMessage(self, text):
+        self.beginResetModel()
+        self.root = ReportItem(None, "")
+        self.root.children.append(ReportItem(self.root, text))
+        self.endResetModel()
+
+    def setReport(self, sections, checks, consolidated):
+        # sections: [(title, {key: value})], checks: [(label, errors)]
+        self.beginResetModel()
+        self.root = ReportItem(None, "")
+        for title, values in sections:
+            item = ReportItem(self.root, title)
+            item.rows = [(f"{key}: {value}", None, None, None) for key, value in values.items()]
+            self.root.children.append(item)
+        for label, errors in checks:
+            if errors:
+                item = ReportItem(self.root, f"{label} [ FAILED ] ({mcrs.count(errors)})", failedColor, errors)
+                if consolidated and (isinstance(errors[0], mcrs.ComponentResult) or "." in errors[0]):
+                    item.source = partial(consolidatedRows, errors)
+                else:
+                    item.rows = ErrorRows(errors)
+            else:
+                item = ReportItem(self.root, f"{label} [ SUCCESS ]", successColor)
+            self.root.children.append(item)
+        self.endResetModel()
+
+    def _item(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        item = self._item(parent)
+        if column != 0 or row >= len(item.children):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, item.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QtCore.QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return len(self._item(parent).children)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        item = self._item(parent)
+        return item is self.root or item.source is not None or bool(item.rows)
+
+    def canFetchMore(self, parent):
+        item = self._item(parent)
+        return item is not self.root and len(item.children) < len(item.childRows())
+
+    def fetchMore(self, parent):
+        item = self._item(parent)
+        rows = item.childRows()
+        start = len(item.children)
+        stop = min(start + pageSize, len(rows))
+        self.beginInsertRows(parent, start, stop - 1)
+        for text, color, selection, childRows in rows[start:stop]:
+            child = ReportItem(item, text, color, selection)
+            child.rows = childRows
+            item.children.append(child)
+        self.endInsertRows()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = index.internalPointer()
+        if role == QtCore.Qt.DisplayRole:
+            return item.text
+        if role == QtCore.Qt.ForegroundRole and item.color is not None:
+            return item.color
+        return None
+
+    def selection(self, index):
+        if not index.isValid():
+            return None
+        return index.internalPointer().selection
+
+
+class Histogram(QtWidgets.QWidget):
+    # Bar heights are log scaled so a few outliers stay visible next to bins
+    # holding millions of values.
+
+    def __init__(self, parent=None):
+        super(Histogram, self).__init__(parent)
+        self.counts = []
+        self.edges = []
+        self.threshold = None
+        self.setMinimumHeight(100)
+
+    def setData(self, counts, edges, threshold=None):
+        self.counts = list(counts)
+        self.edges = list(edges)
+        self.threshold = threshold
+        self.update()
+
+    def thresholdPosition(self):
+        # Threshold as a fraction of the width, None outside the range.
+        edges = self.edges
+        if self.threshold is None or not edges or not edges[0] <= self.threshold <= edges[-1]:
+            return None
+        index = min(bisect.bisect_right(edges, self.threshold), len(edges) - 1) - 1
+        width = edges[index + 1] - edges[index]
+        offset = (self.threshold - edges[index]) / width if width > 0 else 0.0
+        return (index + offset) / len(self.counts)
+
+    def paintEvent(self, event):
+        if not self.counts:
+            return
+        painter = QtGui.QPainter(self)
+        rect = self.rect()
+        peak = math.log1p(max(self.counts)) or 1.0
+        barWidth = rect.width() / float(len(self.counts))
+        for index, count in enumerate(self.counts):
+            height = int(rect.height() * math.log1p(count) / peak)
+            painter.fillRect(QtCore.QRectF(index * barWidth, rect.height() - height, max(barWidth - 1, 1), height),
+                             successColor)
+        position = self.thresholdPosition()
+        if position is not None:
+            painter.setPen(QtGui.QPen(failedColor, 2))
+            x = int(position * rect.width())
+            painter.drawLine(x, 0, x, rect.height())
+        painter.end()
@@ -0,0 +1,253 @@
+import bisect
+import itertools
+import tempfile
+import zlib
+from array import array
+import modelChecker.modelChecker_list as mcl
+from modelChecker import lazyImport
+
+ElementTree = lazyImport('xml.etree.ElementTree')
+
+# Compact check results. A component check yields one ComponentResult per
+# failing mesh, holding the mesh name, the component type ("f", "e", "vtx",
+# "map") and the failing indices in an int array. Component names are only
+# built when something iterates, exports or selects them. Node level checks
+# keep returning plain node names, and every helper here accepts a list mixing
+# both. UV results from a UV set other than the current one also carry the
+# set's name, which their names show as a suffix. A streamed run keeps its
+# indices in a spill file instead, read back a block at a time.
+
+
+class ComponentResult(object):
+    __slots__ = ('objectName', 'component', 'indices', 'uvSet')
+
+    def __init__(self, objectName, component, indices, uvSet=None):
+        self.objectName = objectName
+        self.component = component
+        self.indices = indices if hasattr(indices, 'dtype') else array('i', indices)
+        self.uvSet = uvSet
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        for index in self.indices:
+            yield self.name(index)
+
+    def __getitem__(self, window):
+        return [self.name(index) for index in self.indices[window]]
+
+    def __repr__(self):
+        uvSet = f", uvSet={self.uvSet!r}" if self.uvSet else ""
+        return f"ComponentResult({self.objectName!r}, {self.component!r}, {len(self)} components{uvSet})"
+
+    def name(self, window):
+        name = f"{self.objectName}.{self.component}[{window}]"
+        return f"{name} ({self.uvSet})" if self.uvSet else name
+
+    def ranges(self):
+        # Consecutive runs of sorted indices as inclusive (first, last) pairs.
+        ranges = []
+        for index in sorted(self.indices):
+            index = int(index)
+            if ranges and index == ranges[-1][1] + 1:
+                ranges[-1][1] = index
+            elif not ranges or index != ranges[-1][1]:
+                ranges.append([index, index])
+        return [tuple(run) for run in ranges]
+
+    def iterRanges(self):
+        return iter(self.ranges())
+
+    def names(self):
+        # Range compressed names, e.g. "pCube1.f[10:2000]".
+        return list(self.iterNames())
+
+    def iterNames(self):
+        for first, last in self.iterRanges():
+            yield self.name(first if first == last else f"{first}:{last}")
+
+
+class Spill(object):
+    # Append only file of compressed index blocks, a temporary file unless a
+    # path is given. Each block holds one chunk's sorted failing indices as
+    # zlib compressed deltas. memoryLimit is the most a streamed run may
+    # buffer before it writes a block.
+
+    def __init__(self, path=None, memoryLimit=256 * 1048576):
+        self.file = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self.memoryLimit = memoryLimit
+
+    def write(self, indices):
+        # (offset, size, count) of the new block.
+        deltas = array('i', indices[:1])
+        deltas.extend(b - a for a, b in zip(indices, indices[1:]))
+        data = zlib.compress(deltas.tobytes(), 1)
+        self.file.seek(0, 2)
+        offset = self.file.tell()
+        self.file.write(data)
+        return offset, len(data), len(indices)
+
+    def read(self, block):
+        offset, size, _ = block
+        self.file.seek(offset)
+        return array('i', itertools.accumulate(array('i', zlib.decompress(self.file.read(size)))))
+
+    def close(self):
+        self.file.close()
+
+
+class SpilledResult(ComponentResult):
+    # ComponentResult whose indices stay in a Spill. Counting, iterating,
+    # slicing and range compressed names read one block at a time; only
+    # indices, used to select the components, loads them all.
+    __slots__ = ('spill', 'blocks', 'total')
+
+    def __init__(self, objectName, component, spill, blocks, uvSet=None):
+        self.objectName = objectName
+        self.component = component
+        self.uvSet = uvSet
+        self.spill = spill
+        self.blocks = blocks
+        self.total = sum(count for _, _, count in blocks)
+
+    @property
+    def indices(self):
+        indices = array('i')
+        for block in self.blocks:
+            indices.extend(self.spill.read(block))
+        return indices
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        for block in self.blocks:
+            for index in self.spill.read(block):
+                yield self.name(index)
+
+    def __getitem__(self, window):
+        start, stop, _ = window.indices(self.total)
+        result = []
+        position = 0
+        for block in self.blocks:
+            count = block[2]
+            if position + count > start and position < stop:
+                indices = self.spill.read(block)[max(start - position, 0):stop - position]
+                result.extend(self.name(index) for index in indices)
+            position += count
+        return result
+
+    def ranges(self):
+        return list(self.iterRanges())
+
+    def iterRanges(self):
+        # Blocks are written in ascending order, so runs carry over between them.
+        run = None
+        for block in self.blocks:
+            for index in self.spill.read(block):
+                if run and index == run[1] + 1:
+                    run[1] = index
+                elif not run or index != run[1]:
+                    if run:
+                        yield tuple(run)
+                    run = [index, index]
+        if run:
+            yield tuple(run)
+
+
+def componentResults(objectName, component, indices, uvSet=None):
+    # Results list entry for one mesh, empty when nothing failed.
+    if len(indices) == 0:
+        return []
+    return [ComponentResult(objectName, component, indices, uvSet)]
+
+
+def count(errors):
+    return sum(len(error) if isinstance(error, ComponentResult) else 1 for error in errors)
+
+
+def objectName(error):
+    if isinstance(error, ComponentResult):
+        return error.objectName
+    return error.split(".")[0]
+
+
+def names(errors, compressed=False):
+    return list(iterNames(errors, compressed))
+
+
+def iterNames(errors, compressed=False):
+    for error in errors:
+        if isinstance(error, ComponentResult):
+            yield from error.iterNames() if compressed else error
+        else:
+            yield error
+
+
+class FlatView(object):
+    # Sequence of component names over a results list, without expanding it.
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.starts = []
+        total = 0
+        for error in errors:
+            self.starts.append(total)
+            total += len(error) if isinstance(error, ComponentResult) else 1
+        self.total = total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, window):
+        start, stop, _ = window.indices(self.total)
+        result = []
+        position = bisect.bisect_right(self.starts, start) - 1
+        while start < stop and position < len(self.errors):
+            error = self.errors[position]
+            offset = start - self.starts[position]
+            if isinstance(error, ComponentResult):
+                taken = error[offset:offset + stop - start]
+            else:
+                taken = [error]
+            result.extend(taken)
+            start += len(taken)
+            position += 1
+        return result
+
+
+def jsonReport(diagnostics, errorLimit=None, **info):
+    # Machine readable summary; extra keyword arguments describe the run.
+    # errorLimit caps the names listed per check, the count stays exact.
+    checks = {}
+    for command, errors in diagnostics.items():
+        listed = list(itertools.islice(iterNames(errors, compressed=True), errorLimit))
+        checks[command] = {
+            'label': mcl.mcCommandsList[command]['label'],
+            'category': mcl.mcCommandsList[command]['category'],
+            'passed': not errors,
+            'count': count(errors),
+            'errors': listed,
+        }
+        if errorLimit is not None and len(listed) == errorLimit:
+            checks[command]['truncated'] = True
+    return dict(info, passed=not any(diagnostics.values()), checks=checks)
+
+
+def junitReport(diagnostics, name="modelChecker", skipped=(), errorLimit=None):
+    # One testcase per check, failing checks list their errors as text.
+    suite = ElementTree.Element('testsuite', name=name, tests=str(len(diagnostics) + len(skipped)),
+                                failures=str(sum(1 for errors in diagnostics.values() if errors)),
+                                skipped=str(len(skipped)))
+    for command, errors in diagnostics.items():
+        check = mcl.mcCommandsList[command]
+        case = ElementTree.SubElement(suite, 'testcase', classname=f"{name}.{check['category']}", name=command)
+        if errors:
+            failure = ElementTree.SubElement(case, 'failure', message=f"{check['label']}: {count(errors)} issues")
+            failure.text = "\n".join(itertools.islice(iterNames(errors, compressed=True), errorLimit))
+    for command in skipped:
+        check = mcl.mcCommandsList[command]
+        case = ElementTree.SubElement(suite, 'testcase', classname=f"{name}.{check['category']}", name=command)
+        ElementTree.SubElement(case, 'skipped', message="gate run stopped at an earlier failure")
+    return ElementTree.tostring(suite, encoding='unicode')
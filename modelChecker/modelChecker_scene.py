@@ -0,0 +1,305 @@
+import json
+import math
+import os
+import numpy as np
+import modelChecker.modelChecker_snapshot as mcs
+
+# Maya-free scene graph. Transforms and shapes are keyed by full DAG path
+# ("|group|pCube1") and hold what the checks in modelChecker_list read from a
+# Maya scene: world transform values, pivots, layers, shading assignments,
+# history size and mesh arrays as a MeshSnapshot.
+
+defaultCameras = {'front', 'persp', 'top', 'side'}
+
+meshArrays = {
+    'faceCounts': np.int64,
+    'faceVertices': np.int64,
+    'points': np.float64,
+    'edgeVertices': np.int64,
+    'smoothEdges': bool,
+    'uvCounts': np.int64,
+    'uvIds': np.int64,
+    'us': np.float64,
+    'vs': np.float64,
+}
+
+
+def shortName(path):
+    return path.rsplit('|', 1)[-1]
+
+
+def parentPath(path):
+    return path.rsplit('|', 1)[0]
+
+
+class Shape(object):
+
+    def __init__(self, path, nodeType='mesh', mesh=None, shadingEngines=None, historySize=1):
+        self.path = path
+        self.nodeType = nodeType
+        self.mesh = mesh
+        self.shadingEngines = shadingEngines or []
+        self.historySize = historySize
+
+
+class Transform(object):
+
+    def __init__(self, path, translation=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0),
+                 scale=(1.0, 1.0, 1.0), rotatePivot=(0.0, 0.0, 0.0), layers=None):
+        self.path = path
+        self.translation = [float(value) for value in translation]
+        self.rotation = [float(value) for value in rotation]
+        self.scale = [float(value) for value in scale]
+        self.rotatePivot = [float(value) for value in rotatePivot]
+        self.layers = layers or []
+        self.parent = None
+        self.children = []
+        self.shapes = []
+
+    def matrix(self):
+        # World matrix from the world values, scale then rotation in xyz
+        # order then translation, for row vectors as in Maya.
+        cx, cy, cz = (math.cos(math.radians(angle)) for angle in self.rotation)
+        sx, sy, sz = (math.sin(math.radians(angle)) for angle in self.rotation)
+        rotation = [
+            [cy * cz, cy * sz, -sy],
+            [sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy],
+            [cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy],
+        ]
+        rows = [[value * scale for value in row] + [0.0] for row, scale in zip(rotation, self.scale)]
+        return np.array(rows + [self.translation + [1.0]])
+
+
+class Scene(object):
+
+    def __init__(self):
+        self.transforms = {}
+        self.shapes = {}
+        self._names = None
+
+    def addTransform(self, path, **kwargs):
+        transform = Transform(path, **kwargs)
+        self.transforms[path] = transform
+        parent = self.transforms.get(parentPath(path))
+        if parent is not None:
+            transform.parent = parent
+            parent.children.append(transform)
+        self._names = None
+        return transform
+
+    def addShape(self, path, **kwargs):
+        shape = Shape(path, **kwargs)
+        self.shapes[path] = shape
+        self.transforms[parentPath(path)].shapes.append(shape)
+        self._names = None
+        return shape
+
+    def _buildNames(self):
+        # Shortest unique partial path per node, the way cmds.ls reports names.
+        paths = list(self.transforms) + list(self.shapes)
+        suffixCounts = {}
+        for path in paths:
+            parts = path.split('|')
+            for depth in range(1, len(parts)):
+                suffix = '|'.join(parts[-depth:])
+                suffixCounts[suffix] = suffixCounts.get(suffix, 0) + 1
+        names = {}
+        for path in paths:
+            parts = path.split('|')
+            names[path] = path
+            for depth in range(1, len(parts)):
+                suffix = '|'.join(parts[-depth:])
+                if suffixCounts[suffix] == 1:
+                    names[path] = suffix
+                    break
+        self._names = names
+        self._paths = {name: path for path, name in names.items()}
+
+    def setNames(self, names):
+        # Names by path as Maya reports them, for a scene holding only part
+        # of the DAG, where the shortest unique paths can't be worked out.
+        self._names = dict(names)
+        self._paths = {name: path for path, name in self._names.items()}
+
+    def name(self, path):
+        if self._names is None:
+            self._buildNames()
+        return self._names[path]
+
+    def path(self, name):
+        if self._names is None:
+            self._buildNames()
+        if name in self.transforms or name in self.shapes:
+            return name
+        return self._paths[name]
+
+    def transform(self, name):
+        return self.transforms[self.path(name)]
+
+    def allNodes(self):
+        return [self.name(path) for path in self.transforms
+                if self.name(path) not in defaultCameras]
+
+    def descendants(self, name):
+        result = []
+        stack = list(self.transform(name).children)
+        while stack:
+            transform = stack.pop()
+            result.append(self.name(transform.path))
+            stack.extend(transform.children)
+        return result
+
+    def meshes(self, nodes):
+        # (objectName, MeshSnapshot) for every node with a mesh shape, in node order.
+        result = []
+        for node in nodes:
+            for shape in self.transform(node).shapes:
+                if shape.nodeType == 'mesh' and shape.mesh is not None:
+                    result.append((node, shape.mesh))
+                    break
+        return result
+
+
+def fromDict(data):
+    scene = Scene()
+    for entry in sorted(data.get('transforms', []), key=lambda entry: entry['path'].count('|')):
+        entry = dict(entry)
+        scene.addTransform(entry.pop('path'), **entry)
+    for entry in data.get('shapes', []):
+        arrays = {}
+        for field, dtype in meshArrays.items():
+            if field in entry:
+                arrays[field] = np.asarray(entry[field], dtype=dtype)
+        mesh = None
+        if entry.get('type', 'mesh') == 'mesh':
+            mesh = mcs.MeshSnapshot(shortName(parentPath(entry['path'])), **arrays)
+        scene.addShape(
+            entry['path'],
+            nodeType=entry.get('type', 'mesh'),
+            mesh=mesh,
+            shadingEngines=entry.get('shadingEngines'),
+            historySize=entry.get('historySize', 1),
+        )
+    return scene
+
+
+def toDict(scene):
+    transforms = []
+    for transform in scene.transforms.values():
+        transforms.append({
+            'path': transform.path,
+            'translation': transform.translation,
+            'rotation': transform.rotation,
+            'scale': transform.scale,
+            'rotatePivot': transform.rotatePivot,
+            'layers': transform.layers,
+        })
+    shapes = []
+    for shape in scene.shapes.values():
+        entry = {
+            'path': shape.path,
+            'type': shape.nodeType,
+            'shadingEngines': shape.shadingEngines,
+            'historySize': shape.historySize,
+        }
+        if shape.mesh is not None:
+            for field in meshArrays:
+                entry[field] = shape.mesh.get(field).tolist()
+        shapes.append(entry)
+    return {'transforms': transforms, 'shapes': shapes}
+
+
+def loadJson(path):
+    with open(path, 'r') as f:
+        return fromDict(json.load(f))
+
+
+def saveJson(scene, path):
+    with open(path, 'w') as f:
+        json.dump(toDict(scene), f)
+
+
+def loadObj(path):
+    # Every o/g block becomes a transform under the world with one mesh shape.
+    # usemtl names map to "<material>SG" shading engines.
+    points, uvs = [], []
+    objects = []
+
+    def newObject(name):
+        objects.append({'name': name, 'faces': [], 'materials': []})
+
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == 'v':
+            points.append([float(value) for value in parts[1:4]])
+        elif parts[0] == 'vt':
+            uvs.append([float(value) for value in parts[1:3]])
+        elif parts[0] in ('o', 'g') and len(parts) > 1:
+            newObject(parts[1])
+        elif parts[0] == 'usemtl':
+            if not objects:
+                newObject(os.path.splitext(os.path.basename(path))[0])
+            objects[-1]['materials'].append(parts[1] + 'SG')
+        elif parts[0] == 'f':
+            if not objects:
+                newObject(os.path.splitext(os.path.basename(path))[0])
+            corners = []
+            for corner in parts[1:]:
+                indices = corner.split('/')
+                vertex = int(indices[0])
+                uv = int(indices[1]) if len(indices) > 1 and indices[1] else None
+                vertex = vertex - 1 if vertex > 0 else len(points) + vertex
+                if uv is not None:
+                    uv = uv - 1 if uv > 0 else len(uvs) + uv
+                corners.append((vertex, uv))
+            objects[-1]['faces'].append(corners)
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)
+    scene = Scene()
+    for obj in objects:
+        if not obj['faces']:
+            continue
+        transformPath = '|' + obj['name']
+        # Compact the global OBJ vertex and UV lists to this object.
+        vertexIds = np.array([v for face in obj['faces'] for v, _ in face], dtype=np.int64)
+        usedVertices, faceVertices = np.unique(vertexIds, return_inverse=True)
+        faceCounts = np.array([len(face) for face in obj['faces']], dtype=np.int64)
+        mapped = [all(uv is not None for _, uv in face) for face in obj['faces']]
+        uvCounts = np.where(mapped, faceCounts, 0)
+        uvIdList = [uv for face, isMapped in zip(obj['faces'], mapped) if isMapped for _, uv in face]
+        usedUVs, uvIds = np.unique(np.array(uvIdList, dtype=np.int64), return_inverse=True)
+        mesh = mcs.MeshSnapshot(
+            obj['name'],
+            faceCounts=faceCounts,
+            faceVertices=faceVertices.ravel(),
+            points=points[usedVertices],
+            uvCounts=uvCounts,
+            uvIds=uvIds.ravel(),
+            us=uvs[usedUVs, 0] if len(usedUVs) else np.zeros(0),
+            vs=uvs[usedUVs, 1] if len(usedUVs) else np.zeros(0),
+        )
+        scene.addTransform(transformPath)
+        scene.addShape(
+            transformPath + '|' + obj['name'] + 'Shape',
+            mesh=mesh,
+            shadingEngines=obj['materials'] or ['initialShadingGroup'],
+        )
+    return scene
+
+
+loaders = {
+    '.json': loadJson,
+    '.obj': loadObj,
+}
+
+
+def load(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in loaders:
+        raise ValueError(f"Unsupported scene file: {path}")
+    return loaders[extension](path)
@@ -0,0 +1,57 @@
+import modelChecker.modelChecker_list as mcl
+
+# Orders a run from the declarations in mcCommandsList. Checks run in stages
+# of increasing cost, so node checks report before any mesh data is pulled,
+# and the data a run extracts is the union of what its checks require. A
+# gate run stops at the first failing check and reports the rest as skipped.
+
+sceneData = ('hierarchy', 'transforms', 'connections')
+
+
+def order(commands):
+    # Cheapest cost class first, registry order within a class.
+    position = {command: index for index, command in enumerate(mcl.mcCommandsList)}
+    return sorted(commands, key=lambda command: (
+        mcl.costs.index(mcl.mcCommandsList[command].get('cost', 'mesh')), position[command]))
+
+
+def stages(commands):
+    # [(cost, commands)] in run order, leaving out empty cost classes.
+    result = []
+    for command in order(commands):
+        cost = mcl.mcCommandsList[command].get('cost', 'mesh')
+        if not result or result[-1][0] != cost:
+            result.append((cost, []))
+        result[-1][1].append(command)
+    return result
+
+
+def requirements(commands):
+    # Every piece of data the checks read, each listed once in first use order.
+    required = []
+    for command in order(commands):
+        for data in mcl.mcCommandsList[command].get('requires', []):
+            if data not in required:
+                required.append(data)
+    return required
+
+
+def sceneRequirements(commands):
+    return [data for data in requirements(commands) if data in sceneData]
+
+
+def schedule(commands, run, gate=False):
+    # run(commands) returns diagnostics for those commands. Without a gate
+    # each stage runs as one batch so its checks share mesh walks; a gate
+    # runs check by check and returns the unrun checks as skipped.
+    diagnostics = {}
+    if not gate:
+        for _, stageCommands in stages(commands):
+            diagnostics.update(run(stageCommands))
+        return diagnostics, []
+    ordered = order(commands)
+    for index, command in enumerate(ordered):
+        diagnostics.update(run([command]))
+        if diagnostics[command]:
+            return diagnostics, ordered[index + 1:]
+    return diagnostics, []
@@ -0,0 +1,696 @@
+import hashlib
+import numpy as np
+import modelChecker.modelChecker_list as mcl
+
+# Bulk array view of a single mesh. Arrays are pulled on first access through
+# the loader so a check only pays for the data it reads, and every check run
+# against the same snapshot shares the extraction. A loader is called with a
+# field name and returns a dict of arrays, which may hold more than the field
+# asked for when the underlying query yields several at once. Without a
+# loader, edges are derived from the faces and missing UV data reads as an
+# unmapped mesh. UV fields hold the current UV set; every other set is read
+# through a view of the mesh that shares the geometry already extracted.
+
+uvFields = ('uvCounts', 'uvIds', 'us', 'vs', 'uvOffsets')
+
+
+class MeshSnapshot(object):
+
+    def __init__(self, name, loader=None, **arrays):
+        self.name = name
+        self.loader = loader
+        self.arrays = dict(arrays)
+        self.hashes = {}
+        self._adjacency = None
+        self.uvSetViews = {}
+
+    def get(self, field):
+        if field not in self.arrays:
+            if self.loader is not None:
+                self.arrays.update(self.loader(field))
+            else:
+                self.arrays.update(self._derive(field))
+        return self.arrays[field]
+
+    def _derive(self, field):
+        if field == 'edgeVertices':
+            return {'edgeVertices': deriveEdges(self.faceCounts, self.faceVertices, self.faceOffsets)}
+        if field == 'smoothEdges':
+            return {'smoothEdges': np.ones(len(self.edgeVertices), dtype=bool)}
+        if field in ('edgeKey', 'smoothingKey'):
+            # Without a loader the edge arrays are cheap, so keys hash them.
+            return {'edgeKey': self.edgeVertices, 'smoothingKey': self.smoothEdges}
+        if field in ('uvCounts', 'uvIds'):
+            return {
+                'uvCounts': np.zeros(len(self.faceCounts), dtype=np.int64),
+                'uvIds': np.zeros(0, dtype=np.int64),
+            }
+        if field in ('us', 'vs'):
+            return {'us': np.zeros(0), 'vs': np.zeros(0)}
+        if field == 'uvSets':
+            return {'uvSets': ['map1']}
+        if field == 'worldMatrix':
+            return {'worldMatrix': np.identity(4)}
+        raise KeyError(f"{self.name} has no '{field}' data")
+
+    def uvSetSnapshots(self):
+        # (uvSet, snapshot) for every UV set, the current one first as
+        # (None, self). Other sets load through loader.forUVSet(uvSet).
+        result = [(None, self)]
+        for uvSet in self.uvSets[1:]:
+            if uvSet not in self.uvSetViews:
+                arrays = {field: array for field, array in self.arrays.items() if field not in uvFields}
+                self.uvSetViews[uvSet] = MeshSnapshot(self.name, self.loader.forUVSet(uvSet), **arrays)
+            result.append((uvSet, self.uvSetViews[uvSet]))
+        return result
+
+    def hash(self, fields):
+        if fields not in self.hashes:
+            self.hashes[fields] = contentHash(self, fields)
+        return self.hashes[fields]
+
+    @property
+    def faceCounts(self):
+        return self.get('faceCounts')
+
+    @property
+    def faceVertices(self):
+        return self.get('faceVertices')
+
+    @property
+    def points(self):
+        return self.get('points')
+
+    @property
+    def edgeVertices(self):
+        return self.get('edgeVertices')
+
+    @property
+    def smoothEdges(self):
+        return self.get('smoothEdges')
+
+    @property
+    def uvCounts(self):
+        return self.get('uvCounts')
+
+    @property
+    def uvIds(self):
+        return self.get('uvIds')
+
+    @property
+    def us(self):
+        return self.get('us')
+
+    @property
+    def vs(self):
+        return self.get('vs')
+
+    @property
+    def uvSets(self):
+        # UV set names, the current set first.
+        return self.get('uvSets')
+
+    @property
+    def faceOffsets(self):
+        if 'faceOffsets' not in self.arrays:
+            self.arrays['faceOffsets'] = offsets(self.faceCounts)
+        return self.arrays['faceOffsets']
+
+    @property
+    def uvOffsets(self):
+        if 'uvOffsets' not in self.arrays:
+            self.arrays['uvOffsets'] = offsets(self.uvCounts)
+        return self.arrays['uvOffsets']
+
+    @property
+    def adjacency(self):
+        if self._adjacency is None:
+            self._adjacency = Adjacency(self)
+        return self._adjacency
+
+
+def contentHash(snapshot, fields=('faceCounts', 'faceVertices', 'points', 'uvCounts', 'uvIds', 'us', 'vs')):
+    # Stable digest of the mesh arrays, independent of the mesh name.
+    digest = hashlib.sha1()
+    for field in fields:
+        array = np.ascontiguousarray(snapshot.get(field))
+        digest.update(field.encode())
+        digest.update(str(array.dtype).encode())
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def offsets(counts):
+    result = np.zeros(len(counts), dtype=np.int64)
+    if len(counts) > 1:
+        np.cumsum(counts[:-1], out=result[1:])
+    return result
+
+
+def faceCorners(counts, faceOffsets):
+    # Face-vertex positions of every face side as (start, end) pairs.
+    faces = np.repeat(np.arange(len(counts)), counts)
+    start = np.arange(len(faces))
+    end = start + 1
+    last = faceOffsets + counts - 1
+    closing = last[counts > 0]
+    end[closing] = faceOffsets[counts > 0]
+    return faces, start, end
+
+
+def edgeKeys(pairs, numVertices):
+    low = np.minimum(pairs[:, 0], pairs[:, 1])
+    high = np.maximum(pairs[:, 0], pairs[:, 1])
+    return low * numVertices + high
+
+
+def deriveEdges(counts, faceVertices, faceOffsets):
+    # Unique undirected edges in order of first appearance.
+    _, start, end = faceCorners(counts, faceOffsets)
+    pairs = np.stack([faceVertices[start], faceVertices[end]], axis=1)
+    numVertices = int(faceVertices.max()) + 1 if len(faceVertices) else 0
+    _, first = np.unique(edgeKeys(pairs, numVertices), return_index=True)
+    return pairs[np.sort(first)]
+
+
+def cornerEdges(snapshot):
+    # Face, (start, end) face-vertex positions and edge index of every face
+    # side, the edge matched on the sorted vertex pair.
+    faces, start, end = faceCorners(snapshot.faceCounts, snapshot.faceOffsets)
+    faceVertices = snapshot.faceVertices
+    pairs = np.stack([faceVertices[start], faceVertices[end]], axis=1)
+    edgeVertices = snapshot.edgeVertices
+    numVertices = int(max(faceVertices.max(initial=-1), edgeVertices.max(initial=-1))) + 1
+    keys = edgeKeys(edgeVertices, numVertices)
+    order = np.argsort(keys)
+    position = np.searchsorted(keys[order], edgeKeys(pairs, numVertices))
+    return faces, start, end, order[np.minimum(position, len(order) - 1)]
+
+
+def csrIndex(keys, count):
+    # (starts, order) grouping positions by key: the positions holding key k
+    # are order[starts[k]:starts[k + 1]], in their original order.
+    starts = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=count), out=starts[1:])
+    return starts, np.argsort(keys, kind='stable')
+
+
+class Adjacency(object):
+    # Edge-face and vertex-edge index of a mesh in CSR form, built once per
+    # snapshot on first use so every edge and vertex check of a run reads the
+    # same index. A side is one face side, numbered in face-vertex order: the
+    # sides of edge e are edgeSides[edgeStarts[e]:edgeStarts[e + 1]] and the
+    # edges of vertex v are vertexEdges[vertexStarts[v]:vertexStarts[v + 1]].
+    # The vertex index only reads the edges, so poles never touch the faces.
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.arrays = {}
+
+    def get(self, field):
+        if field not in self.arrays:
+            if field in ('vertexStarts', 'vertexEdges'):
+                self.arrays.update(self._vertexIndex())
+            else:
+                self.arrays.update(self._edgeIndex())
+        return self.arrays[field]
+
+    def _edgeIndex(self):
+        faces, start, end, edges = cornerEdges(self.snapshot)
+        edgeStarts, edgeSides = csrIndex(edges, len(self.snapshot.edgeVertices))
+        return {
+            'sideFaces': faces,
+            'sideStarts': start,
+            'sideEnds': end,
+            'sideEdges': edges,
+            'edgeStarts': edgeStarts,
+            'edgeSides': edgeSides,
+        }
+
+    def _vertexIndex(self):
+        edgeVertices = self.snapshot.edgeVertices
+        vertexStarts, ends = csrIndex(edgeVertices.ravel(), len(self.snapshot.points))
+        return {'vertexStarts': vertexStarts, 'vertexEdges': ends // 2}
+
+    @property
+    def edgeFaceCounts(self):
+        return np.diff(self.get('edgeStarts'))
+
+    @property
+    def valences(self):
+        return np.diff(self.get('vertexStarts'))
+
+    def sharedEdges(self):
+        # (edges, first, second) for the edges with exactly two sides.
+        edges = np.flatnonzero(self.edgeFaceCounts == 2)
+        first = self.get('edgeStarts')[edges]
+        edgeSides = self.get('edgeSides')
+        return edges, edgeSides[first], edgeSides[first + 1]
+
+    def sameDirection(self, first, second):
+        # Whether two sides run from the same vertex, i.e. their faces
+        # disagree on the winding.
+        faceVertices = self.snapshot.faceVertices
+        starts = self.get('sideStarts')
+        return faceVertices[starts[first]] == faceVertices[starts[second]]
+
+
+def connectedLabels(count, a, b):
+    # Component label of each of count nodes joined by the (a, b) links:
+    # min label propagation with pointer jumping, so each node ends up
+    # labelled with the lowest node of its component.
+    labels = np.arange(count)
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        updated = labels.copy()
+        np.minimum.at(updated, a, low)
+        np.minimum.at(updated, b, low)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def fanTriangles(counts, faceOffsets):
+    # Face-vertex positions of a fan triangulation (0, k, k + 1) per face.
+    triCounts = np.maximum(counts - 2, 0)
+    triFaces = np.repeat(np.arange(len(counts)), triCounts)
+    firstTri = offsets(triCounts)
+    k = np.arange(len(triFaces)) - firstTri[triFaces] + 1
+    start = faceOffsets[triFaces]
+    return triFaces, start, start + k, start + k + 1
+
+
+def faceAreas(snapshot):
+    counts = snapshot.faceCounts
+    triFaces, a, b, c = fanTriangles(counts, snapshot.faceOffsets)
+    faceVertices = snapshot.faceVertices
+    points = snapshot.points
+    p0 = points[faceVertices[a]]
+    cross = np.cross(points[faceVertices[b]] - p0, points[faceVertices[c]] - p0)
+    triAreas = 0.5 * np.sqrt(np.einsum('ij,ij->i', cross, cross))
+    return np.bincount(triFaces, weights=triAreas, minlength=len(counts))
+
+
+def edgeLengths(snapshot):
+    edgeVertices = snapshot.edgeVertices
+    points = snapshot.points
+    delta = points[edgeVertices[:, 0]] - points[edgeVertices[:, 1]]
+    return np.sqrt(np.einsum('ij,ij->i', delta, delta))
+
+
+def triangles(snapshot):
+    return np.flatnonzero(snapshot.faceCounts == 3)
+
+
+def ngons(snapshot):
+    return np.flatnonzero(snapshot.faceCounts > 4)
+
+
+def zeroAreaFaces(snapshot, maxArea=0.00000001):
+    return np.flatnonzero(faceAreas(snapshot) <= maxArea)
+
+
+def zeroLengthEdges(snapshot, maxLength=0.00000001):
+    return np.flatnonzero(edgeLengths(snapshot) <= maxLength)
+
+
+def vertexValences(snapshot):
+    return snapshot.adjacency.valences
+
+
+def lamina(snapshot):
+    # A lamina face shares its full vertex set with another face.
+    counts = snapshot.faceCounts
+    faceVertices = snapshot.faceVertices
+    faceOffsets = snapshot.faceOffsets
+    result = []
+    for count in np.unique(counts):
+        faces = np.flatnonzero(counts == count)
+        if len(faces) < 2:
+            continue
+        rows = faceVertices[faceOffsets[faces][:, None] + np.arange(count)]
+        rows.sort(axis=1)
+        _, inverse, occurrences = np.unique(
+            rows, axis=0, return_inverse=True, return_counts=True)
+        result.append(faces[occurrences[inverse.ravel()] > 1])
+    if not result:
+        return np.zeros(0, dtype=np.int64)
+    return np.sort(np.concatenate(result))
+
+
+def openEdges(snapshot):
+    return np.flatnonzero(snapshot.adjacency.edgeFaceCounts < 2)
+
+
+def noneManifoldEdges(snapshot):
+    return np.flatnonzero(snapshot.adjacency.edgeFaceCounts > 2)
+
+
+def hardEdges(snapshot):
+    boundary = snapshot.adjacency.edgeFaceCounts == 1
+    return np.flatnonzero(~snapshot.smoothEdges & ~boundary)
+
+
+def poles(snapshot, maxValence=5):
+    return np.flatnonzero(vertexValences(snapshot) > maxValence)
+
+
+def nonManifoldVertices(snapshot):
+    # Faces around a manifold vertex form a single fan. Face corners are
+    # joined across every edge with two faces, and a vertex whose corners
+    # fall into more than one group is shared by several fans (a bowtie, or
+    # a fan split by a non-manifold edge).
+    adjacency = snapshot.adjacency
+    faceVertices = snapshot.faceVertices
+    _, first, second = adjacency.sharedEdges()
+    starts, ends = adjacency.get('sideStarts'), adjacency.get('sideEnds')
+    same = adjacency.sameDirection(first, second)
+    a = np.concatenate([starts[first], ends[first]])
+    b = np.concatenate([np.where(same, starts[second], ends[second]),
+                        np.where(same, ends[second], starts[second])])
+    labels = connectedLabels(len(faceVertices), a, b)
+    # Each fan is labelled after its lowest corner, so fans are counted at
+    # the corners that carry their own label.
+    roots = faceVertices[labels == np.arange(len(labels))]
+    return np.flatnonzero(np.bincount(roots) > 1)
+
+
+def inconsistentWinding(snapshot):
+    # Edges whose two faces run along them in the same direction, so one of
+    # the faces is flipped against the other.
+    adjacency = snapshot.adjacency
+    edges, first, second = adjacency.sharedEdges()
+    return edges[adjacency.sameDirection(first, second)]
+
+
+def projectFace(points):
+    # Drop the dominant axis of the Newell normal to get a 2D outline.
+    shifted = np.roll(points, -1, axis=0)
+    normal = np.array([
+        np.sum((points[:, 1] - shifted[:, 1]) * (points[:, 2] + shifted[:, 2])),
+        np.sum((points[:, 2] - shifted[:, 2]) * (points[:, 0] + shifted[:, 0])),
+        np.sum((points[:, 0] - shifted[:, 0]) * (points[:, 1] + shifted[:, 1])),
+    ])
+    axis = int(np.argmax(np.abs(normal)))
+    outline = np.delete(points, axis, axis=1)
+    if normal[axis] < 0:
+        outline = outline[::-1]
+    return outline
+
+
+def hasKernel(outline):
+    # Clip the outline's bounding box against the inner half-plane of every
+    # side; a polygon is starlike when something survives.
+    low, high = outline.min(axis=0), outline.max(axis=0)
+    region = [(low[0], low[1]), (high[0], low[1]), (high[0], high[1]), (low[0], high[1])]
+    count = len(outline)
+    for i in range(count):
+        ax, ay = outline[i]
+        bx, by = outline[(i + 1) % count]
+        side = lambda p: (bx - ax) * (p[1] - ay) - (by - ay) * (p[0] - ax)
+        clipped = []
+        for j in range(len(region)):
+            p, q = region[j], region[(j + 1) % len(region)]
+            sp, sq = side(p), side(q)
+            if sp >= 0:
+                clipped.append(p)
+            if (sp >= 0) != (sq >= 0):
+                t = sp / (sp - sq)
+                clipped.append((p[0] + t * (q[0] - p[0]), p[1] + t * (q[1] - p[1])))
+        region = clipped
+        if not region:
+            return False
+    return True
+
+
+def starlike(snapshot):
+    # Every polygon with five or fewer sides is starlike, only the larger
+    # ones need the kernel test.
+    counts = snapshot.faceCounts
+    faceVertices = snapshot.faceVertices
+    faceOffsets = snapshot.faceOffsets
+    points = snapshot.points
+    result = []
+    for face in np.flatnonzero(counts > 5).tolist():
+        start = faceOffsets[face]
+        outline = projectFace(points[faceVertices[start:start + counts[face]]])
+        if not hasKernel(outline):
+            result.append(face)
+    return np.array(result, dtype=np.int64)
+
+
+def uvTriangles(snapshot):
+    uvCounts = snapshot.uvCounts
+    triFaces, a, b, c = fanTriangles(uvCounts, snapshot.uvOffsets)
+    uvIds = snapshot.uvIds
+    uvs = np.stack([snapshot.us, snapshot.vs], axis=1)
+    return triFaces, np.stack([uvs[uvIds[a]], uvs[uvIds[b]], uvs[uvIds[c]]], axis=1)
+
+
+def trianglesOverlap(first, second, tolerance=0.000001):
+    # Separating axis test on the side normals of both triangles, for N pairs
+    # of (N, 3, 2) triangles at once. Triangles that only touch along a side
+    # or at a corner do not overlap.
+    overlap = np.ones(len(first), dtype=bool)
+    for triangle in (first, second):
+        for i in range(3):
+            edge = triangle[:, (i + 1) % 3] - triangle[:, i]
+            axis = np.stack([-edge[:, 1], edge[:, 0]], axis=1)
+            a = np.einsum('nkj,nj->nk', first, axis)
+            b = np.einsum('nkj,nj->nk', second, axis)
+            depth = np.minimum(a.max(axis=1), b.max(axis=1)) - np.maximum(a.min(axis=1), b.min(axis=1))
+            overlap &= depth > tolerance
+    return overlap
+
+
+def gridPairs(low, high):
+    # Broad phase: bin bounding boxes (2D or 3D) into a uniform grid sized to
+    # the average box, then pair up boxes sharing a cell. A pair is only kept
+    # in the cell holding the lower corner of the boxes' intersection, so it
+    # is reported once without deduplication. Returns (i, j) pairs, i < j,
+    # whose boxes overlap.
+    count, dimensions = low.shape
+    if count < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    cellSize = float(np.mean(np.max(high - low, axis=1)))
+    # Cells are never smaller than the scene split into one cell per box, so
+    # a few very large boxes among small ones can't blow up the cell count.
+    extent = high.max(axis=0) - low.min(axis=0)
+    spread = extent[extent > 0]
+    if len(spread):
+        cellSize = max(cellSize, (float(np.prod(spread)) / count) ** (1.0 / len(spread)))
+    if cellSize <= 0:
+        cellSize = 1.0
+    origin = low.min(axis=0)
+    first = np.floor((low - origin) / cellSize).astype(np.int64)
+    last = np.floor((high - origin) / cellSize).astype(np.int64)
+    shape = last.max(axis=0) + 1
+    cellKey = lambda corner: np.ravel_multi_index(tuple(corner.T), shape)
+    span = last - first + 1
+    cellCounts = np.prod(span, axis=1)
+    owners = np.repeat(np.arange(count), cellCounts)
+    local = np.arange(len(owners)) - np.repeat(offsets(cellCounts), cellCounts)
+    corners = np.empty((len(owners), dimensions), dtype=np.int64)
+    for axis in range(dimensions - 1, -1, -1):
+        corners[:, axis] = first[owners, axis] + local % span[owners, axis]
+        local //= span[owners, axis]
+    cells = cellKey(corners)
+    order = np.lexsort((owners, cells))
+    cells, owners = cells[order], owners[order]
+    pairs = []
+    step = 1
+    while step < len(cells):
+        same = np.flatnonzero(cells[step:] == cells[:-step])
+        if len(same) == 0:
+            break
+        # Owners are sorted within a cell, so the first of a pair is the lower.
+        i, j = owners[same], owners[same + step]
+        keep = cellKey(np.maximum(first[i], first[j])) == cells[same]
+        keep &= np.all((low[i] < high[j]) & (low[j] < high[i]), axis=1)
+        pairs.append(np.stack([i[keep], j[keep]], axis=1))
+        step += 1
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.concatenate(pairs)
+
+
+def overlappingTriangles(tris, groups):
+    # Candidate pairs of triangles from different groups whose interiors
+    # overlap.
+    pairs = gridPairs(tris.min(axis=1), tris.max(axis=1))
+    pairs = pairs[groups[pairs[:, 0]] != groups[pairs[:, 1]]]
+    return pairs[trianglesOverlap(tris[pairs[:, 0]], tris[pairs[:, 1]])]
+
+
+def selfPenetratingUVs(snapshot):
+    triFaces, uvTris = uvTriangles(snapshot)
+    pairs = overlappingTriangles(uvTris, triFaces)
+    return np.unique(triFaces[pairs])
+
+
+def udimTiles(us, vs):
+    return 1001 + np.floor(us).astype(np.int64) + 10 * np.floor(vs).astype(np.int64)
+
+
+def udimOverlaps(snapshots):
+    # Faces whose UVs overlap a face of another mesh in the same UDIM tile,
+    # as one index array per snapshot.
+    meshTris, meshFaces, meshIds = [], [], []
+    for meshId, snapshot in enumerate(snapshots):
+        triFaces, uvTris = uvTriangles(snapshot)
+        meshTris.append(uvTris)
+        meshFaces.append(triFaces)
+        meshIds.append(np.full(len(triFaces), meshId, dtype=np.int64))
+    result = [np.zeros(0, dtype=np.int64) for _ in snapshots]
+    if not snapshots:
+        return result
+    tris = np.concatenate(meshTris).reshape(-1, 3, 2)
+    faces = np.concatenate(meshFaces)
+    owners = np.concatenate(meshIds)
+    centers = tris.mean(axis=1)
+    tiles = udimTiles(centers[:, 0], centers[:, 1])
+    pairs = overlappingTriangles(tris, owners)
+    pairs = pairs[tiles[pairs[:, 0]] == tiles[pairs[:, 1]]]
+    hits = pairs.ravel()
+    for meshId in range(len(snapshots)):
+        result[meshId] = np.unique(faces[hits[owners[hits] == meshId]])
+    return result
+
+
+def missingUVs(snapshot):
+    return np.flatnonzero(snapshot.uvCounts == 0)
+
+
+def uvRangeValues(snapshot):
+    # U of every UV, or its lowest coordinate when V is negative, so one
+    # value per UV is out of range exactly when the UV is.
+    us, vs = snapshot.us, snapshot.vs
+    return np.where(vs < 0, np.minimum(us, vs), us)
+
+
+def uvRange(snapshot, maxU=10):
+    values = uvRangeValues(snapshot)
+    return np.flatnonzero((values < 0) | (values > maxU))
+
+
+def borderDistances(snapshot):
+    # Distance of every UV to the nearest tile border line through it.
+    us, vs = snapshot.us, snapshot.vs
+    return np.minimum(np.abs(np.trunc(us) - us), np.abs(np.trunc(vs) - vs))
+
+
+def onBorder(snapshot, tolerance=0.00001):
+    return np.flatnonzero(borderDistances(snapshot) < tolerance)
+
+
+def uvTiles(values):
+    tiles = np.trunc(values)
+    return np.where(values > 0, tiles, tiles - 1)
+
+
+def crossBorder(snapshot):
+    uvCounts = snapshot.uvCounts
+    mapped = np.flatnonzero(uvCounts > 0)
+    if len(mapped) == 0:
+        return mapped
+    uvIds = snapshot.uvIds
+    starts = snapshot.uvOffsets[mapped]
+    result = np.zeros(len(mapped), dtype=bool)
+    for values in (snapshot.us, snapshot.vs):
+        tiles = uvTiles(values)[uvIds]
+        result |= np.maximum.reduceat(tiles, starts) != np.minimum.reduceat(tiles, starts)
+    return mapped[result]
+
+
+# check name -> (kernel, component)
+kernels = {
+    'triangles': (triangles, 'f'),
+    'ngons': (ngons, 'f'),
+    'lamina': (lamina, 'f'),
+    'zeroAreaFaces': (zeroAreaFaces, 'f'),
+    'zeroLengthEdges': (zeroLengthEdges, 'e'),
+    'openEdges': (openEdges, 'e'),
+    'noneManifoldEdges': (noneManifoldEdges, 'e'),
+    'hardEdges': (hardEdges, 'e'),
+    'poles': (poles, 'vtx'),
+    'nonManifoldVertices': (nonManifoldVertices, 'vtx'),
+    'inconsistentWinding': (inconsistentWinding, 'e'),
+    'starlike': (starlike, 'f'),
+    'selfPenetratingUVs': (selfPenetratingUVs, 'f'),
+    'missingUVs': (missingUVs, 'f'),
+    'uvRange': (uvRange, 'map'),
+    'onBorder': (onBorder, 'map'),
+    'crossBorder': (crossBorder, 'f'),
+}
+
+
+# Checks that compare one value per component with their parameters:
+# check name -> (metric, select), where select(values, **parameters) is the
+# failing mask. A run can keep the values so that a changed threshold only
+# filters them again.
+metricKernels = {
+    'zeroAreaFaces': (faceAreas, lambda areas, maxArea: areas <= maxArea),
+    'zeroLengthEdges': (edgeLengths, lambda lengths, maxLength: lengths <= maxLength),
+    'poles': (vertexValences, lambda valences, maxValence: valences > maxValence),
+    'uvRange': (uvRangeValues, lambda values, maxU: (values < 0) | (values > maxU)),
+    'onBorder': (borderDistances, lambda distances, tolerance: distances < tolerance),
+}
+
+
+def selectMetric(command, values, parameters=None):
+    # Failing indices of a metric check from its values.
+    _, select = metricKernels[command]
+    return np.flatnonzero(select(values, **mcl.parameters(command, parameters)))
+
+
+# Arrays each kernel reads, from the registry, so a content hash only covers
+# what the result depends on.
+meshFields = ('faceCounts', 'faceVertices', 'points', 'edgeVertices', 'smoothEdges',
+              'uvCounts', 'uvIds', 'us', 'vs')
+kernelFields = {
+    command: tuple(field for field in mcl.mcCommandsList[command]['requires'] if field in meshFields)
+    for command in kernels
+}
+
+
+# Edge fields have no bulk query in Maya, so cache keys hash arrays a loader
+# reads cheaply in their place: edges are numbered from the faces, with the
+# edge count as a guard, and hard edges split the normal ids. The edge arrays
+# are then only extracted when the lookup misses.
+edgeKeyFields = {
+    'edgeVertices': ('faceCounts', 'faceVertices', 'edgeKey'),
+    'smoothEdges': ('smoothingKey',),
+}
+
+
+def _keyFields(fields):
+    result = []
+    for field in fields:
+        for keyField in edgeKeyFields.get(field, (field,)):
+            if keyField not in result:
+                result.append(keyField)
+    return tuple(result)
+
+
+keyFields = {command: _keyFields(fields) for command, fields in kernelFields.items()}
+
+
+def checkedSnapshots(command, snapshot):
+    # (uvSet, snapshot) pairs a check runs on: every UV set for checks that
+    # the registry marks 'uvSets', otherwise the mesh as it is.
+    if mcl.mcCommandsList[command].get('uvSets'):
+        return snapshot.uvSetSnapshots()
+    return [(None, snapshot)]
+
+
+# Array whose length is the number of components a check of each type visits.
+componentFields = {'f': 'faceCounts', 'e': 'edgeVertices', 'vtx': 'points', 'map': 'us'}
+
+
+def componentCount(snapshot, component):
+    if component == 'e' and 'edgeVertices' not in snapshot.arrays:
+        # A cache hit through a loader only read the edge count.
+        return int(snapshot.get('edgeKey')[0])
+    return len(snapshot.get(componentFields[component]))
@@ -0,0 +1,164 @@
+import numpy as np
+import modelChecker.modelChecker_snapshot as mcs
+
+# Checks between meshes. Every mesh is taken to world space with its 4x4
+# world matrix (row vectors, translation in the last row, as Maya stores it).
+# Mesh bounding boxes are paired up in a grid first and only the triangles
+# of overlapping meshes, clipped to the region they overlap in, go into a
+# second grid over triangles. Exact tests only run on the triangle pairs
+# that grid returns, so scenes of many small props pay for the few that
+# touch rather than for every pair of objects.
+
+# Checks that compare meshes with each other, so a run can't split them per
+# mesh. UDIM overlaps live with the other UV kernels in modelChecker_snapshot
+# and instancing candidates in modelChecker_instancing.
+crossMeshChecks = {'udimOverlaps', 'duplicatedMeshes', 'coincidentFaces', 'intersectingFaces',
+                   'instancingCandidates'}
+
+
+def worldPoints(snapshot, matrix):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return snapshot.points @ matrix[:3, :3] + matrix[3, :3]
+
+
+def duplicatedMeshes(snapshots, matrices, tolerance=0.0001):
+    # Index of every mesh with the same topology and world space points as
+    # an earlier one, e.g. a prop duplicated in place. Meshes are grouped on
+    # their topology first, so points are only compared within a group.
+    groups = {}
+    for meshId, snapshot in enumerate(snapshots):
+        key = (len(snapshot.points), snapshot.hash(('faceCounts', 'faceVertices')))
+        groups.setdefault(key, []).append(meshId)
+    result = []
+    for meshIds in groups.values():
+        if len(meshIds) < 2:
+            continue
+        seen = set()
+        for meshId in meshIds:
+            grid = np.round(worldPoints(snapshots[meshId], matrices[meshId]) / tolerance).astype(np.int64)
+            key = grid.tobytes()
+            if key in seen:
+                result.append(meshId)
+            seen.add(key)
+    return sorted(result)
+
+
+def triangleCandidates(snapshots, matrices, padding):
+    # World space triangles of the meshes whose boxes overlap another mesh's
+    # box, and the (i, j) pairs of them whose padded boxes overlap across
+    # meshes. Returns (triangles, faces, owners, pairs).
+    empty = np.zeros((0, 2), dtype=np.int64)
+    meshIds = [meshId for meshId, snapshot in enumerate(snapshots) if len(snapshot.faceCounts)]
+    world = {meshId: worldPoints(snapshots[meshId], matrices[meshId]) for meshId in meshIds}
+    if len(meshIds) < 2:
+        return np.zeros((0, 3, 3)), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), empty
+    low = np.array([world[meshId].min(axis=0) for meshId in meshIds]) - padding
+    high = np.array([world[meshId].max(axis=0) for meshId in meshIds]) + padding
+    meshPairs = mcs.gridPairs(low, high)
+    if len(meshPairs) == 0:
+        return np.zeros((0, 3, 3)), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), empty
+    # Each mesh only keeps triangles inside the box around its overlaps.
+    i, j = meshPairs[:, 0], meshPairs[:, 1]
+    overlapLow = np.maximum(low[i], low[j])
+    overlapHigh = np.minimum(high[i], high[j])
+    regionLow = np.full(low.shape, np.inf)
+    regionHigh = np.full(high.shape, -np.inf)
+    for side in (i, j):
+        np.minimum.at(regionLow, side, overlapLow)
+        np.maximum.at(regionHigh, side, overlapHigh)
+    meshTris, meshFaces, meshOwners = [], [], []
+    for position in np.unique(meshPairs).tolist():
+        meshId = meshIds[position]
+        snapshot = snapshots[meshId]
+        triFaces, a, b, c = mcs.fanTriangles(snapshot.faceCounts, snapshot.faceOffsets)
+        faceVertices = snapshot.faceVertices
+        points = world[meshId]
+        tris = np.stack([points[faceVertices[a]], points[faceVertices[b]], points[faceVertices[c]]], axis=1)
+        inside = np.all((tris.min(axis=1) - padding <= regionHigh[position]) &
+                        (tris.max(axis=1) + padding >= regionLow[position]), axis=1)
+        meshTris.append(tris[inside])
+        meshFaces.append(triFaces[inside])
+        meshOwners.append(np.full(int(inside.sum()), meshId, dtype=np.int64))
+    tris = np.concatenate(meshTris)
+    faces = np.concatenate(meshFaces)
+    owners = np.concatenate(meshOwners)
+    pairs = mcs.gridPairs(tris.min(axis=1) - padding, tris.max(axis=1) + padding)
+    pairs = pairs[owners[pairs[:, 0]] != owners[pairs[:, 1]]]
+    return tris, faces, owners, pairs
+
+
+def triangleNormals(tris):
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.sqrt(np.einsum('ij,ij->i', normals, normals))
+    return normals / np.where(lengths > 0, lengths, 1.0)[:, None], lengths > 0
+
+
+def coplanarOverlap(first, second, tolerance):
+    # Triangle pairs lying in the same plane, facing either way, whose
+    # interiors overlap: the faces z-fight.
+    normals, valid = triangleNormals(first)
+    otherNormals, otherValid = triangleNormals(second)
+    parallel = np.abs(np.einsum('ij,ij->i', normals, otherNormals)) > 1 - 0.000001
+    distances = np.einsum('nkj,nj->nk', second - first[:, :1], normals)
+    result = valid & otherValid & parallel & np.all(np.abs(distances) <= tolerance, axis=1)
+    # Drop the dominant normal axis and test the outlines in 2D.
+    axis = np.argmax(np.abs(normals), axis=1)
+    kept = np.stack([(axis + 1) % 3, (axis + 2) % 3], axis=1)[:, None, :].repeat(3, axis=1)
+    flat = np.take_along_axis(first, kept, axis=2)
+    otherFlat = np.take_along_axis(second, kept, axis=2)
+    candidates = np.flatnonzero(result)
+    result[candidates] = mcs.trianglesOverlap(flat[candidates], otherFlat[candidates])
+    return result
+
+
+def segmentsCross(starts, ends, tris, tolerance=0.000001):
+    # Segments passing through the interior of their triangle, Moller-Trumbore
+    # with every bound strict, so touching at a side or corner doesn't count.
+    direction = ends - starts
+    edge1 = tris[:, 1] - tris[:, 0]
+    edge2 = tris[:, 2] - tris[:, 0]
+    h = np.cross(direction, edge2)
+    determinant = np.einsum('ij,ij->i', edge1, h)
+    valid = np.abs(determinant) > 1e-12
+    inverse = 1.0 / np.where(valid, determinant, 1.0)
+    s = starts - tris[:, 0]
+    u = inverse * np.einsum('ij,ij->i', s, h)
+    q = np.cross(s, edge1)
+    v = inverse * np.einsum('ij,ij->i', direction, q)
+    t = inverse * np.einsum('ij,ij->i', edge2, q)
+    return (valid & (u > tolerance) & (v > tolerance) & (u + v < 1 - tolerance) &
+            (t > tolerance) & (t < 1 - tolerance))
+
+
+def trianglesIntersect(first, second):
+    # Non-coplanar triangle pairs that cut through each other: one of the six
+    # sides crosses the other triangle.
+    result = np.zeros(len(first), dtype=bool)
+    for tris, others in ((first, second), (second, first)):
+        for i in range(3):
+            result |= segmentsCross(tris[:, i], tris[:, (i + 1) % 3], others)
+    return result
+
+
+def _facesPerMesh(faces, owners, hits, count):
+    result = [np.zeros(0, dtype=np.int64) for _ in range(count)]
+    hits = hits.ravel()
+    for meshId in np.unique(owners[hits]).tolist():
+        result[meshId] = np.unique(faces[hits[owners[hits] == meshId]])
+    return result
+
+
+def coincidentFaces(snapshots, matrices, tolerance=0.0001):
+    # Faces overlapping a coplanar face of another mesh, as one index array
+    # per snapshot.
+    tris, faces, owners, pairs = triangleCandidates(snapshots, matrices, tolerance)
+    pairs = pairs[coplanarOverlap(tris[pairs[:, 0]], tris[pairs[:, 1]], tolerance)]
+    return _facesPerMesh(faces, owners, pairs, len(snapshots))
+
+
+def intersectingFaces(snapshots, matrices):
+    # Faces cutting through a face of another mesh, as one index array per
+    # snapshot.
+    tris, faces, owners, pairs = triangleCandidates(snapshots, matrices, 0.0)
+    pairs = pairs[trianglesIntersect(tris[pairs[:, 0]], tris[pairs[:, 1]])]
+    return _facesPerMesh(faces, owners, pairs, len(snapshots))
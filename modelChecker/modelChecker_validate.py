@@ -0,0 +1,289 @@
+import datetime
+import getpass
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import modelChecker.modelChecker_commands as mcc
+import modelChecker.modelChecker_fused as mcf
+import modelChecker.modelChecker_hierarchy as mchy
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_profile as mcp
+import modelChecker.modelChecker_results as mcrs
+import modelChecker.modelChecker_scheduler as mcsch
+from modelChecker import lazyImport
+
+# numpy backed modules load on first use, and are None without numpy.
+mcs = lazyImport('modelChecker.modelChecker_snapshot', ['numpy'])
+mcn = lazyImport('modelChecker.modelChecker_numpy', ['numpy'])
+mch = lazyImport('modelChecker.modelChecker_headless', ['numpy'])
+mcms = lazyImport('modelChecker.modelChecker_mayaScene', ['numpy'])
+mcsp = lazyImport('modelChecker.modelChecker_spatial', ['numpy'])
+mcar = lazyImport('modelChecker.modelChecker_archive', ['numpy'])
+
+# Validation API for the open Maya scene, shared by the UI and the mayapy
+# command line. Nothing here imports Qt, so farm tasks only load Maya and the
+# checks they run.
+
+defaultCameras = mchy.defaultCameras
+
+# Checks that only look at one mesh at a time, so a run can be split per mesh.
+meshChecks = mcf.fusedChecks | {'selfPenetratingUVs', 'uvRange', 'onBorder',
+                                'nonManifoldVertices', 'inconsistentWinding'}
+
+# Node collection takes an optional HierarchyIndex so a caller resolving
+# nodes and then running checks on them reads the DAG once; without one,
+# each call builds its own.
+
+
+def getAllNodes(index=None):
+    return (index or mchy.build()).allNodes()
+
+
+def getTopNode(topNode, index=None):
+    # The root node and every transform below it, empty if it doesn't exist.
+    return (index or mchy.build()).expand([topNode])
+
+
+def getSelectedNodes(index=None):
+    selection = cmds.ls(selection=True, typ="transform", long=True)
+    if not selection:
+        return []
+    return (index or mchy.build()).expand(selection)
+
+
+def meshSelection(nodes, index=None):
+    return (index or mchy.build()).meshSelection(nodes)
+
+
+def sceneMetadata():
+    return {
+        "user": getpass.getuser(),
+        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "mayaVersion": cmds.about(iv=True),
+        "mayaScene": cmds.file(q=True, sn=True) or "Untitled",
+    }
+
+
+def archive(path, diagnostics, **metadata):
+    # Diagnostics archive with the scene metadata; extra keyword arguments
+    # describe the run.
+    mcar.write(path, diagnostics, dict(sceneMetadata(), **metadata))
+
+
+def availableCommands():
+    # Checks that can run here; numpy only checks drop out without numpy.
+    return {name: check for name, check in mcl.mcCommandsList.items()
+            if mcn or 'api' in check.get('backends', ['api'])}
+
+
+def supportedBackends(command):
+    # Preferred backend first. Mesh checks with a numpy kernel run on either.
+    backends = mcl.mcCommandsList[command].get('backends')
+    if backends:
+        return [backend for backend in backends if mcn or backend == 'api']
+    if mcs and command in mcs.kernels:
+        return ['api', 'numpy']
+    return ['api']
+
+
+def defaultBackend(command):
+    return supportedBackends(command)[0]
+
+
+def _measureCommand(event, command, nodes, SLMesh, errors):
+    # Checks that loop over meshes internally are profiled as a whole.
+    event['results'] = mcrs.count(errors)
+    if mcs and command in mcs.kernels:
+        event['meshes'] = SLMesh.length()
+        event['components'] = mcf.selectionComponentCount(SLMesh, mcs.kernels[command][1])
+    elif command in mcf.fusedChecks:
+        event['meshes'] = SLMesh.length()
+        event['components'] = mcf.selectionComponentCount(SLMesh, mcf.componentType(command))
+    elif command in ('duplicatedMeshes', 'instancingCandidates'):
+        event['meshes'] = event['components'] = SLMesh.length()
+    elif mcsp and command in mcsp.crossMeshChecks:
+        event['meshes'] = SLMesh.length()
+        event['components'] = mcf.selectionComponentCount(SLMesh, 'f')
+    else:
+        event['components'] = len(nodes)
+
+
+class Extraction(object):
+    # Scene data shared by every check of a run. Each part is built when a
+    # check first needs it, and mesh arrays load per field on first access,
+    # so a run only extracts what its checks require.
+
+    def __init__(self, nodes, index=None, commands=None):
+        # commands: every check the run may ask for, to extract only the scene
+        # data they require; all of it when not given.
+        self.nodes = nodes
+        self.commands = commands
+        self._index = index
+        self._SLMesh = None
+        self._meshes = None
+        self._scene = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = mchy.build()
+        return self._index
+
+    @property
+    def SLMesh(self):
+        if self._SLMesh is None:
+            self._SLMesh = self.index.meshSelection(self.nodes)
+        return self._SLMesh
+
+    @property
+    def meshes(self):
+        if self._meshes is None:
+            self._meshes = mcn.snapshots(self.SLMesh)
+        return self._meshes
+
+    @property
+    def scene(self):
+        if self._scene is None:
+            data = mcsch.sceneData if self.commands is None else mcsch.sceneRequirements(self.commands)
+            self._scene = mcms.sceneFromMaya(self.nodes, self.index, data)
+        return self._scene
+
+    def clear(self):
+        if self._SLMesh is not None:
+            self._SLMesh.clear()
+        self._meshes = None
+        self._scene = None
+
+
+def runChecks(commands, nodes, backends=None, cache=None, profiler=None, extraction=None, index=None,
+              spill=None, workers=None, parameters=None, metrics=None):
+    # backends maps a check to 'api' or 'numpy', defaulting to the registry.
+    # numpy kernels run on workers threads, the CPU count by default.
+    # With a spill, the fused component checks stream into it instead, in
+    # chunks bounded by spill.memoryLimit, whatever their backend.
+    # parameters maps a check to overrides of its registry parameters; the
+    # API checks only know the defaults, so checks given overrides run on
+    # numpy. A MetricStore in metrics keeps the values of the threshold
+    # checks that run on numpy.
+    backends = dict(backends or {})
+    parameters = parameters or {}
+    for command in parameters:
+        if 'numpy' in supportedBackends(command):
+            backends[command] = 'numpy'
+    backend = lambda command: backends.get(command, defaultBackend(command))
+    shared = extraction is not None
+    extraction = extraction or Extraction(nodes, index, commands)
+    SLMesh = extraction.SLMesh
+    diagnostics = {}
+    if spill is not None:
+        streamCommands = [command for command in commands if command in mcf.fusedChecks]
+        if streamCommands:
+            diagnostics.update(mcf.runStreaming(streamCommands, SLMesh, spill, profiler))
+    numpyCommands = [command for command in commands
+                     if backend(command) == "numpy" and command not in diagnostics]
+    if numpyCommands:
+        diagnostics.update(mcn.runNumpy(numpyCommands, SLMesh, cache, profiler, extraction.meshes, workers,
+                                        parameters, metrics))
+    fusedCommands = [command for command in commands
+                     if command in mcf.fusedChecks and command not in diagnostics]
+    if fusedCommands and cache:
+        diagnostics.update(mcn.runCachedFused(fusedCommands, SLMesh, cache, profiler, extraction.meshes))
+    elif fusedCommands:
+        diagnostics.update(mcf.runFused(fusedCommands, SLMesh, profiler))
+    sceneCommands = [command for command in commands
+                     if mcms and command in mcms.sceneChecks and command not in diagnostics]
+    if sceneCommands:
+        scene = extraction.scene
+        for command in sceneCommands:
+            with mcp.measure(profiler, command) as event:
+                diagnostics[command] = getattr(mch, command)(nodes, scene)
+                event['components'] = len(nodes)
+                event['results'] = mcrs.count(diagnostics[command])
+    for command in commands:
+        if command in diagnostics:
+            continue
+        module = mcn if backend(command) == "numpy" else mcc
+        overrides = parameters.get(command, {}) if module is mcn else {}
+        with mcp.measure(profiler, command) as event:
+            errors = getattr(module, command)(nodes, SLMesh, **overrides)
+            if profiler:
+                _measureCommand(event, command, nodes, SLMesh, errors)
+        diagnostics[command] = errors
+    if not shared:
+        extraction.clear()
+    return diagnostics
+
+
+def instancingSection(nodes, index=None):
+    # Report lines for the meshes below nodes that could be instanced.
+    return mcn.instancingSection(meshSelection(nodes, index))
+
+
+def checkUnits(commands, nodes, index=None, crossNodes=None):
+    # (label, commands, nodes) work units: scene level checks share one unit,
+    # other whole scene checks get one each and mesh checks one per mesh.
+    # Checks between meshes run on crossNodes when given, for a run that only
+    # checks some nodes again.
+    units = []
+    commands = mcsch.order(commands)
+    sceneCommands = [command for command in commands
+                     if mcms and command not in meshChecks and command in mcms.sceneChecks]
+    if sceneCommands:
+        units.append(("scene checks", sceneCommands, nodes))
+    for command in commands:
+        if command not in meshChecks and command not in sceneCommands:
+            crossMesh = crossNodes is not None and mcsp and command in mcsp.crossMeshChecks
+            units.append((mcl.mcCommandsList[command]['label'], [command], crossNodes if crossMesh else nodes))
+    perMesh = [command for command in commands if command in meshChecks]
+    if perMesh:
+        for node in (index or mchy.build()).meshNodes(nodes):
+            units.append((node, perMesh, [node]))
+    return units
+
+
+def iterChecks(commands, nodes, diagnostics, backends=None, cache=None, profiler=None, index=None,
+               parameters=None, metrics=None, crossNodes=None):
+    # Runs the checks one unit at a time, merging results into diagnostics as
+    # they arrive and yielding (label, done, total) after every unit, so a
+    # caller can report progress, redraw or stop between units.
+    for command in commands:
+        diagnostics.setdefault(command, [])
+    extraction = Extraction(nodes, index, commands)
+    units = checkUnits(commands, nodes, extraction.index, crossNodes)
+    try:
+        for done, (label, unitCommands, unitNodes) in enumerate(units, 1):
+            shared = extraction if unitNodes is nodes else None
+            unitResults = runChecks(unitCommands, unitNodes, backends, cache, profiler, shared, extraction.index,
+                                    parameters=parameters, metrics=metrics)
+            for command, errors in unitResults.items():
+                diagnostics[command].extend(errors)
+            yield label, done, len(units)
+    finally:
+        extraction.clear()
+
+
+def validate(scene=None, commands=None, root=None, backends=None, cache=None, profiler=None, gate=False,
+             spill=None, workers=None, parameters=None):
+    # Opens the scene when given, resolves the nodes below root (or the whole
+    # scene) and runs the checks, every available check by default. A gate
+    # run stops at the first failing check; checks it skipped are left out of
+    # the returned diagnostics. A streamed run's results read from spill, so
+    # it has to stay open while they are used.
+    if scene:
+        cmds.file(scene, open=True, force=True)
+    index = mchy.build()
+    if root:
+        nodes = getTopNode(root, index)
+        if not nodes:
+            raise ValueError(f"Root node '{root}' doesn't exist")
+    else:
+        nodes = getAllNodes(index)
+    commands = commands or list(availableCommands())
+    extraction = Extraction(nodes, index, commands)
+    try:
+        diagnostics, _ = mcsch.schedule(
+            commands, lambda batch: runChecks(batch, nodes, backends, cache, profiler, extraction, spill=spill,
+                                    workers=workers, parameters=parameters),
+            gate)
+    finally:
+        extraction.clear()
+    return diagnostics
@@ -18,6 +18,8 @@ description = " Sanity checking tool for polygon models in Maya"
 
 authors = ["Jakob Kousholt", "Niels Peter Kaagaard "]
 
+requires = ["numpy"]
+
 variants = [["python-3+<4"]]
 
 
@@ -15,4 +15,5 @@ setup(
     description="Sanity checking tool for polygon models in Maya",
     author="Jakob Kousholt, Niels Peter Kaagaard",
     packages=find_packages(),
+    install_requires=["numpy"],
 )
@@ -0,0 +1,62 @@
+import modelChecker.modelChecker_archive as mcar
+import modelChecker.modelChecker_results as mcrs
+
+
+def write(tmp_path, name, diagnostics):
+    path = str(tmp_path / name)
+    mcar.write(path, diagnostics, {'scene': 'shot.ma'})
+    return mcar.load(path)
+
+
+def names(errors):
+    return mcrs.names(errors, compressed=True)
+
+
+def test_roundTrip(tmp_path):
+    diagnostics = {
+        'trailingNumbers': ['pCube1'],
+        'ngons': [mcrs.ComponentResult('pCube1', 'f', [1, 2, 3]), mcrs.ComponentResult('pCube2', 'f', [7])],
+        'uvRange': [mcrs.ComponentResult('pCube1', 'map', [0, 4], 'map2')],
+    }
+    archive = write(tmp_path, 'run.mcd', diagnostics)
+    assert archive.metadata == {'scene': 'shot.ma'}
+    loaded = archive.diagnostics()
+    assert list(loaded) == list(diagnostics)
+    for command, errors in diagnostics.items():
+        assert names(loaded[command]) == names(errors)
+
+
+def test_diff(tmp_path):
+    old = write(tmp_path, 'old.mcd', {
+        'trailingNumbers': ['pCube1', 'pCube3'],
+        'ngons': [mcrs.ComponentResult('pCube1', 'f', [1, 2, 3]), mcrs.ComponentResult('pCube2', 'f', [7])],
+        'lamina': [mcrs.ComponentResult('pCube4', 'f', [0])],
+    })
+    new = write(tmp_path, 'new.mcd', {
+        'trailingNumbers': ['pCube1', 'pCube5'],
+        'ngons': [mcrs.ComponentResult('pCube1', 'f', [2, 3, 4]), mcrs.ComponentResult('pCube2', 'f', [7])],
+        'triangles': [mcrs.ComponentResult('pCube1', 'f', [0])],
+    })
+    changes = mcar.diff(old, new)
+    # Only checks both runs have are compared.
+    assert set(changes) == {'trailingNumbers', 'ngons'}
+    assert names(changes['trailingNumbers']['introduced']) == ['pCube5']
+    assert names(changes['trailingNumbers']['fixed']) == ['pCube3']
+    assert names(changes['ngons']['introduced']) == ['pCube1.f[4]']
+    assert names(changes['ngons']['fixed']) == ['pCube1.f[1]']
+    report = mcar.diffReport(changes)
+    assert report['ngons']['introduced'] == report['ngons']['fixed'] == 1
+
+
+def test_diffOfSameRun(tmp_path):
+    diagnostics = {'ngons': [mcrs.ComponentResult('pCube1', 'f', [1, 2, 3])]}
+    changes = mcar.diff(write(tmp_path, 'old.mcd', diagnostics), write(tmp_path, 'new.mcd', diagnostics))
+    assert mcar.diffReport(changes) == {}
+
+
+def test_mainExitsOnIntroducedErrors(tmp_path, capsys):
+    write(tmp_path, 'old.mcd', {'ngons': []})
+    write(tmp_path, 'new.mcd', {'ngons': [mcrs.ComponentResult('pCube1', 'f', [0])]})
+    assert mcar.main([str(tmp_path / 'old.mcd'), str(tmp_path / 'new.mcd')]) == 1
+    assert mcar.main([str(tmp_path / 'new.mcd'), str(tmp_path / 'old.mcd')]) == 0
+    capsys.readouterr()
@@ -0,0 +1,81 @@
+import numpy as np
+import modelChecker.modelChecker_benchmark as mcb
+import modelChecker.modelChecker_headless as mch
+import modelChecker.modelChecker_metrics as mcme
+import modelChecker.modelChecker_results as mcrs
+
+# The benchmark generators plant one kind of problem on every tenth face of a
+# 10 x 10 quad grid; the headless checks should find exactly those.
+
+size = 100
+quads = range(size)
+
+
+def run(generator, commands):
+    return mch.runScene(mcb.benchmarkScene(mcb.generators[generator](size)), commands)
+
+
+def indices(errors):
+    return sorted(int(index) for error in errors for index in error.indices)
+
+
+def test_gridIsClean():
+    diagnostics = run('grid', ['triangles', 'ngons', 'lamina', 'zeroAreaFaces', 'noneManifoldEdges',
+                               'nonManifoldVertices', 'poles', 'uvRange'])
+    assert not any(diagnostics.values())
+
+
+def test_gridOpenEdgesAreItsBorder():
+    assert mcrs.count(run('grid', ['openEdges'])['openEdges']) == 40
+
+
+def test_ngons():
+    assert indices(run('ngons', ['ngons'])['ngons']) == list(quads[::mcb.every])
+
+
+def test_lamina():
+    # Every tenth quad and the reversed copy of it appended after the grid.
+    expected = list(quads[::mcb.every]) + list(range(size, size + size // mcb.every))
+    assert indices(run('lamina', ['lamina'])['lamina']) == expected
+
+
+def test_zeroAreaFaces():
+    diagnostics = run('zeroAreaFaces', ['zeroAreaFaces'])
+    assert indices(diagnostics['zeroAreaFaces']) == list(range(size, size + size // mcb.every))
+
+
+def test_nonManifoldFans():
+    diagnostics = run('nonManifoldFans', ['triangles', 'noneManifoldEdges'])
+    assert indices(diagnostics['triangles']) == list(range(size, size + size // mcb.every))
+    # The fan on the first quad stands on the grid border, which leaves that
+    # edge with two faces.
+    assert mcrs.count(diagnostics['noneManifoldEdges']) == size // mcb.every - 1
+
+
+def test_spherePoles():
+    arrays = mcb.sphere(size)
+    diagnostics = run('sphere', ['poles', 'triangles'])
+    assert indices(diagnostics['poles']) == [0, len(arrays['points']) - 1]
+    assert mcrs.count(diagnostics['triangles']) == np.count_nonzero(arrays['faceCounts'] == 3)
+
+
+def test_badUVs():
+    diagnostics = run('badUVs', ['uvRange'])
+    assert mcrs.count(diagnostics['uvRange']) == 4 * len(quads[1::mcb.every])
+
+
+def test_parametersOverrideThresholds():
+    diagnostics = mch.runScene(mcb.benchmarkScene(mcb.grid(size)), ['zeroAreaFaces'],
+                               parameters={'zeroAreaFaces': {'maxArea': 1000.0}})
+    assert mcrs.count(diagnostics['zeroAreaFaces']) == size
+
+
+def test_metricsRefilter():
+    # Kept values give the same results as a run with the new threshold.
+    scene = mcb.benchmarkScene(mcb.zeroAreaFaces(size))
+    metrics = mcme.MetricStore()
+    mch.runScene(scene, ['zeroAreaFaces'], metrics=metrics)
+    parameters = {'maxArea': 0.5}
+    rerun = mch.runScene(scene, ['zeroAreaFaces'], parameters={'zeroAreaFaces': parameters})
+    assert indices(metrics.select('zeroAreaFaces', parameters)) == indices(rerun['zeroAreaFaces'])
+    assert metrics.histogram('zeroAreaFaces')[0].sum() == len(mcb.zeroAreaFaces(size)['faceCounts'])
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import modelChecker.modelChecker_benchmark as mcb
+
+# Importing the registry, results and profiler must not execute anything
+# heavy or optional; those load when a check first uses them. Comparing the
+# modules a fresh interpreter ends up with, rather than timing the import,
+# keeps the test independent of how busy the machine is.
+
+heavyModules = ('numpy', 'maya', 'PySide2', 'shiboken2', 'sqlite3', 'multiprocessing', 'concurrent',
+                'subprocess', 'json', 'tracemalloc', 'xml.etree.ElementTree')
+
+
+def executedModules(modules):
+    # Modules executed by importing modules; lazy ones nothing touched yet
+    # are left out.
+    code = ("import sys; import " + ", ".join(modules) + "; print('\\n'.join("
+            "name for name, module in list(sys.modules.items()) if type(module).__name__ != '_LazyModule'))")
+    output = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                            universal_newlines=True).stdout
+    return set(output.split())
+
+
+def test_coreImportsStayLight():
+    baseline = executedModules(['sys'])
+    loaded = executedModules(mcb.coreModules) - baseline
+    assert sorted(name for name in loaded for heavy in heavyModules
+                  if name == heavy or name.startswith(heavy + '.')) == []
+
+
+def test_coreImportsModelCheckerOnly():
+    loaded = executedModules(mcb.coreModules)
+    assert {name for name in loaded if name.startswith('modelChecker.')} <= set(mcb.coreModules) | {
+        'modelChecker.__version__'}
@@ -0,0 +1,63 @@
+import modelChecker.modelChecker_results as mcrs
+
+
+def spilled(indices, chunkSize, spill):
+    blocks = [spill.write(indices[start:start + chunkSize]) for start in range(0, len(indices), chunkSize)]
+    return mcrs.SpilledResult('pCube1', 'f', spill, blocks)
+
+
+def test_spillRoundTrip():
+    indices = [0, 1, 2, 5, 6, 9, 10, 11, 12, 40, 1000, 1001, 70000]
+    spill = mcrs.Spill()
+    try:
+        result = spilled(indices, 4, spill)
+        expected = mcrs.ComponentResult('pCube1', 'f', indices)
+        assert list(result.indices) == indices
+        assert len(result) == len(expected)
+        assert list(result) == list(expected)
+        assert result.ranges() == expected.ranges()
+        assert result.names() == expected.names()
+        for window in (slice(0, 3), slice(2, 9), slice(5, None), slice(12, 20)):
+            assert result[window] == expected[window]
+    finally:
+        spill.close()
+
+
+def test_spillRunsCarryOverBlocks():
+    spill = mcrs.Spill()
+    try:
+        assert spilled(list(range(10)), 3, spill).ranges() == [(0, 9)]
+    finally:
+        spill.close()
+
+
+def test_spillToPath(tmp_path):
+    spill = mcrs.Spill(str(tmp_path / 'spill.bin'))
+    try:
+        block = spill.write([3, 4, 8])
+        assert list(spill.read(block)) == [3, 4, 8]
+    finally:
+        spill.close()
+
+
+def test_componentResult():
+    result = mcrs.ComponentResult('pCube1', 'f', [1, 2, 3, 7, 9, 10])
+    assert len(result) == 6
+    assert result[2:4] == ['pCube1.f[3]', 'pCube1.f[7]']
+    assert result.ranges() == [(1, 3), (7, 7), (9, 10)]
+    assert result.names() == ['pCube1.f[1:3]', 'pCube1.f[7]', 'pCube1.f[9:10]']
+    assert mcrs.componentResults('pCube1', 'f', []) == []
+
+
+def test_mixedErrors():
+    errors = ['pCube2', mcrs.ComponentResult('pCube1', 'e', [4, 5, 6])]
+    assert mcrs.count(errors) == 4
+    assert mcrs.names(errors, compressed=True) == ['pCube2', 'pCube1.e[4:6]']
+    assert mcrs.FlatView(errors)[1:3] == ['pCube1.e[4]', 'pCube1.e[5]']
+    assert [mcrs.objectName(error) for error in errors] == ['pCube2', 'pCube1']
+
+
+def test_uvSetNames():
+    errors = [mcrs.ComponentResult('pCube1', 'map', [4, 5, 6], 'map2'), mcrs.ComponentResult('pCube1', 'map', [0])]
+    assert mcrs.names(errors, compressed=True) == ['pCube1.map[4:6] (map2)', 'pCube1.map[0]']
+    assert mcrs.FlatView(errors)[2:4] == ['pCube1.map[6] (map2)', 'pCube1.map[0]']
@@ -0,0 +1,22 @@
+import modelChecker.modelChecker_list as mcl
+import modelChecker.modelChecker_scheduler as mcsch
+import modelChecker.modelChecker_snapshot as mcs
+
+
+def test_requiresOnlyExtractedData():
+    # Every declared requirement is something an extraction reads.
+    known = set(mcs.meshFields) | set(mcsch.sceneData)
+    for command, check in mcl.mcCommandsList.items():
+        assert set(check.get('requires', [])) <= known, command
+
+
+def test_sceneRequirements():
+    assert mcsch.sceneRequirements(['trailingNumbers', 'namespaces']) == []
+    assert mcsch.sceneRequirements(['unfrozenTransforms', 'layers', 'ngons']) == ['connections', 'transforms']
+    assert mcsch.sceneRequirements(['shaders', 'emptyGroups']) == ['hierarchy', 'connections']
+
+
+def test_stagesRunCheapestFirst():
+    stages = mcsch.stages(['intersectingFaces', 'ngons', 'trailingNumbers', 'layers'])
+    assert stages == [('node', ['trailingNumbers', 'layers']), ('mesh', ['ngons']),
+                      ('expensive', ['intersectingFaces'])]
@@ -0,0 +1,88 @@
+import numpy as np
+import modelChecker.modelChecker_benchmark as mcb
+import modelChecker.modelChecker_cache as mcca
+import modelChecker.modelChecker_executor as mcex
+import modelChecker.modelChecker_snapshot as mcs
+
+
+def bruteForcePairs(low, high):
+    pairs = set()
+    for i in range(len(low)):
+        for j in range(i + 1, len(low)):
+            if np.all(low[i] <= high[j]) and np.all(low[j] <= high[i]):
+                pairs.add((i, j))
+    return pairs
+
+
+def test_gridPairsMatchesBruteForce():
+    random = np.random.default_rng(1)
+    for dimensions in (2, 3):
+        low = random.uniform(0.0, 10.0, (200, dimensions))
+        high = low + random.uniform(0.0, 1.5, (200, dimensions))
+        pairs = mcs.gridPairs(low, high)
+        found = {tuple(int(index) for index in pair) for pair in pairs}
+        assert len(found) == len(pairs)
+        assert found == bruteForcePairs(low, high)
+
+
+def test_gridPairsWithLargeAndFlatBoxes():
+    low = np.array([[0.0, 0.0], [1.0, 1.0], [5.0, 0.0], [-100.0, 0.5]])
+    high = np.array([[2.0, 2.0], [1.5, 1.5], [6.0, 0.0], [100.0, 0.5]])
+    found = {tuple(int(index) for index in pair) for pair in mcs.gridPairs(low, high)}
+    assert found == bruteForcePairs(low, high)
+
+
+def test_gridPairsNeedsTwoBoxes():
+    assert len(mcs.gridPairs(np.zeros((1, 2)), np.ones((1, 2)))) == 0
+
+
+def triangles(*points):
+    return np.array(points, dtype=np.float64).reshape(-1, 3, 2)
+
+
+def test_trianglesOverlap():
+    first = triangles([[0, 0], [1, 0], [0, 1]], [[0, 0], [1, 0], [0, 1]], [[0, 0], [1, 0], [0, 1]],
+                      [[0, 0], [1, 0], [0, 1]], [[0, 0], [4, 0], [0, 4]])
+    second = triangles(
+        [[0.2, 0.2], [1.2, 0.2], [0.2, 1.2]],  # overlapping
+        [[2, 2], [3, 2], [2, 3]],  # apart
+        [[1, 0], [0, 1], [1, 1]],  # sharing a side
+        [[1, 0], [2, 0], [1, 1]],  # sharing a corner
+        [[1, 1], [2, 1], [1, 2]],  # inside
+    )
+    assert mcs.trianglesOverlap(first, second).tolist() == [True, False, False, False, True]
+    assert mcs.trianglesOverlap(second, first).tolist() == [True, False, False, False, True]
+
+
+class ArrayLoader(object):
+    # Serves a mesh's arrays field by field like MayaMeshLoader, recording
+    # what was asked for.
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.fields = []
+
+    def __call__(self, field):
+        self.fields.append(field)
+        if field == 'edgeKey':
+            return {'edgeKey': np.array([len(self.arrays['edgeVertices'])])}
+        if field == 'smoothingKey':
+            return {'smoothingKey': self.arrays['faceVertices']}
+        return {field: self.arrays[field]}
+
+
+def test_cacheHitReadsNoEdges(tmp_path):
+    cache = mcca.ResultCache(str(tmp_path / 'cache.sqlite'))
+    arrays = mcb.grid(100)
+    arrays['edgeVertices'] = mcs.MeshSnapshot('grid', **arrays).edgeVertices
+    arrays['smoothEdges'] = np.arange(len(arrays['edgeVertices'])) % 2 == 0
+    commands = ['openEdges', 'hardEdges', 'poles', 'zeroLengthEdges']
+    results = []
+    for _ in range(2):
+        loader = ArrayLoader(arrays)
+        diagnostics = mcex.runKernels(commands, [('grid', mcs.MeshSnapshot('grid', loader))], cache, workers=1)
+        results.append({command: [error.indices.tolist() for error in errors]
+                        for command, errors in diagnostics.items()})
+    assert results[0] == results[1]
+    assert cache.hits == len(commands)
+    assert 'edgeVertices' not in loader.fields and 'smoothEdges' not in loader.fields